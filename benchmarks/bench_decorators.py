@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from benchmarks.harness import benchmark
+from benchmarks.synthetic import LONG_DOCSTRING, PADDING
+from watson.console import command
+from watson.console.decorators import arg
+
+
+def _method(index):
+    def create(self, name, count, verbose):
+        return name
+    create.__doc__ = LONG_DOCSTRING.format(index=index, padding=PADDING)
+    return create
+
+
+@benchmark(sizes=(10, 100))
+def decorate(context, size):
+    methods = [_method(index) for index in range(size)]
+
+    def run():
+        for method in methods:
+            arg('name')(
+                arg('count', optional=True, type=int)(
+                    arg('verbose', optional=True, action='store_true')(method)))
+    return run
+
+
+@benchmark(sizes=(10, 1000))
+def define_commands(context, size):
+    methods = [arg('name')(arg('count', optional=True, type=int)(_method(index)))
+               for index in range(3)]
+
+    def run():
+        for index in range(size):
+            type('Command{0}'.format(index), (command.Base,), {
+                'create': methods[0],
+                'delete': methods[1],
+                'list': methods[2]
+            })
+    return run
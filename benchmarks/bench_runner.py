@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import argparse
+from contextlib import redirect_stdout
+import io
+import os
+import subprocess
+import sys
+from benchmarks.harness import benchmark
+from watson.console import writer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_IMPORT = '''
+import sys
+from watson.console import Runner
+Runner(commands=sys.stdin.read().split()).commands
+'''
+
+
+def _cold(context, definitions):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join((ROOT, context.directory))
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    source = '\n'.join(definitions)
+
+    def run():
+        subprocess.run([sys.executable, '-c', COLD_IMPORT], input=source,
+                       universal_newlines=True, env=env, check=True)
+    return run
+
+
+@benchmark(sizes=(0,))
+def cold_import_package(context, size):
+    return _cold(context, [])
+
+
+@benchmark(repeat=3)
+def cold_import_commands(context, size):
+    return _cold(context, context.commands(size))
+
+
+@benchmark()
+def commands_access(context, size):
+    context.runner(size).commands  # the modules remain imported between runs
+
+    def run():
+        context.runner(size).commands
+    return run
+
+
+@benchmark()
+def attach_commands_listing(context, size):
+    runner = context.runner(size)
+    runner.commands
+
+    def run():
+        parser = argparse.ArgumentParser(prog='console.py')
+        with redirect_stdout(io.StringIO()):
+            try:
+                runner.attach_commands(parser, None)
+            except SystemExit:
+                pass
+            writer.stdout.flush()
+    return run
+
+
+@benchmark()
+def attach_command_single(context, size):
+    runner = context.runner(size)
+    runner.commands
+
+    def run():
+        parser = argparse.ArgumentParser(prog='console.py')
+        runner.attach_command(parser, 'command0', 'create')
+    return run
+
+
+@benchmark()
+def execute_dispatch(context, size):
+    runner = context.runner(size)
+    args = ['console.py', 'command0', 'create', 'name', '--count', '2']
+    runner.execute(list(args))
+
+    def run():
+        for _ in range(100):
+            runner.execute(list(args))
+    return run
+
+
+@benchmark()
+def execute_dispatch_fast_path(context, size):
+    runner = context.runner(size)
+    runner.fast_path = True
+    # create uses a type, default and action, which require argparse
+    args = ['console.py', 'command0', 'list', '--query', 'x']
+    assert runner._parse_fast('command0', 'list', args[3:])
+    runner.execute(list(args))
+
+    def run():
+        for _ in range(100):
+            runner.execute(list(args))
+    return run
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from benchmarks.harness import benchmark
+from watson.console import colors, styles
+from watson.console.table import Table, Column, display_width
+
+SIZES = (10000, 100000)
+
+
+def _strings(size):
+    return ['line {0} of the output'.format(index) for index in range(size)]
+
+
+@benchmark(sizes=SIZES)
+def style_call(context, size):
+    strings = _strings(size)
+    bold = styles.BOLD
+
+    def run():
+        for string in strings:
+            bold(string)
+    return run
+
+
+@benchmark(sizes=SIZES)
+def style_many(context, size):
+    strings = _strings(size)
+
+    def run():
+        styles.BOLD.many(strings)
+    return run
+
+
+@benchmark(sizes=SIZES)
+def color_functions(context, size):
+    strings = _strings(size)
+
+    def run():
+        for string in strings:
+            colors.fail(string)
+    return run
+
+
+@benchmark(sizes=SIZES)
+def template_render(context, size):
+    template = styles.Template('{name}\t{help}', name=styles.BOLD)
+
+    def run():
+        for index in range(size):
+            template.render(name='command', help=index)
+    return run
+
+
+@benchmark(sizes=SIZES)
+def display_width_styled(context, size):
+    strings = styles.BOLD.many(_strings(size))
+
+    def run():
+        for string in strings:
+            display_width(string)
+    return run
+
+
+@benchmark(sizes=SIZES)
+def table_render(context, size):
+    table = Table([Column('Name', style=styles.BOLD), Column('Help')])
+    rows = [(string, string) for string in _strings(size)]
+
+    def run():
+        for _ in table.render(rows):
+            pass
+    return run
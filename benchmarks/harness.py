@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+import argparse
+from collections import OrderedDict
+import importlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks import synthetic
+from watson.console import writer
+from watson.console.table import Column, Table, RIGHT
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BASELINES = os.path.join(DIRECTORY, 'baselines.json')
+THRESHOLD = 0.25
+REPEAT = 5
+
+_benchmarks = OrderedDict()
+
+
+def benchmark(sizes=synthetic.SIZES, repeat=REPEAT):
+    """Registers a benchmark.
+
+    The decorated function is called once for each size with the context and
+    size, and must return the callable to time. Any setup should be performed
+    before returning the callable so that it is not included in the timings.
+
+    Example:
+
+    .. code-block:: python
+
+        @benchmark(sizes=(10, 1000))
+        def commands(context, size):
+            runner = context.runner(size)
+            return lambda: runner.commands
+
+    Args:
+        sizes (tuple): The number of synthetic commands to benchmark against
+        repeat (int): The number of times to time the callable
+    """
+    def decorator(func):
+        _benchmarks[func.__name__] = (func, sizes, repeat)
+        return func
+    return decorator
+
+
+class Context(object):
+    """Generates the synthetic commands required by the benchmarks.
+
+    The commands are written to a temporary directory which is added to
+    sys.path, and are only generated the first time each size is requested.
+    """
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='watson-console-bench-')
+        self.definitions = {}
+        sys.path.insert(0, self.directory)
+
+    def commands(self, size):
+        """The definitions of the synthetic commands for a size.
+        """
+        if size not in self.definitions:
+            self.definitions[size] = synthetic.generate(self.directory, size)
+        return self.definitions[size]
+
+    def runner(self, size, **kwargs):
+        """A runner containing the synthetic commands for a size.
+        """
+        from watson.console import Runner
+        return Runner(commands=self.commands(size), **kwargs)
+
+    def close(self):
+        sys.path.remove(self.directory)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def measure(func, repeat=REPEAT):
+    """Times a callable.
+
+    Returns:
+        A dict containing the minimum and median time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'min': min(timings), 'median': statistics.median(timings)}
+
+
+def discover():
+    """Imports every bench_*.py module within the benchmarks directory.
+    """
+    for filename in sorted(os.listdir(DIRECTORY)):
+        if filename.startswith('bench_') and filename.endswith('.py'):
+            importlib.import_module('benchmarks.' + filename[:-3])
+    return _benchmarks
+
+
+def run(names=None, sizes=None):
+    """Runs the benchmarks.
+
+    Args:
+        names (list): The benchmarks to run, defaults to all of them
+        sizes (list): Restricts the sizes that are run
+
+    Returns:
+        An OrderedDict of results keyed by name:size.
+    """
+    results = OrderedDict()
+    context = Context()
+    try:
+        for name, (func, bench_sizes, repeat) in discover().items():
+            if names and name not in names:
+                continue
+            for size in bench_sizes:
+                if sizes and size not in sizes:
+                    continue
+                timed = func(context, size)
+                results['{0}:{1}'.format(name, size)] = measure(timed, repeat)
+    finally:
+        context.close()
+    return results
+
+
+def compare(results, baselines, threshold=THRESHOLD):
+    """Finds the results that are slower than their baseline.
+
+    Args:
+        results (dict): The results of the current run
+        baselines (dict): The recorded results
+        threshold (float): The allowed slowdown, as a fraction of the baseline
+
+    Returns:
+        A list of (key, baseline, result) tuples.
+    """
+    regressions = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if baseline and result['median'] > baseline['median'] * (1 + threshold):
+            regressions.append((key, baseline['median'], result['median']))
+    return regressions
+
+
+def report(results, baselines=None):
+    baselines = baselines or {}
+    table = Table([
+        Column('Benchmark'),
+        Column('Min (ms)', align=RIGHT),
+        Column('Median (ms)', align=RIGHT),
+        Column('Baseline (ms)', align=RIGHT),
+        Column('Change', align=RIGHT)
+    ], sample=None)
+    rows = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if baseline:
+            change = '{0:+.1f}%'.format(
+                (result['median'] / baseline['median'] - 1) * 100)
+            baseline = '{0:.3f}'.format(baseline['median'] * 1000)
+        else:
+            change = baseline = ''
+        rows.append((key,
+                     '{0:.3f}'.format(result['min'] * 1000),
+                     '{0:.3f}'.format(result['median'] * 1000),
+                     baseline, change))
+    return table.render(rows)
+
+
+def load(path=BASELINES):
+    try:
+        with open(path) as file:
+            return json.load(file)['results']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save(results, path=BASELINES):
+    with open(path, 'w') as file:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results
+        }, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Runs the watson-console benchmarks.')
+    parser.add_argument('names', nargs='*', help='The benchmarks to run')
+    parser.add_argument('--size', type=int, action='append', dest='sizes',
+                        help='Only run against the specified number of commands')
+    parser.add_argument('--save', action='store_true',
+                        help='Record the results as the new baselines')
+    parser.add_argument('--compare', action='store_true',
+                        help='Exit with a non-zero status if any benchmark is slower than its baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='The allowed slowdown when comparing (default 0.25)')
+    parser.add_argument('--baselines', default=BASELINES,
+                        help='The file the baselines are recorded in')
+    parsed = parser.parse_args(args)
+    results = run(parsed.names, parsed.sizes)
+    baselines = load(parsed.baselines)
+    writer.stdout.writelines(report(results, baselines))
+    writer.stdout.flush()
+    if parsed.save:
+        baselines.update(results)
+        save(baselines, parsed.baselines)
+    if parsed.compare:
+        regressions = compare(results, baselines, parsed.threshold)
+        for key, baseline, result in regressions:
+            writer.stderr.write('Regression: {0} {1:.3f}ms -> {2:.3f}ms'.format(
+                key, baseline * 1000, result * 1000))
+        return 1 if regressions else 0
+    return 0
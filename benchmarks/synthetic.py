@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import os
+
+SIZES = (10, 1000, 10000)
+PER_MODULE = 100
+
+DOCSTRING = '''Performs operation {index} against the synthetic data.
+
+        Args:
+            name: The name of the item to operate on
+            count: The number of times to repeat the operation
+            verbose: Whether or not to output additional information
+        '''
+
+LONG_DOCSTRING = '''Performs operation {index} against the synthetic data.
+
+        {padding}
+
+        Args:
+            name: The name of the item to operate on
+            count: The number of times to repeat the operation
+            verbose: Whether or not to output additional information
+        '''
+
+PADDING = '\n        '.join(
+    ['Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod.'] * 8)
+
+TEMPLATE = '''
+class Command{index}(command.Base):
+    """Synthetic command {index}.
+    """
+    name = 'command{index}'
+
+    @arg('name')
+    @arg('count', optional=True, type=int, default=1)
+    @arg('verbose', optional=True, action='store_true')
+    def create(self, name, count, verbose):
+        """{docstring}"""
+        return name
+
+    @arg('name')
+    @arg('force', optional=True, action='store_true')
+    def delete(self, name, force):
+        """{docstring}"""
+        return name
+
+    @arg('query', optional=True)
+    def list(self, query):
+        """{docstring}"""
+        return query
+'''
+
+
+def package_name(size):
+    return 'synthetic_{0}'.format(size)
+
+
+def generate(directory, size, per_module=PER_MODULE):
+    """Writes a package containing a number of synthetic commands.
+
+    Each command contains three methods, each with several arguments and a
+    docstring describing them.
+
+    Args:
+        directory (string): The directory to write the package to
+        size (int): The number of commands to generate
+        per_module (int): The number of commands within each module
+
+    Returns:
+        A list of the definitions of the commands.
+    """
+    package = package_name(size)
+    path = os.path.join(directory, package)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, '__init__.py'), 'w'):
+        pass
+    definitions = []
+    for start in range(0, size, per_module):
+        module = 'commands_{0}'.format(start // per_module)
+        source = ['from watson.console import command',
+                  'from watson.console.decorators import arg']
+        for index in range(start, min(start + per_module, size)):
+            docstring = DOCSTRING.format(index=index)
+            source.append(TEMPLATE.format(index=index, docstring=docstring))
+            definitions.append('{0}.{1}.Command{2}'.format(package, module, index))
+        with open(os.path.join(path, module + '.py'), 'w') as file:
+            file.write('\n'.join(source))
+    return definitions
@@ -46,7 +46,8 @@ setup(
         'Topic :: Software Development :: Libraries :: Python Modules',
     ],
     packages=find_packages(
-        exclude=["*.tests", "*.tests.*", "tests.*", "tests"]),
+        exclude=["*.tests", "*.tests.*", "tests.*", "tests",
+                 "benchmarks", "benchmarks.*"]),
     include_package_data=True,
     zip_safe=False,
     install_requires=read('requirements.txt', as_list=True),
@@ -1,6 +1,17 @@
 # -*- coding: utf-8 -*-
-from watson.console import ConsoleError, command
-from watson.console.decorators import arg, cmd
+import asyncio
+import sys
+import time
+from watson.console import ConsoleError, colors, command
+from watson.console.decorators import arg, cached, cmd, parallel
+from watson.console.inputs import Lines, MappedFile
+from watson.console.parallel import PROCESS
+
+
+def python_script(code):
+    """The arguments to execute code in a new interpreter.
+    """
+    return [sys.executable, '-c', code]
 
 
 class NoCallCommand(command.Base):
@@ -55,3 +66,198 @@ class SampleArgumentsWithOptionsCommand(command.Base):
         if argument1 and filename:
             return True
         return False
+
+
+class SampleStatefulCommand(command.Base):
+    name = 'stateful'
+
+    def __init__(self):
+        self.seen = []
+
+    @arg('value')
+    def remember(self, value):
+        self.seen.append(value)
+        return ','.join(self.seen)
+
+
+class SampleAsyncCommand(command.Base):
+    name = 'async'
+
+    @arg('value', optional=True)
+    async def execute(self, value):
+        await asyncio.sleep(0)
+        if value == 'error':
+            raise ConsoleError('Something went wrong')
+        return asyncio.get_event_loop()
+
+
+class SampleStreamCommand(command.Base):
+    name = 'stream'
+    closed = False
+
+    @arg('count', optional=True, type=int, default=3)
+    def execute(self, count):
+        try:
+            for i in range(count):
+                yield 'line {}'.format(i)
+        finally:
+            SampleStreamCommand.closed = True
+
+    @cmd()
+    async def execute_async(self):
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield i
+
+    @cmd()
+    def error(self):
+        yield 'before'
+        raise ConsoleError('failed')
+
+
+class SampleWriteCommand(command.Base):
+    name = 'write'
+
+    @cmd()
+    def execute(self):
+        self.write('first')
+        self.writelines(['second', 'third'])
+        self.write('warning', error=True)
+        raise ConsoleError('failed')
+
+    @cmd()
+    def mixed(self):
+        print('a')
+        self.write('b')
+        print('c')
+
+
+class SampleParallelCommand(command.Base):
+    name = 'parallel'
+
+    @parallel('value')
+    @arg('suffix', optional=True, default='')
+    def double(self, value, suffix):
+        """Doubles each value.
+
+        Args:
+            value: The values to double
+        """
+        if value == 'error':
+            raise ValueError('Invalid value')
+        return '{0}{1}'.format(int(value) * 2, suffix)
+
+    @parallel('value', executor=PROCESS)
+    def pid(self, value):
+        import os
+        return os.getpid()
+
+    @parallel('value', executor=PROCESS)
+    def greet_process(self, value):
+        self.write('Hello {0}'.format(value))
+
+    @parallel('value')
+    def greet(self, value):
+        self.write('Hello')
+        self.write('World')
+
+    @arg('value', optional=True)
+    @parallel('value')
+    def item(self, value):
+        return 'item {0}'.format(value)
+
+    @parallel('value', ordered=False)
+    def sleep(self, value):
+        time.sleep(float(value))
+        return value
+
+
+class SampleRecordsCommand(command.Base):
+    name = 'records'
+
+    @cmd()
+    def emit_records(self):
+        self.write(colors.fail('Starting'))
+        self.emit({'id': 1, 'status': 'ok'})
+        self.emit_many({'id': i, 'status': 'ok'} for i in range(2, 4))
+        self.write('Finished', error=True)
+
+    @cmd()
+    def stream(self):
+        for i in range(2):
+            yield {'id': i}
+
+    @cmd()
+    def error(self):
+        raise ConsoleError('Something went wrong')
+
+
+class SampleInputsCommand(command.Base):
+    name = 'inputs'
+    received = []
+
+    @arg('source', type=Lines)
+    def count(self, source):
+        self.received.append(source)
+        return sum(1 for line in source)
+
+    @arg('sources', type=MappedFile, nargs='+')
+    def size(self, sources):
+        self.received.extend(sources)
+        return sum(len(source) for source in sources)
+
+    @arg('source', type=MappedFile)
+    def head(self, source):
+        return source.view()[:3]
+
+
+class SampleCachedCommand(command.Base):
+    name = 'cached'
+    calls = 0
+
+    @cached(ttl=60)
+    @arg('id')
+    def lookup(self, id):
+        SampleCachedCommand.calls += 1
+        self.write('Looking up {0}'.format(id))
+        self.write(colors.warning('Slow'), error=True)
+        return {'id': id, 'owner': 'watson'}
+
+    @cached()
+    @arg('source', type=Lines)
+    def count(self, source):
+        SampleCachedCommand.calls += 1
+        return sum(1 for line in source)
+
+    @cached()
+    @parallel('value')
+    def square(self, value):
+        SampleCachedCommand.calls += 1
+        return int(value) ** 2
+
+
+class SampleWatchedCommand(command.Base):
+    name = 'watched'
+    runs = []
+
+    @arg('path')
+    def read(self, path):
+        with open(path) as f:
+            SampleWatchedCommand.runs.append(f.read())
+
+
+class SampleProcessesCommand(command.Base):
+    name = 'processes'
+
+    @cmd()
+    def build(self):
+        return self.run_processes({
+            'first': python_script('print("one"); print("two")'),
+            'second': python_script(
+                'import sys; sys.stderr.write("failed\\n"); sys.exit(3)')
+        })
+
+    @cmd()
+    async def build_async(self):
+        return await self.run_processes_async(
+            [python_script('print("one")')], check=False)
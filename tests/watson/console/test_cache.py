@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import time
+from pytest import raises
+from watson.console import Runner, writer
+from watson.console.cache import Cache, Recorder
+from watson.console.decorators import arg, cached, parallel
+from watson.console.inputs import Lines
+from watson.console.parallel import PROCESS
+from tests.watson.console.support import SampleCachedCommand
+
+
+class TestCache(object):
+
+    def test_key(self, tmp_path):
+        cache = Cache(str(tmp_path))
+        key = cache.key('ns', 'method', {'a': 1, 'b': 2})
+        assert key == cache.key('ns', 'method', {'b': 2, 'a': 1})
+        assert key != cache.key('ns', 'method', {'a': 1, 'b': 3})
+        assert key != cache.key('ns', 'method', {'a': 1, 'b': 2}, 'jsonl')
+        assert key != cache.key('ns', 'method', {'a': 1, 'b': 2}, color=True)
+
+    def test_get_set(self, tmp_path):
+        cache = Cache(str(tmp_path / 'results'))
+        assert cache.get('key') is None
+        assert cache.set('key', {'value': 1}, [(False, ['line'])])
+        assert cache.get('key') == ({'value': 1}, [(False, ['line'])])
+        cache.clear()
+        assert cache.get('key') is None
+
+    def test_key_inputs(self, tmp_path):
+        cache = Cache(str(tmp_path))
+        path = tmp_path / 'input.txt'
+        path.write_text('one\n')
+        key = cache.key('ns', 'method', {'source': Lines(str(path))})
+        assert key == cache.key('ns', 'method', {'source': Lines(str(path))})
+        path.write_text('one\ntwo\n')
+        assert key != cache.key('ns', 'method', {'source': Lines(str(path))})
+        assert cache.key('ns', 'method', {'source': Lines('-')}) is None
+
+    def test_unpicklable(self, tmp_path):
+        cache = Cache(str(tmp_path))
+        assert not cache.set('key', lambda: None, [])
+        assert cache.get('key') is None
+
+    def test_ttl(self, tmp_path):
+        cache = Cache(str(tmp_path), ttl=0)
+        cache.set('key', 1, [])
+        time.sleep(0.01)
+        assert cache.get('key') is None
+        assert not os.listdir(str(tmp_path))
+
+    def test_lru_eviction(self, tmp_path):
+        cache = Cache(str(tmp_path))
+        for key in ('first', 'second'):
+            cache.set(key, 'x' * 100, [])
+        now = time.time()
+        os.utime(cache.path('first'), (now - 10, now - 10))
+        os.utime(cache.path('second'), (now - 5, now - 5))
+        cache.get('first')
+        cache.max_size = os.path.getsize(cache.path('first')) * 2
+        cache.set('third', 'x' * 100, [])
+        assert cache.get('second') is None
+        assert cache.get('first') is not None
+        assert cache.get('third') is not None
+
+
+class TestRecorder(object):
+
+    def test_records_and_writes(self, capsys):
+        recorder = Recorder()
+        with recorder.task():
+            SampleCachedCommand().write('message')
+        SampleCachedCommand().write('not recorded')
+        assert recorder.lines == [(False, ['message'])]
+        writer.flush()
+        out, _ = capsys.readouterr()
+        assert out == 'message\nnot recorded\n'
+
+
+class TestRunnerCache(object):
+
+    def setup_method(self):
+        SampleCachedCommand.calls = 0
+
+    def test_cached(self, tmp_path, capsys):
+        runner = Runner(commands=[SampleCachedCommand])
+        runner.cache_directory = str(tmp_path)
+        args = ['test.py', 'cached', 'lookup', '1']
+        result = runner(list(args))
+        assert result == runner(list(args)) == {'id': '1', 'owner': 'watson'}
+        assert SampleCachedCommand.calls == 1
+        out, err = capsys.readouterr()
+        assert out == 'Looking up 1\n' * 2
+        assert err == 'Slow\n' * 2
+        runner(['test.py', 'cached', 'lookup', '2'])
+        assert SampleCachedCommand.calls == 2
+
+    def test_color(self, tmp_path, capsys):
+        runner = Runner(commands=[SampleCachedCommand])
+        runner.cache_directory = str(tmp_path)
+        runner.color = True
+        runner(['test.py', 'cached', 'lookup', '1'])
+        assert '\x1b' in capsys.readouterr().err
+        runner.color = False
+        runner(['test.py', 'cached', 'lookup', '1'])
+        assert capsys.readouterr().err == 'Slow\n'
+        assert SampleCachedCommand.calls == 2
+
+    def test_no_cache(self, tmp_path):
+        runner = Runner(commands=[SampleCachedCommand])
+        runner.cache_directory = str(tmp_path)
+        runner(['test.py', 'cached', 'lookup', '1'])
+        runner(['test.py', 'cached', 'lookup', '1', '--no-cache'])
+        assert SampleCachedCommand.calls == 2
+
+    def test_input_changed(self, tmp_path):
+        runner = Runner(commands=[SampleCachedCommand])
+        runner.cache_directory = str(tmp_path)
+        path = tmp_path / 'input.txt'
+        path.write_text('one\ntwo\n')
+        args = ['test.py', 'cached', 'count', str(path)]
+        assert runner(list(args)) == runner(list(args)) == 2
+        assert SampleCachedCommand.calls == 1
+        path.write_text('one\ntwo\nthree\n')
+        assert runner(list(args)) == 3
+        assert SampleCachedCommand.calls == 2
+
+    def test_stdin_not_cached(self, tmp_path, monkeypatch):
+        runner = Runner(commands=[SampleCachedCommand])
+        runner.cache_directory = str(tmp_path)
+        monkeypatch.setattr(Lines, '_open', lambda self: io.StringIO('one\n'))
+        runner(['test.py', 'cached', 'count', '-'])
+        runner(['test.py', 'cached', 'count', '-'])
+        assert SampleCachedCommand.calls == 2
+
+    def test_parallel(self, tmp_path, capsys):
+        runner = Runner(commands=[SampleCachedCommand])
+        runner.cache_directory = str(tmp_path)
+        for jobs in ('2', '2', '1'):
+            assert runner(['test.py', 'cached', 'square', '1', '2', '3',
+                           '--jobs', jobs]) == [1, 4, 9]
+        assert SampleCachedCommand.calls == 3
+        out, _ = capsys.readouterr()
+        assert out == '1\n4\n9\n' * 3
+
+    def test_process_parallel_not_cached(self):
+        with raises(TypeError):
+            @cached()
+            @parallel('value', executor=PROCESS)
+            def first(self, value):
+                pass
+        with raises(TypeError):
+            @parallel('value', executor=PROCESS)
+            @cached()
+            @arg('value')
+            def second(self, value):
+                pass
+
+    def test_generators_not_cached(self):
+        with raises(TypeError):
+            @cached()
+            def stream(self):
+                yield 1
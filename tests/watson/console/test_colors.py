@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from watson.console.colors import header, ok_blue, ok_green, warning, fail
+from watson.console.styles import colored
 
 
 class TestColors(object):
@@ -23,3 +24,8 @@ class TestColors(object):
     def test_fail(self):
         assert fail('test') == '\033[91mtest\033[0m'
         assert fail('test', terminate=False) == '\033[91mtest'
+
+    def test_disabled(self):
+        with colored(False):
+            assert header('test') == 'test'
+            assert fail('test', terminate=False) == 'test'
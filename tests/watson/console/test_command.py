@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from watson.console.command import find_commands_in_module
+from watson.console.command import Base, find_commands_in_module
+from watson.console.decorators import cmd
 from tests.watson.console import support
 
 
@@ -7,4 +8,30 @@ class TestFindCommands(object):
 
     def test_find_commands(self):
         commands = find_commands_in_module(support)
-        assert len(commands) == 7
+        assert len(commands) == 17
+
+
+class TestBase(object):
+
+    def test_commands_registered(self):
+        assert Base.__commands__ == {}
+        assert list(support.SampleNoHelpNoExecuteCommand.__commands__) == []
+        assert list(support.SampleStringCommand.__commands__) == ['execute']
+
+    def test_commands_inherited(self):
+        class Parent(Base):
+            @cmd()
+            def first(self):
+                pass
+
+            @cmd()
+            def second(self):
+                pass
+
+        class Child(Parent):
+            second = None
+
+            @cmd()
+            def third(self):
+                pass
+        assert list(Child.__commands__) == ['first', 'third']
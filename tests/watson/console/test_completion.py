@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from pytest import fixture, raises
+from watson.common.imports import definition_lookup
+from watson.console import Runner
+from watson.console.completion import Index, build, complete, script
+from watson.console.registry import Registry
+
+
+COMMANDS = '''
+from watson.console import command
+from watson.console.decorators import arg
+
+
+class CompletionCommand(command.Base):
+    name = 'deploy'
+
+    @arg('environment', optional=True, choices=['staging', 'production'])
+    @arg('force', optional=True, action='store_true')
+    def release(self, environment, force):
+        """Releases the application.
+        """
+
+    @arg('target')
+    def rollback(self, target):
+        """Rolls back a release.
+        """
+'''
+
+OPTIONS = {'--batch': True, '--profile-startup': False}
+
+
+@fixture
+def commands_module(tmp_path, monkeypatch):
+    path = tmp_path / 'completion_commands.py'
+    path.write_text(COMMANDS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield str(path)
+    sys.modules.pop('completion_commands', None)
+    definition_lookup.pop('completion_commands.CompletionCommand', None)
+
+
+@fixture
+def index(commands_module):
+    registry = Registry()
+    registry.add('completion_commands.CompletionCommand')
+    return build(registry)
+
+
+class TestComplete(object):
+
+    def test_namespaces(self, index):
+        assert complete(index, ['']) == ['deploy']
+        assert complete(index, []) == ['deploy']
+        assert complete(index, ['x']) == []
+        assert complete(index, ['--'], OPTIONS) == ['--batch', '--help', '--profile-startup']
+
+    def test_methods(self, index):
+        assert complete(index, ['deploy', '']) == ['release', 'rollback']
+        assert complete(index, ['deploy', 'rel']) == ['release']
+        assert complete(index, ['unknown', '']) == []
+
+    def test_options(self, index):
+        assert complete(index, ['deploy', 'release', '--']) == [
+            '--environment', '--force', '--help']
+        assert complete(index, ['deploy', 'release', '--force', '--']) == [
+            '--environment', '--help']
+        assert complete(index, ['deploy', 'release', '--environment', '']) == [
+            'production', 'staging']
+        assert complete(index, ['deploy', 'release', '--force', '']) == []
+
+    def test_skips_runner_options(self, index):
+        assert complete(index, ['--profile-startup', 'deploy', 'ro'], OPTIONS) == ['rollback']
+        assert complete(index, ['--batch', 'file', ''], OPTIONS) == ['deploy']
+        assert complete(index, ['--batch', ''], OPTIONS) == []
+
+
+class TestIndex(object):
+
+    def test_rebuilt_when_module_changes(self, tmp_path, commands_module):
+        registry = Registry()
+        registry.add('completion_commands.CompletionCommand')
+        index = Index(str(tmp_path / 'index.json'))
+        data = index.get(registry)
+        assert index.fresh(index.load(), registry.definitions)
+        assert list(data['modules']) == [commands_module]
+        stat = os.stat(commands_module)
+        os.utime(commands_module, (stat.st_atime, stat.st_mtime + 10))
+        assert not index.fresh(index.load(), registry.definitions)
+        registry.add('tests.watson.console.support.SampleOptionsCommand')
+        assert not index.fresh(data, registry.definitions)
+
+    def test_does_not_import(self, tmp_path, commands_module):
+        path = str(tmp_path / 'index.json')
+        Index(path).get(Runner(commands=['completion_commands.CompletionCommand']).registry)
+        runner = Runner(commands=['completion_commands.CompletionCommand'])
+        data = Index(path).get(runner.registry)
+        assert 'deploy' in data['namespaces']
+        assert runner.registry.imports == 0
+
+
+class TestRunnerCompletion(object):
+
+    def test_complete(self, tmp_path, commands_module, capsys):
+        runner = Runner(commands=['completion_commands.CompletionCommand'])
+        runner.completion_index = str(tmp_path / 'index.json')
+        assert runner.execute(['console.py', '--complete', '--', 'deploy', '']) == [
+            'release', 'rollback']
+        assert capsys.readouterr().out == 'release\nrollback\n'
+        assert runner.execute(['console.py', '--complete', '--', '--profile-startup', 'deploy', 'rel']) == [
+            'release']
+
+    def test_path_alongside_manifest(self, tmp_path):
+        runner = Runner(manifest=str(tmp_path / 'manifest.json'))
+        assert runner._completion_path('console.py') == str(tmp_path / 'manifest.completion.json')
+
+    def test_script(self, capsys):
+        runner = Runner()
+        runner.execute(['/usr/bin/console.py', '--completion', 'bash'])
+        out = capsys.readouterr().out
+        assert 'complete -o default -F _watson_console_console_py console.py' in out
+        assert 'compdef' in script('zsh', 'console.py')
+        assert 'complete -c console.py' in script('fish', 'console.py')
+        with raises(SystemExit):
+            runner.execute(['console.py', '--completion', 'tcsh'])
+        assert 'Unsupported shell' in capsys.readouterr().err
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+from pytest import fixture
+from watson.console import Runner
+from watson.console.daemon import Client, Server, main
+
+
+@fixture
+def server(tmp_path):
+    runner = Runner(commands=[
+        'tests.watson.console.support.SampleStringCommand',
+        'tests.watson.console.support.SampleOptionsCommand',
+        'tests.watson.console.support.SampleNonStringCommand'
+    ])
+    server = Server(runner, str(tmp_path / 'console.sock'),
+                    idle_timeout=30, poll_interval=0.05)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    assert server.ready.wait(10)
+    yield server
+    server.stop()
+    thread.join()
+
+
+class TestServer(object):
+
+    def execute(self, server, tmp_path, args):
+        out = open(str(tmp_path / 'out.txt'), 'w+')
+        err = open(str(tmp_path / 'err.txt'), 'w+')
+        with out, err:
+            status = Client(server.path).execute(
+                args, stdio=(0, out.fileno(), err.fileno()))
+            out.seek(0)
+            err.seek(0)
+            return status, out.read(), err.read()
+
+    def test_ready(self, server):
+        assert os.path.exists(server.path)
+        assert not os.path.exists('{}.{}.tmp'.format(server.path, os.getpid()))
+
+    def test_prepare(self, server):
+        assert ('runoptions', 'execute') in server.runner._parsers
+        assert len(server.modules) == 1
+        assert not server.changed()
+
+    def test_execute(self, server, tmp_path):
+        status, out, err = self.execute(
+            server, tmp_path, ['runoptions', 'execute', '--filename', 'test'])
+        assert status == 0
+
+    def test_execute_error(self, server, tmp_path):
+        status, out, err = self.execute(
+            server, tmp_path, ['string', 'execute'])
+        assert status == 1
+        assert 'Something went wrong' in err
+
+    def test_execute_help(self, server, tmp_path):
+        status, out, err = self.execute(server, tmp_path, [])
+        assert status == 0
+        assert 'runoptions' in out
+
+    def test_changed(self, server):
+        path = next(iter(server.modules))
+        server.modules[path] -= 10
+        assert server.changed()
+        server.modules[path] += 10
+
+
+class TestServerIdle(object):
+
+    def test_idle_timeout(self, tmp_path):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleNonStringCommand'
+        ])
+        server = Server(runner, str(tmp_path / 'console.sock'),
+                        idle_timeout=0.01, poll_interval=0.01)
+        server.serve_forever()
+        assert not os.path.exists(server.path)
+
+
+class TestMain(object):
+
+    def test_usage(self):
+        assert main([]) == 2
+
+    def test_no_server(self, tmp_path):
+        assert main([str(tmp_path / 'missing.sock'), 'namespace']) == 1
+
+
+class TestRunnerServe(object):
+
+    def test_serve(self, tmp_path):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleNonStringCommand'
+        ])
+        path = str(tmp_path / 'console.sock')
+        runner.execute(['test.py', '--serve', path, '--idle-timeout', '0.01'])
+        assert not os.path.exists(path)
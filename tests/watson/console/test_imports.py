@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import subprocess
+import sys
+from pytest import mark
+import watson.console
+
+HEAVY_MODULES = ('argparse', 'asyncio', 'concurrent.futures', 'multiprocessing',
+                 'pickle', 'socket', 'watson.common.imports',
+                 'watson.console.cache', 'watson.console.runner')
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+# The imports required to define commands, the time they take is measured by
+# the cold_import_commands benchmark (see benchmarks/bench_runner.py).
+IMPORTS = '''
+import json, sys
+import watson.console
+from watson.console import command
+from watson.console.decorators import arg, cmd
+print(json.dumps(sorted(sys.modules)))
+'''
+
+
+def _imported():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT
+    output = subprocess.check_output(
+        [sys.executable, '-c', IMPORTS], env=env, universal_newlines=True)
+    return json.loads(output)
+
+
+class TestLazyImports(object):
+
+    @mark.skipif(sys.version_info < (3, 7),
+                 reason='The runner is imported eagerly before Python 3.7')
+    def test_heavy_modules_not_imported(self):
+        modules = _imported()
+        for module in HEAVY_MODULES:
+            assert module not in modules
+
+    def test_lazy_attributes(self):
+        from watson.console.exceptions import ConsoleError
+        from watson.console.runner import Runner
+        assert watson.console.ConsoleError is ConsoleError
+        assert watson.console.Runner is Runner
+        assert 'Runner' in dir(watson.console)
+
+    def test_missing_attribute(self):
+        try:
+            watson.console.Missing
+        except AttributeError as exc:
+            assert 'Missing' in str(exc)
+        else:
+            assert False
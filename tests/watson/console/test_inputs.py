@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import io
+import sys
+from pytest import raises
+from watson.console import Runner
+from watson.console.inputs import Chunks, Input, Lines, MappedFile, close_all
+from watson.console.runner import POST_EXECUTE
+from tests.watson.console.support import SampleInputsCommand
+
+
+def _write(tmpdir, content, name='input.txt'):
+    path = tmpdir.join(name)
+    path.write_binary(content)
+    return str(path)
+
+
+class TestInput(object):
+
+    def test_lazy(self, tmpdir):
+        source = Input(_write(tmpdir, b'line\n'))
+        assert source._file is None
+        assert source.read() == 'line\n'
+        source.close()
+        assert source.closed
+        with raises(ValueError):
+            source.read()
+
+    def test_missing(self, tmpdir):
+        with raises(ValueError):
+            Input(str(tmpdir.join('missing.txt')))
+
+    def test_stdin(self, tmpdir, monkeypatch):
+        with open(_write(tmpdir, b'first\nsecond'), 'rb') as f:
+            monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(f))
+            source = Lines('-')
+            assert source.is_stdin
+            assert list(source) == ['first', 'second']
+            source.close()
+            assert not f.closed
+
+    def test_chunks(self, tmpdir):
+        path = _write(tmpdir, b'abcdefg')
+        with Chunks.of(3)(path) as source:
+            assert list(source) == [b'abc', b'def', b'g']
+        assert Chunks(path).size == Chunks.size
+
+    def test_mapped(self, tmpdir):
+        with MappedFile(_write(tmpdir, b'first\nsecond')) as source:
+            assert len(source) == 12
+            assert source[0:5] == b'first'
+            assert source.view()[6:].tobytes() == b'second'
+            assert list(source) == [b'first\n', b'second']
+        assert source._map is None
+
+    def test_mapped_empty(self, tmpdir):
+        with MappedFile(_write(tmpdir, b'')) as source:
+            assert len(source) == 0
+            assert list(source) == []
+
+    def test_close_all(self, tmpdir):
+        path = _write(tmpdir, b'line\n')
+        first, second = Input(path), Input(path)
+        first.read()
+        close_all([first, [second], 'value'])
+        assert first.closed and second.closed
+
+
+class TestRunnerInputs(object):
+
+    def setup_method(self):
+        SampleInputsCommand.received = []
+
+    def test_closed_after_execute(self, tmpdir):
+        runner = Runner(commands=[SampleInputsCommand])
+        path = _write(tmpdir, b'one\ntwo\nthree\n')
+        assert runner(['test.py', 'inputs', 'count', path]) == 3
+        source, = SampleInputsCommand.received
+        assert source.closed
+        assert source._file is None
+
+    def test_nargs(self, tmpdir):
+        runner = Runner(commands=[SampleInputsCommand])
+        first = _write(tmpdir, b'abc', 'first.txt')
+        second = _write(tmpdir, b'de', 'second.txt')
+        assert runner(['test.py', 'inputs', 'size', first, second]) == 5
+        assert all(source.closed for source in SampleInputsCommand.received)
+
+    def test_view_outlives_command(self, tmpdir):
+        runner = Runner(commands=[SampleInputsCommand])
+        invocations = []
+        runner.add_hook(POST_EXECUTE, invocations.append)
+        path = _write(tmpdir, b'abcdef')
+        view = runner(['test.py', 'inputs', 'head', path])
+        assert view.tobytes() == b'abc'
+        assert len(invocations) == 1
+
+    def test_invalid_path(self, tmpdir, capsys):
+        runner = Runner(commands=[SampleInputsCommand])
+        with raises(SystemExit):
+            runner(['test.py', 'inputs', 'count', str(tmpdir.join('missing'))])
+        _, err = capsys.readouterr()
+        assert 'invalid Lines value' in err
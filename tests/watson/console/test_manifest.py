@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from pytest import fixture, raises
+from watson.common.imports import definition_lookup
+from watson.console import Runner
+from watson.console.manifest import Manifest, describe, module_path
+from tests.watson.console.support import SampleOptionsCommand
+
+
+COMMANDS = '''
+from watson.console import command
+from watson.console.decorators import arg
+
+
+class ManifestCommand(command.Base):
+    name = 'manifest'
+
+    @arg('filename', optional=True)
+    def execute(self, filename):
+        """Executes the manifest command.
+        """
+        return filename
+'''
+
+
+@fixture
+def commands_module(tmp_path, monkeypatch):
+    path = tmp_path / 'manifest_commands.py'
+    path.write_text(COMMANDS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield str(path)
+    sys.modules.pop('manifest_commands', None)
+    definition_lookup.pop('manifest_commands.ManifestCommand', None)
+
+
+class TestDescribe(object):
+
+    def test_describe(self):
+        description = describe(SampleOptionsCommand)
+        assert description['name'] == 'runoptions'
+        method = description['methods']['execute']
+        assert method['args'] == [
+            {'name': '--filename', 'dest': 'filename', 'kwargs': {'help': ''}}]
+
+    def test_module_path(self, commands_module):
+        assert module_path('manifest_commands.ManifestCommand') == commands_module
+        assert not module_path('does_not_exist.Command')
+
+
+class TestManifest(object):
+
+    def test_update_and_save(self, tmp_path, commands_module):
+        path = str(tmp_path / 'manifest.json')
+        manifest = Manifest(path)
+        assert not manifest.get('manifest_commands.ManifestCommand')
+        runner = Runner(commands=['manifest_commands.ManifestCommand'],
+                        manifest=manifest)
+        assert 'manifest' in runner.describe_commands()
+        assert os.path.exists(path)
+        entry = Manifest(path).get('manifest_commands.ManifestCommand')
+        assert entry['methods']['execute']['help'] == 'Executes the manifest command.'
+
+    def test_stale_entry(self, tmp_path, commands_module):
+        manifest = Manifest(str(tmp_path / 'manifest.json'))
+        runner = Runner(commands=['manifest_commands.ManifestCommand'],
+                        manifest=manifest)
+        runner.describe_commands()
+        mtime = os.stat(commands_module).st_mtime
+        os.utime(commands_module, (mtime + 10, mtime + 10))
+        assert not Manifest(manifest.path).get('manifest_commands.ManifestCommand')
+
+    def test_corrupt_manifest(self, tmp_path):
+        path = tmp_path / 'manifest.json'
+        path.write_text('{')
+        assert Manifest(str(path)).entries == {}
+
+    def test_unwritable(self, tmp_path, commands_module):
+        # the manifest's directory is a file, so it can't be created
+        (tmp_path / 'file').write_text('')
+        runner = Runner(commands=['manifest_commands.ManifestCommand'],
+                        manifest=str(tmp_path / 'file' / 'manifest.json'))
+        output = runner.execute(['test.py', 'manifest', 'execute', '--filename', 'test'])
+        assert output == 'test'
+
+    def test_help_does_not_import(self, tmp_path, commands_module):
+        path = str(tmp_path / 'manifest.json')
+        Runner(commands=['manifest_commands.ManifestCommand'],
+               manifest=path).describe_commands()
+        sys.modules.pop('manifest_commands')
+        definition_lookup.pop('manifest_commands.ManifestCommand')
+        runner = Runner(commands=['manifest_commands.ManifestCommand'],
+                        manifest=path)
+        with raises(SystemExit):
+            runner.execute(['test.py'])
+        assert 'manifest_commands' not in sys.modules
+
+    def test_execute_imports_command(self, tmp_path, commands_module):
+        runner = Runner(commands=['manifest_commands.ManifestCommand'],
+                        manifest=str(tmp_path / 'manifest.json'))
+        output = runner.execute(['test.py', 'manifest', 'execute', '--filename', 'test'])
+        assert output == 'test'
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import json
+import socket
+from pytest import raises
+from watson.console import Runner
+from watson.console.metrics import Metrics, JSONLinesSink, StatsdSink, peak_rss
+from watson.console.runner import POST_EXECUTE, PRE_EXECUTE
+from tests.watson.console.support import (SampleOptionsCommand,
+                                          SampleStringCommand)
+
+
+class MemorySink(object):
+
+    def __init__(self):
+        self.records = []
+
+    def send(self, record):
+        self.records.append(record)
+
+
+class TestHooks(object):
+
+    def test_invalid_hook(self):
+        with raises(ValueError):
+            Runner(commands=[SampleOptionsCommand, SampleStringCommand]).add_hook('invalid', lambda invocation: None)
+
+    def test_pre_and_post(self):
+        runner = Runner(commands=[SampleOptionsCommand, SampleStringCommand])
+        calls = []
+        runner.add_hook(PRE_EXECUTE, lambda i: calls.append(('pre', i.method, i.kwargs)))
+        runner.add_hook(POST_EXECUTE, lambda i: calls.append(('post', i.status, i.result)))
+        result = runner.execute(['test.py', 'runoptions', 'execute', '--filename', 'test'])
+        assert calls[0] == ('pre', 'execute', {'filename': 'test'})
+        assert calls[1] == ('post', 0, result)
+
+    def test_post_on_console_error(self, capsys):
+        runner = Runner(commands=[SampleOptionsCommand, SampleStringCommand])
+        invocations = []
+        runner.add_hook(POST_EXECUTE, invocations.append)
+        with raises(SystemExit):
+            runner.execute(['test.py', 'string', 'execute'])
+        assert invocations[0].status == 1
+        assert invocations[0].exception is not None
+
+
+class TestMetrics(object):
+
+    def test_record(self):
+        runner = Runner(commands=[SampleOptionsCommand, SampleStringCommand])
+        sink = MemorySink()
+        Metrics(sink).install(runner)
+        runner.execute(['test.py', 'runoptions', 'execute', '--filename', 'test'])
+        record, = sink.records
+        assert record['namespace'] == 'runoptions'
+        assert record['method'] == 'execute'
+        assert record['status'] == 0
+        assert not record['console_error']
+        assert record['wall'] >= 0 and record['cpu'] >= 0
+        assert record['max_rss'] == peak_rss() or record['max_rss'] > 0
+
+    def test_console_error(self, capsys):
+        runner = Runner(commands=[SampleOptionsCommand, SampleStringCommand])
+        sink = MemorySink()
+        Metrics(sink).install(runner)
+        with raises(SystemExit):
+            runner.execute(['test.py', 'string', 'execute'])
+        assert sink.records[0]['status'] == 1
+        assert sink.records[0]['console_error']
+
+    def test_json_lines_sink(self, tmpdir):
+        path = str(tmpdir.join('metrics.jsonl'))
+        sink = JSONLinesSink(path)
+        sink.send({'method': 'a'})
+        sink.send({'method': 'b'})
+        with open(path) as file:
+            lines = [json.loads(line) for line in file]
+        assert [line['method'] for line in lines] == ['a', 'b']
+
+    def test_statsd_sink(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(2)
+        try:
+            sink = StatsdSink('127.0.0.1', receiver.getsockname()[1], 'app')
+            sink.send({
+                'namespace': 'ns', 'method': 'run', 'wall': 0.5, 'cpu': 0.25,
+                'max_rss': 1024, 'status': 0, 'console_error': True
+            })
+            lines = receiver.recv(4096).decode('utf-8').split('\n')
+        finally:
+            receiver.close()
+        assert 'app.ns.run.wall:500.000|ms' in lines
+        assert 'app.ns.run.cpu:250.000|ms' in lines
+        assert 'app.ns.run.status.0:1|c' in lines
+        assert 'app.ns.run.max_rss:1024|g' in lines
+        assert 'app.ns.run.console_error:1|c' in lines
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import json
+from pytest import raises
+from watson.console import ConsoleError, Runner, colors, output
+from watson.console.writer import Multiplexer, Writer, FLUSH_EXIT
+from tests.watson.console.support import SampleRecordsCommand
+
+
+def _records(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestOutput(object):
+
+    def test_formatted(self):
+        assert output.current() == output.TEXT
+        with output.formatted(output.JSONL):
+            assert output.current() == output.JSONL
+            assert output.formatter() is output.encode
+        assert output.current() == output.TEXT
+        with raises(ValueError):
+            output.set_format('xml')
+
+    def test_encode(self):
+        assert json.loads(output.encode({'a': 'ü', 'b': [1, 2]})) == {'a': 'ü', 'b': [1, 2]}
+        assert '\n' not in output.encode({'a': 'multiple\nlines'})
+        assert list(output.encode_many([1, 'a'])) == ['1', '"a"']
+
+    def test_custom_encoder(self):
+        output.set_encoder(lambda record: 'custom')
+        try:
+            assert output.encode({}) == 'custom'
+        finally:
+            output.set_encoder(None)
+        assert output.encode({}) == '{}'
+
+    def test_text(self):
+        assert output.text({'id': 1, 'status': 'ok'}) == '1\tok'
+        assert output.text('line') == 'line'
+
+    def test_records(self):
+        assert output.message(colors.fail('failed'), error=True) == {
+            'message': 'failed', 'level': 'error'}
+        assert output.error(ConsoleError('failed')) == {
+            'error': 'failed', 'type': 'ConsoleError'}
+
+
+class TestRunnerOutput(object):
+
+    def test_text(self, capsys):
+        runner = Runner(commands=[SampleRecordsCommand])
+        runner.color = False
+        runner.execute(['test.py', 'records', 'emit_records'])
+        out, err = capsys.readouterr()
+        assert out == 'Starting\n1\tok\n2\tok\n3\tok\n'
+        assert err == 'Finished\n'
+
+    def test_jsonl(self, capsys):
+        runner = Runner(commands=[SampleRecordsCommand])
+        runner.color = True
+        runner.execute(['test.py', '--output', 'jsonl', 'records', 'emit_records'])
+        out, err = capsys.readouterr()
+        assert _records(out) == [
+            {'message': 'Starting'},
+            {'id': 1, 'status': 'ok'},
+            {'id': 2, 'status': 'ok'},
+            {'id': 3, 'status': 'ok'}]
+        assert _records(err) == [{'message': 'Finished', 'level': 'error'}]
+        assert output.current() == output.TEXT
+
+    def test_stream(self, capsys):
+        runner = Runner(commands=[SampleRecordsCommand])
+        runner.output_format = output.JSONL
+        runner.execute(['test.py', 'records', 'stream'])
+        assert _records(capsys.readouterr().out) == [{'id': 0}, {'id': 1}]
+
+    def test_error(self, capsys):
+        runner = Runner(commands=[SampleRecordsCommand])
+        with raises(SystemExit):
+            runner.execute(['test.py', '--output=jsonl', 'records', 'error'])
+        assert _records(capsys.readouterr().err) == [
+            {'error': 'Something went wrong', 'type': 'ConsoleError'}]
+
+    def test_listing(self, capsys):
+        runner = Runner(commands=[SampleRecordsCommand])
+        with raises(SystemExit):
+            runner.execute(['test.py', '--output', 'jsonl'])
+        records = _records(capsys.readouterr().out)
+        assert records[0] == {'namespace': 'records', 'command': 'emit_records', 'help': 'Missing doc.'}
+        assert len(records) == 3
+
+    def test_invalid(self, capsys):
+        with raises(SystemExit):
+            Runner(commands=[SampleRecordsCommand]).execute(['test.py', '--output', 'xml', 'records', 'stream'])
+        assert 'Invalid output xml' in capsys.readouterr().err
+
+    def test_task(self):
+        out = Writer(__import__('io').StringIO(), policy=FLUSH_EXIT)
+        with output.formatted(output.JSONL):
+            with Multiplexer(out, styles=[None]) as multiplexer:
+                with multiplexer.task('[a] '):
+                    SampleRecordsCommand().emit({'id': 1})
+        assert _records(out.stream.getvalue()) == [{'id': 1, 'task': '[a]'}]
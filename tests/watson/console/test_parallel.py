@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from pytest import raises
+from watson.console import Runner
+from watson.console.decorators import parallel
+from watson.console.parallel import PROCESS, bind, imap, workers
+from tests.watson.console.support import SampleParallelCommand
+
+
+def _square(value):
+    if value < 0:
+        raise ValueError(value)
+    return value * value
+
+
+class TestImap(object):
+
+    def test_serial(self):
+        outcomes = list(imap(_square, [1, -1, 2]))
+        assert [(item, result) for item, result, _ in outcomes] == [
+            (1, 1), (-1, None), (2, 4)]
+        assert isinstance(outcomes[1][2], ValueError)
+
+    def test_ordered(self):
+        threads = set()
+
+        def func(value):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return value
+
+        outcomes = list(imap(func, range(20), jobs=4))
+        assert [result for _, result, _ in outcomes] == list(range(20))
+        assert len(threads) > 1
+
+    def test_as_completed(self):
+        outcomes = list(imap(lambda v: time.sleep(v) or v, [0.2, 0.0],
+                             jobs=2, ordered=False))
+        assert [result for _, result, _ in outcomes] == [0.0, 0.2]
+
+    def test_process(self):
+        outcomes = list(imap(_square, [1, 2, -3], jobs=2, executor=PROCESS))
+        assert [result for _, result, _ in outcomes] == [1, 4, None]
+
+    def test_invalid_executor(self):
+        with raises(ValueError):
+            list(imap(_square, [1], executor='invalid'))
+
+    def test_workers(self):
+        assert workers(4) == 4
+        assert workers(0) >= 1
+
+    def test_bind(self):
+        func = bind(lambda a, b: a + b, 'a', {'b': 2})
+        assert func(1) == 3
+
+
+class TestParallelDecorator(object):
+
+    def test_spec(self):
+        spec = SampleParallelCommand.double.__command_spec__
+        assert spec.parallel == ('value', 'thread', True)
+        args = {a.dest: a for a in spec.args}
+        assert args['value'].kwargs['nargs'] == '+'
+        assert args['jobs'].name == '--jobs'
+        assert args['value'].kwargs['help'] == 'The values to double'
+        assert spec.to_dict()['parallel'] == ['value', 'thread', True]
+
+    def test_invalid(self):
+        with raises(TypeError):
+            parallel('missing')(lambda self, value: value)
+
+        async def coroutine(self, value):
+            pass
+        with raises(TypeError):
+            parallel('value')(coroutine)
+
+
+class TestRunnerParallel(object):
+
+    def test_execute(self, capsys):
+        runner = Runner(commands=[SampleParallelCommand])
+        results = runner.execute(['test.py', 'parallel', 'double', '1', '2', '3', '--jobs', '2', '--suffix', '!'])
+        assert results == ['2!', '4!', '6!']
+        assert capsys.readouterr().out == '2!\n4!\n6!\n'
+
+    def test_redefined_argument(self, capsys):
+        runner = Runner(commands=[SampleParallelCommand])
+        results = runner.execute(['test.py', 'parallel', 'item', '--value', 'abc', 'de'])
+        assert results == ['item abc', 'item de']
+
+    def test_errors(self, capsys):
+        runner = Runner(commands=[SampleParallelCommand])
+        with raises(SystemExit) as exc:
+            runner.execute(['test.py', 'parallel', 'double', '1', 'error', '3', '--jobs', '4'])
+        assert exc.value.code == 1
+        out, err = capsys.readouterr()
+        assert out == '2\n6\n'
+        assert 'error: Invalid value' in err
+        assert '1 of 3 items failed' in err
+
+    def test_process(self, capsys):
+        runner = Runner(commands=[SampleParallelCommand])
+        results = runner.execute(['test.py', 'parallel', 'pid', '1', '2', '3', '4', '--jobs', '2'])
+        assert len(results) == 4
+
+    def test_process_output(self, capfd):
+        runner = Runner(commands=[SampleParallelCommand])
+        runner.execute(['test.py', 'parallel', 'greet_process', 'a', 'b',
+                        '--jobs', '2'])
+        lines = capfd.readouterr().out.splitlines()
+        assert sorted(lines) == ['Hello a', 'Hello b']
+
+    def test_prefixed_output(self, capsys):
+        runner = Runner(commands=[SampleParallelCommand])
+        runner.color = False
+        runner.execute(['test.py', 'parallel', 'greet', 'a', 'b', 'c', '--jobs', '3'])
+        lines = capsys.readouterr().out.splitlines()
+        assert sorted(lines) == sorted(
+            '[{0}] {1}'.format(item, word) for item in 'abc' for word in ('Hello', 'World'))
+        assert lines.index('[a] Hello') < lines.index('[a] World')
+
+    def test_as_completed(self, capsys):
+        runner = Runner(commands=[SampleParallelCommand])
+        runner.execute(['test.py', 'parallel', 'sleep', '0.2', '0', '--jobs', '2'])
+        assert capsys.readouterr().out == '0\n0.2\n'
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import argparse
+from pytest import mark, raises
+from watson.console import Runner
+from watson.console.decorators import arg
+from watson.console.parsing import UnsupportedArguments, is_simple, parse
+from tests.watson.console.support import SampleArgumentsWithOptionsCommand
+
+
+SPEC = SampleArgumentsWithOptionsCommand.__commands__['execute']
+
+
+def argparse_kwargs(spec, args):
+    parser = argparse.ArgumentParser()
+    for a in spec.args:
+        parser.add_argument(a.name, **a.kwargs)
+    return spec.bind(parser.parse_args(args))
+
+
+class TestParse(object):
+
+    @mark.parametrize('args', [
+        ['one', 'two'],
+        ['one', 'two', '--filename', 'test'],
+        ['--filename', 'test', 'one', 'two'],
+        ['one', '--filename=test', 'two'],
+        ['--filename', 'first', 'one', 'two', '--filename', 'last'],
+        ['one', '--', '-two'],
+    ])
+    def test_matches_argparse(self, args):
+        assert parse(SPEC, args) == argparse_kwargs(SPEC, args)
+
+    @mark.parametrize('args', [
+        ['one'],
+        ['one', 'two', 'three'],
+        ['one', 'two', '-h'],
+        ['one', 'two', '--file', 'test'],
+        ['one', 'two', '--filename'],
+        ['one', 'two', '--filename', '--other'],
+    ])
+    def test_unsupported(self, args):
+        with raises(UnsupportedArguments):
+            parse(SPEC, args)
+
+    def test_not_simple(self):
+        class Command(object):
+            @arg('force', optional=True, action='store_true')
+            def execute(self, force):
+                pass
+        spec = Command.execute.__command_spec__
+        assert is_simple(SPEC)
+        assert not is_simple(spec)
+        with raises(UnsupportedArguments):
+            parse(spec, ['--force'])
+
+
+class TestRunnerFastPath(object):
+
+    def test_execute(self):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleArgumentsWithOptionsCommand'
+        ])
+        runner.fast_path = True
+        runner.attach_command = None
+        assert runner.execute(['test.py', 'runargsoptions', 'execute', 'arg1', 'arg2', '--filename', 'filename.txt'])
+
+    def test_fallback(self):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleOptionsCommand'
+        ])
+        runner.fast_path = True
+        with raises(SystemExit):
+            runner.execute(['test.py', 'runoptions', 'execute', '-d'])
+        assert runner.execute(['test.py', 'runoptions', 'execute', '--file', 'test'])
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import sys
+import time
+from pytest import raises
+from watson.console import ConsoleError, Runner, output, processes
+from watson.console.processes import Pool, run
+from tests.watson.console.support import (SampleProcessesCommand,
+                                          python_script)
+
+
+class Collector(object):
+
+    def __init__(self):
+        self.lines = []
+
+    def __call__(self, result, line, error):
+        self.lines.append((result.name, line, error))
+
+
+class TestPool(object):
+
+    def test_run(self):
+        collect = Collector()
+        results = run({
+            'out': python_script('print("line"); print("next")'),
+            'err': python_script(
+                'import sys; sys.stderr.write("oops"); sys.exit(2)')
+        }, collect)
+        assert [result.returncode for result in results] == [0, 2]
+        assert [result.ok for result in results] == [True, False]
+        assert sorted(collect.lines) == [
+            ('err', 'oops', True), ('out', 'line', False),
+            ('out', 'next', False)]
+
+    def test_default_names(self):
+        results = run(
+            [python_script('pass'), '{0} -c pass'.format(sys.executable)],
+            Collector())
+        assert [result.name.split(':')[0] for result in results] == ['1', '2']
+        assert all(result.ok for result in results)
+
+    def test_concurrency(self):
+        started = time.perf_counter()
+        run([python_script('import time; time.sleep(0.3)')] * 4, Collector(),
+            jobs=4)
+        assert time.perf_counter() - started < 1.2
+
+    def test_bounded(self):
+        pool = Pool(Collector(), jobs=2)
+        running = []
+
+        async def _run(result):
+            running.append(1)
+            assert len(running) <= 2
+            await asyncio.sleep(0.01)
+            running.pop()
+            return result
+        pool._run = _run
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(
+                pool.run([['a'], ['b'], ['c'], ['d'], ['e']]))
+        finally:
+            loop.close()
+        assert [result.args for result in results] == [
+            ['a'], ['b'], ['c'], ['d'], ['e']]
+
+    def test_timeout(self):
+        collect = Collector()
+        result, = run(
+            [python_script('import time; print("start", flush=True); '
+                           'time.sleep(10)')],
+            collect, timeout=0.5)
+        assert result.timed_out
+        assert not result.ok
+        assert result.duration < 5
+        assert 'timed out' in result.summary()
+        assert collect.lines[0][1] == 'start'
+
+    def test_long_lines(self, monkeypatch):
+        monkeypatch.setattr(processes, 'LINE_LIMIT', 100)
+        collect = Collector()
+        result, = run([python_script('print("a" * 253); print("end"); '
+                                     'print("b" * 100, end="")')], collect)
+        assert result.ok
+        lines = [line for _, line, _ in collect.lines]
+        assert all(len(line) <= 100 for line in lines)
+        assert ''.join(lines[:-2]) == 'a' * 253
+        assert lines[-2:] == ['end', 'b' * 100]
+
+    def test_missing_executable(self):
+        collect = Collector()
+        result, = run([['watson-console-missing-executable']], collect)
+        assert result.error
+        assert result.returncode is None
+        assert collect.lines[0][2] is True
+
+
+class TestCommandProcesses(object):
+
+    def test_run_processes(self, capsys):
+        runner = Runner(commands=[SampleProcessesCommand])
+        runner.color = False
+        with raises(SystemExit):
+            runner(['test.py', 'processes', 'build'])
+        out, err = capsys.readouterr()
+        assert out == '[first] one\n[first] two\n'
+        assert '[second] failed' in err
+        assert 'second: exited with 3' in err
+        assert '1 of 2 processes failed' in err
+
+    def test_run_processes_async(self, capsys):
+        runner = Runner(commands=[SampleProcessesCommand])
+        runner.color = False
+        result, = runner(['test.py', 'processes', 'build_async'])
+        assert result.ok
+        out, _ = capsys.readouterr()
+        assert out == '[{0}] one\n'.format(result.name)
+
+    def test_jsonl(self, capsys):
+        runner = Runner(commands=[SampleProcessesCommand])
+        with raises(SystemExit):
+            runner(['test.py', '--output', 'jsonl', 'processes', 'build'])
+        out, err = capsys.readouterr()
+        records = [json.loads(line) for line in out.splitlines()]
+        assert records == [
+            {'message': 'one', 'process': 'first'},
+            {'message': 'two', 'process': 'first'}]
+        errors = [json.loads(line) for line in err.splitlines()]
+        assert {'message': 'failed', 'level': 'error',
+                'process': 'second'} in errors
+        assert errors[-1]['error'] == '1 of 2 processes failed'
+        assert output.current() == output.TEXT
+
+    def test_check(self):
+        with raises(ConsoleError):
+            SampleProcessesCommand()._check_processes(
+                run([python_script('import sys; sys.exit(1)')], Collector()))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import json
+from pytest import raises
+from watson.console import Runner
+from watson.console.profiling import Profiler, NullProfiler, JSON
+from watson.console.styles import colored
+
+
+class TestProfiler(object):
+
+    def test_phase(self):
+        profiler = Profiler()
+        for i in range(2):
+            with profiler.phase('import', 'module'):
+                pass
+        with raises(ValueError):
+            with profiler.phase('command'):
+                raise ValueError()
+        calls, seconds = profiler.phases[('import', 'module')]
+        assert calls == 2
+        assert seconds >= 0
+        assert profiler.phases[('command', None)][0] == 1
+        assert profiler.results()[-1]['phase'] == 'total'
+
+    def test_report_table(self):
+        profiler = Profiler()
+        with profiler.phase('parse'):
+            pass
+        with colored(False):
+            lines = profiler.report()
+        assert lines[0].startswith('Phase')
+        assert lines[1].startswith('parse')
+        assert lines[-1].startswith('total')
+
+    def test_report_json(self):
+        profiler = Profiler()
+        with profiler.phase('parse'):
+            pass
+        results = json.loads(profiler.report(JSON)[0])
+        assert [r['phase'] for r in results] == ['parse', 'total']
+
+    def test_null(self):
+        profiler = NullProfiler()
+        with profiler.phase('parse'):
+            pass
+        assert not profiler.enabled
+
+
+class TestRunnerProfile(object):
+
+    def test_profile_startup(self, capsys):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleOptionsCommand'
+        ])
+        assert runner.execute(['test.py', '--profile-startup=json', 'runoptions', 'execute', '--filename', 'test'])
+        results = json.loads(capsys.readouterr().err)
+        phases = [(r['phase'], r['detail']) for r in results]
+        assert ('import', 'tests.watson.console.support') in phases
+        assert ('attach_command', None) in phases
+        assert ('update_usage', None) in phases
+        assert ('parse', None) in phases
+        assert ('command', 'execute') in phases
+        assert not runner.profiler.enabled
+
+    def test_profile_startup_help(self, capsys):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleOptionsCommand'
+        ])
+        with raises(SystemExit):
+            runner.execute(['test.py', '--profile-startup'])
+        err = capsys.readouterr().err
+        assert 'attach_commands' in err
+        assert 'total' in err
+        assert '\x1b' not in err
+
+    def test_profile_startup_color(self, capsys):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleOptionsCommand'
+        ])
+        runner.color = True
+        runner.execute(['test.py', '--profile-startup', 'runoptions', 'execute'])
+        assert '\x1b[1mPhase' in capsys.readouterr().err
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from watson.console import Runner
+from watson.console.registry import Registry
+from tests.watson.console.support import (SampleNonStringCommand,
+                                          SampleOptionsCommand)
+
+
+class TestRegistry(object):
+
+    def test_add_class(self):
+        registry = Registry()
+        registry.add(SampleOptionsCommand)
+        registry.add(SampleNonStringCommand)
+        assert registry.names == ['nonstring', 'runoptions']
+        assert registry.get('runoptions') is SampleOptionsCommand
+        assert registry.resolutions == 0
+        assert registry.imports == 0
+
+    def test_lazy_resolution(self):
+        registry = Registry()
+        registry.add('tests.watson.console.support.SampleStringCommand')
+        assert registry.resolutions == 0
+        assert 'string' in registry
+        assert registry.resolutions == 1
+        assert registry.imports == 1
+        assert registry.get('string')
+        assert registry.imports == 1
+
+    def test_incremental_index(self):
+        registry = Registry()
+        registry.add(SampleOptionsCommand)
+        assert registry.names == ['runoptions']
+        registry.add('tests.watson.console.support.SampleArgumentsCommand')
+        registry.add(SampleNonStringCommand)
+        assert registry.names == ['nonstring', 'runargs', 'runoptions']
+        assert len(registry) == 3
+        assert list(registry) == registry.names
+
+    def test_commands_memoized(self):
+        registry = Registry()
+        registry.add(SampleOptionsCommand)
+        commands = registry.commands
+        assert registry.commands is commands
+        registry.add(SampleNonStringCommand)
+        assert registry.commands is not commands
+        assert list(registry.commands) == ['nonstring', 'runoptions']
+
+    def test_get_missing(self):
+        registry = Registry()
+        assert not registry.get('missing')
+        assert not registry.describe('missing')
+
+    def test_describe(self):
+        registry = Registry()
+        registry.add(SampleOptionsCommand)
+        description = registry.describe('runoptions')
+        assert description['name'] == 'runoptions'
+        assert registry.describe('runoptions') is description
+
+    def test_runner_help_resolves_once(self):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleStringCommand',
+            'tests.watson.console.support.SampleOptionsCommand',
+            SampleNonStringCommand
+        ])
+        assert runner.get_command('runoptions')
+        assert runner.get_command('string')
+        assert len(runner.commands) == 3
+        assert runner.registry.resolutions == 2
+        assert runner.registry.imports == 2
@@ -1,7 +1,24 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import io
+import json
+import sys
 from pytest import raises
 from watson.console import Runner, ConsoleError
-from tests.watson.console.support import SampleNonStringCommand
+from watson.console.runner import POST_EXECUTE
+from tests.watson.console.support import (SampleAsyncCommand,
+                                          SampleNonStringCommand,
+                                          SampleStatefulCommand,
+                                          SampleStreamCommand)
+
+
+def _run(coroutine):
+    # asyncio.run is not available before Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
 
 
 class TestConsoleError(object):
@@ -59,6 +76,20 @@ class TestRunner:
         with raises(SystemExit):
             runner.execute(['test.py', 'runargs', 'execute', '-h'])  # will print to screen in tests
 
+    def test_cached_parser_usage_color(self, capsys):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleOptionsCommand'
+        ])
+        args = ['test.py', 'runoptions', 'execute', '--bad']
+        runner.color = True
+        with raises(SystemExit):
+            runner.execute(list(args))
+        assert '\x1b[95m' in capsys.readouterr().err
+        runner.color = False
+        with raises(SystemExit):
+            runner.execute(list(args))
+        assert '\x1b' not in capsys.readouterr().err
+
     def test_execute_command_usage_with_options(self):
         runner = Runner(commands=[
             'tests.watson.console.support.SampleOptionsCommand'
@@ -100,6 +131,46 @@ class TestRunner:
         output = runner.execute(['test.py', 'runargs', 'execute', 'test', 'test2'])  # will print to screen in tests
         assert output
 
+    def test_execute_targeted(self):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleArgumentsCommand',
+            'tests.watson.console.support.SampleOptionsCommand'
+        ])
+        attached = []
+        add_method_parser = runner._add_method_parser
+
+        def _add_method_parser(*args):
+            attached.append((args[2], args[3].name))
+            return add_method_parser(*args)
+        runner._add_method_parser = _add_method_parser
+        assert runner.execute(['test.py', 'runargs', 'execute', 'test', 'test2'])
+        assert attached == [('runargs', 'execute')]
+
+    def test_execute_targeted_invalid_method(self):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleArgumentsCommand'
+        ])
+        with raises(SystemExit):
+            runner.execute(['test.py', 'runargs', 'invalid'])
+
+    def test_execute_untargeted(self):
+        runner = Runner(commands=[
+            'tests.watson.console.support.SampleOptionsCommand'
+        ])
+        runner.targeted = False
+        output = runner.execute(['test.py', 'runoptions', 'execute', '--filename', 'test'])
+        assert output
+
+    def test_execute_usage_color(self, capsys):
+        runner = Runner(commands=[SampleNonStringCommand])
+        with raises(SystemExit):
+            runner.execute(['test.py'])
+        assert '\033[' not in capsys.readouterr().out
+        runner.color = True
+        with raises(SystemExit):
+            runner.execute(['test.py'])
+        assert '\033[91m\033[1mnonstring' in capsys.readouterr().out
+
     def test_execute_command_with_args_options(self):
         runner = Runner(commands=[
             'tests.watson.console.support.SampleArgumentsCommand',
@@ -107,3 +178,169 @@ class TestRunner:
         ])
         output = runner.execute(['test.py', 'runargsoptions', 'execute', 'arg1', 'arg2', '--filename', 'filename.txt'])  # will print to screen in tests
         assert output
+
+
+class TestRunnerAsync(object):
+
+    def test_coroutine_spec(self):
+        assert SampleAsyncCommand.__commands__['execute'].coroutine
+        assert asyncio.iscoroutinefunction(SampleAsyncCommand.execute)
+
+    def test_execute(self):
+        runner = Runner(commands=[SampleAsyncCommand])
+        loop = runner.execute(['test.py', 'async', 'execute'])
+        assert loop is runner.loop
+        assert runner.execute(['test.py', 'async', 'execute']) is loop
+        runner.close()
+        assert loop.is_closed()
+        assert runner.loop is not loop
+        runner.close()
+
+    def test_execute_error(self):
+        runner = Runner(commands=[SampleAsyncCommand])
+        with raises(SystemExit):
+            runner.execute(['test.py', 'async', 'execute', '--value', 'error'])
+        runner.close()
+
+    def test_execute_async(self):
+        runner = Runner(commands=[SampleAsyncCommand, SampleNonStringCommand])
+
+        async def main():
+            assert await runner.execute_async(['test.py', 'nonstring', 'execute'])
+            return await runner.execute_async(['test.py', 'async', 'execute'])
+        loop = asyncio.new_event_loop()
+        assert loop.run_until_complete(main()) is loop
+        loop.close()
+
+    def test_execute_async_error(self):
+        runner = Runner(commands=[SampleAsyncCommand])
+        with raises(SystemExit):
+            _run(runner.execute_async(
+                ['test.py', 'async', 'execute', '--value', 'error']))
+
+    def test_execute_async_options(self, capsys):
+        runner = Runner(commands=[SampleAsyncCommand])
+
+        async def main():
+            await runner.execute_async(
+                ['test.py', '--output', 'jsonl', 'async', 'execute',
+                 '--value', 'error'])
+        with raises(SystemExit):
+            _run(main())
+        _, err = capsys.readouterr()
+        assert json.loads(err) == {
+            'error': 'Something went wrong', 'type': 'ConsoleError'}
+        _run(runner.execute_async(
+            ['test.py', '--profile-startup', 'async', 'execute']))
+        _, err = capsys.readouterr()
+        assert 'command' in err
+
+    def test_execute_async_blocking_options(self, capsys):
+        runner = Runner(commands=[SampleAsyncCommand])
+        with raises(SystemExit):
+            _run(runner.execute_async(['test.py', '--batch', 'file']))
+        _, err = capsys.readouterr()
+        assert '--batch cannot be used within an event loop' in err
+
+
+class TestRunnerBatch(object):
+
+    def runner(self):
+        return Runner(commands=[
+            'tests.watson.console.support.SampleStringCommand',
+            'tests.watson.console.support.SampleOptionsCommand',
+            SampleNonStringCommand
+        ])
+
+    def test_batch(self, capsys):
+        runner = self.runner()
+        statuses = runner.batch([
+            'nonstring execute',
+            '',
+            '# comment',
+            'string execute',
+            'runoptions execute --filename "a file"',
+            'runoptions execute -h',
+            'runoptions execute --invalid',
+            'runoptions execute "unbalanced'
+        ])
+        assert statuses == [0, 1, 0, 0, 2, 2]
+        err = capsys.readouterr().err
+        assert '1\t0\tnonstring execute\n' in err
+        assert '4\t1\tstring execute\n' in err
+
+    def test_batch_reuses_parsers(self):
+        runner = self.runner()
+        runner.batch(['runoptions execute', 'runoptions execute --filename test'])
+        parser = runner._parsers[('runoptions', 'execute')]
+        runner.batch(['runoptions execute'])
+        assert runner._parsers[('runoptions', 'execute')] is parser
+        runner.add_command(SampleAsyncCommand)
+        assert not runner._parsers
+
+    def test_batch_new_instances(self):
+        runner = Runner(commands=[SampleStatefulCommand])
+        results = []
+        runner.add_hook(POST_EXECUTE,
+                        lambda invocation: results.append(invocation.result))
+        runner.batch(['stateful remember a', 'stateful remember b'])
+        assert results == ['a', 'b']
+
+    def test_batch_exception(self, capsys):
+        runner = self.runner()
+        runner.get_command = None
+        assert runner.batch(['runoptions execute']) == [1]
+        assert 'Traceback' in capsys.readouterr().err
+
+    def test_execute_batch_file(self, tmp_path):
+        path = tmp_path / 'commands.txt'
+        path.write_text('nonstring execute\nrunoptions execute\n')
+        runner = self.runner()
+        assert runner.execute(['test.py', '--batch', str(path)]) == [0, 0]
+        assert runner.execute(['test.py', '--batch={}'.format(path)]) == [0, 0]
+
+    def test_execute_batch_stdin(self, monkeypatch):
+        monkeypatch.setattr(sys, 'stdin', io.StringIO('string execute\n'))
+        runner = self.runner()
+        with raises(SystemExit):
+            runner.execute(['test.py', '--batch'])
+
+
+class BrokenStream(io.StringIO):
+
+    def write(self, s):
+        raise BrokenPipeError()
+
+
+class TestRunnerStream(object):
+
+    def test_stream(self, capsys):
+        runner = Runner(commands=[SampleStreamCommand])
+        assert runner.execute(['test.py', 'stream', 'execute']) is None
+        assert capsys.readouterr().out == 'line 0\nline 1\nline 2\n'
+
+    def test_stream_async(self, capsys):
+        runner = Runner(commands=[SampleStreamCommand])
+        runner.execute(['test.py', 'stream', 'execute_async'])
+        assert capsys.readouterr().out == '0\n1\n2\n'
+
+        async def main():
+            await runner.execute_async(['test.py', 'stream', 'execute_async'])
+        _run(main())
+        assert capsys.readouterr().out == '0\n1\n2\n'
+        runner.close()
+
+    def test_stream_error(self, capsys):
+        runner = Runner(commands=[SampleStreamCommand])
+        with raises(SystemExit):
+            runner.execute(['test.py', 'stream', 'error'])
+        out, err = capsys.readouterr()
+        assert out == 'before\n'
+        assert 'Error: failed' in err
+
+    def test_broken_pipe(self, monkeypatch):
+        monkeypatch.setattr(sys, 'stdout', BrokenStream())
+        SampleStreamCommand.closed = False
+        runner = Runner(commands=[SampleStreamCommand])
+        runner.execute(['test.py', 'stream', 'execute', '--count', '1000000'])
+        assert SampleStreamCommand.closed
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import argparse
+from pytest import raises
+from watson.console import spec as spec_module
+from watson.console.decorators import arg
+from watson.console.spec import ArgSpec, CommandSpec, parse_docstring
+from tests.watson.console.support import (SampleArgumentsWithOptionsCommand,
+                                          SampleOptionsCommand)
+
+
+class TestParseDocstring(object):
+
+    def test_parse(self):
+        help, description, arg_help = parse_docstring('''Help.
+
+        Description.
+
+        Args:
+            name: The name
+        ''')
+        assert help == 'Help.'
+        assert description == 'Help.\n\nDescription.\n'
+        assert arg_help == {'name': 'The name'}
+
+    def test_missing_doc(self):
+        assert parse_docstring(None) == ('Missing doc.', 'Missing doc.', {})
+
+    def test_override_help(self):
+        assert parse_docstring('Help.', help='Override')[0] == 'Override'
+
+
+class TestArgSpec(object):
+
+    def test_optional(self):
+        assert ArgSpec('--name').optional
+        assert ArgSpec('--name').dest == 'name'
+        assert not ArgSpec('name').optional
+
+    def test_immutable(self):
+        spec = ArgSpec('name', kwargs={'help': 'test'})
+        with raises(AttributeError):
+            spec.name = 'other'
+        spec.kwargs['help'] = 'other'
+        assert spec.kwargs == {'help': 'test'}
+
+    def test_serialize(self):
+        spec = ArgSpec('--count', 'count', {'type': int, 'help': 'test'})
+        data = spec.to_dict()
+        assert data == {'name': '--count', 'dest': 'count', 'kwargs': {'help': 'test'}}
+        assert ArgSpec.from_dict(data) == ArgSpec('--count', 'count', {'help': 'test'})
+
+
+class TestCommandSpec(object):
+
+    def test_registered_on_class(self):
+        specs = SampleArgumentsWithOptionsCommand.__commands__
+        assert list(specs) == ['execute']
+        spec = specs['execute']
+        assert [a.name for a in spec.args] == ['argument1', 'argument2', '--filename']
+        assert spec.mapping == {
+            'argument1': 'argument1',
+            'argument2': 'argument2',
+            '--filename': 'filename'}
+
+    def test_replace_arg(self):
+        class Command(object):
+            @arg('name', help='Replaced')
+            def execute(self, name):
+                pass
+        spec = Command.execute.__command_spec__
+        assert spec.args == (ArgSpec('name', 'name', {'help': 'Replaced'}),)
+
+    def test_bind(self):
+        spec = SampleOptionsCommand.__commands__['execute']
+        parsed_args = argparse.Namespace(filename='test')
+        assert spec.bind(parsed_args) == {'filename': 'test'}
+
+    def test_serialize(self):
+        spec = SampleArgumentsWithOptionsCommand.__commands__['execute']
+        copy = CommandSpec.from_dict(spec.to_dict())
+        assert copy == spec
+        assert hash(copy) == hash(spec)
+        assert copy is not spec
+
+    def test_immutable(self):
+        spec = SampleOptionsCommand.__commands__['execute']
+        with raises(AttributeError):
+            spec.help = 'test'
+        assert spec.with_arg(ArgSpec('other')) != spec
+
+
+class TestDocstring(object):
+
+    def test_parsed_lazily_once(self, monkeypatch):
+        calls = []
+        parse = spec_module.parse_docstring
+
+        def counted(*args):
+            calls.append(args)
+            return parse(*args)
+        monkeypatch.setattr(spec_module, 'parse_docstring', counted)
+
+        class Command(object):
+            @arg('force', optional=True, action='store_true')
+            @arg('name')
+            def execute(self, name, force):
+                """Executes the command.
+
+                Args:
+                    name: The name
+                    force: Whether to force it
+                """
+        spec = Command.execute.__command_spec__
+        assert not calls
+        assert all(a.docstring is spec.docstring for a in spec.args)
+        assert spec.help == 'Executes the command.'
+        assert [a.kwargs['help'] for a in spec.args] == ['The name', 'Whether to force it']
+        assert spec.arg_help == {'name': 'The name', 'force': 'Whether to force it'}
+        assert len(calls) == 1
+
+    def test_help_override(self):
+        class Command(object):
+            @arg('name', help='The name')
+            def execute(self, name):
+                """Executes the command.
+                """
+        spec = Command.execute.__command_spec__
+        assert spec.help == 'The name'
+        assert spec.description == 'Executes the command.\n'
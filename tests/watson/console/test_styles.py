@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
-from watson.console.styles import underline, bold
+import io
+from watson.console.styles import (underline, bold, format_style, colored,
+                                   detect, enabled, set_enabled, Style,
+                                   Template, BOLD)
 
 
 class TestStyles(object):
@@ -11,3 +14,59 @@ class TestStyles(object):
     def test_bold(self):
         assert bold('test') == '\033[1mtest\033[0m'
         assert bold('test', terminate=False) == '\033[1mtest'
+
+    def test_disabled(self):
+        with colored(False):
+            assert bold('test') == 'test'
+            assert underline(1) == '1'
+            assert format_style('test', 'hello ', ' world') == 'test'
+        assert bold('test') == '\033[1mtest\033[0m'
+
+
+class TestStyle(object):
+
+    def test_call(self):
+        style = Style('\033[1m')
+        assert style('test') == '\033[1mtest\033[0m'
+        assert style('test', terminate=False) == '\033[1mtest'
+        assert style(1) == '\033[1m1\033[0m'
+
+    def test_combine(self):
+        style = Style('\033[91m') + BOLD
+        assert style('test') == '\033[91m\033[1mtest\033[0m'
+        assert style == Style('\033[91m', '\033[1m')
+
+    def test_many(self):
+        assert BOLD.many(['a', 'b']) == ['\033[1ma\033[0m', '\033[1mb\033[0m']
+        assert BOLD.many(['a'], terminate=False) == ['\033[1ma']
+        with colored(False):
+            assert BOLD.many(['a', 1]) == ['a', '1']
+
+
+class TestTemplate(object):
+
+    def test_render(self):
+        template = Template('{name}\t{help}', name=BOLD)
+        assert template.render(name='test', help='{help}') == '\033[1mtest\033[0m\t{help}'
+        with colored(False):
+            assert template.render(name='test', help='help') == 'test\thelp'
+
+
+class TestDetect(object):
+
+    def test_detect(self, monkeypatch):
+        monkeypatch.delenv('NO_COLOR', raising=False)
+        assert not detect(io.StringIO())
+
+        class Terminal(io.StringIO):
+            def isatty(self):
+                return True
+        assert detect(Terminal())
+        monkeypatch.setenv('NO_COLOR', '1')
+        assert not detect(Terminal())
+
+    def test_set_enabled(self):
+        set_enabled(False)
+        assert not enabled()
+        set_enabled(True)
+        assert enabled()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from watson.console import colors, styles
+from watson.console.table import (Column, Table, display_width, pad,
+                                  strip_ansi, RIGHT)
+from watson.console.writer import Writer, FLUSH_EXIT
+
+
+class TestDisplayWidth(object):
+
+    def test_ansi(self):
+        assert strip_ansi(colors.fail(styles.bold('test'))) == 'test'
+        assert display_width(colors.fail(styles.bold('test'))) == 4
+
+    def test_wide(self):
+        assert display_width('日本') == 4
+        assert display_width('é') == 1
+
+    def test_pad(self):
+        assert pad(styles.bold('ab'), 4) == styles.bold('ab') + '  '
+        assert pad('ab', 4, align=RIGHT) == '  ab'
+
+
+class TestTable(object):
+
+    def test_render(self):
+        table = Table([Column('Name'), Column('Count', align=RIGHT)])
+        with styles.colored(False):
+            lines = list(table.render([('first', 1), ('second', 100)]))
+        assert lines == [
+            'Name    Count',
+            'first       1',
+            'second    100'
+        ]
+
+    def test_styled_cells(self):
+        table = Table([Column(style=colors.fail), Column()], separator='|')
+        lines = list(table.render([(styles.bold('a'), 'b'), ('ccc', 'd')]))
+        assert strip_ansi(lines[0]) == 'a  |b'
+        assert strip_ansi(lines[1]) == 'ccc|d'
+
+    def test_sample(self):
+        table = Table(['a', 'b'], sample=1, header_style=lambda s: s)
+        lines = list(table.render([('x', 'y'), ('longer', 'z')]))
+        assert lines == ['a  b', 'x  y', 'longer  z']
+
+    def test_max_width(self):
+        table = Table([Column(max_width=4), Column()])
+        lines = list(table.render([('abcdefgh', 'y'), ('ab', 'z')]))
+        assert lines == ['abc…  y', 'ab    z']
+
+    def test_streaming(self):
+        consumed = []
+
+        def rows():
+            for i in range(10000):
+                consumed.append(i)
+                yield (i, 'row')
+        table = Table([Column(), Column()], sample=10)
+        lines = table.render(rows())
+        assert next(lines) == '0  row'
+        assert len(consumed) == 10
+
+    def test_write(self, capsys):
+        out = Writer('stdout', policy=FLUSH_EXIT)
+        Table([Column(), Column()]).write([('a', 'b')], out)
+        out.flush()
+        assert capsys.readouterr().out == 'a  b\n'
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+from pytest import raises
+from watson.console import Runner, watch
+from watson.console.watch import Watcher, changes, snapshot
+from tests.watson.console.support import SampleWatchedCommand
+
+
+def _touch(path, content, delay=0):
+    time.sleep(delay)
+    path.write_text(content)
+    # ensure the modification is detected on filesystems with coarse mtimes
+    stat = os.stat(str(path))
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestSnapshot(object):
+
+    def test_walks_directories(self, tmp_path):
+        (tmp_path / 'module.py').write_text('a')
+        for directory in ('package', '.git', '__pycache__'):
+            (tmp_path / directory).mkdir()
+            (tmp_path / directory / 'file.py').write_text('a')
+        index = snapshot([str(tmp_path), str(tmp_path / 'missing')])
+        assert sorted(index) == [
+            str(tmp_path / 'module.py'),
+            str(tmp_path / 'package' / 'file.py')]
+
+    def test_changes(self):
+        previous = {'a': (1, 1), 'b': (1, 1), 'c': (1, 1)}
+        current = {'a': (1, 1), 'b': (2, 1), 'd': (1, 1)}
+        assert changes(previous, current) == {'b', 'c', 'd'}
+
+
+class TestWatcher(object):
+
+    def test_wait(self, tmp_path):
+        path = tmp_path / 'file.txt'
+        path.write_text('a')
+        watcher = Watcher([str(tmp_path)], interval=0.01, debounce=0.05)
+        index = watcher.snapshot()
+        thread = threading.Thread(target=_touch, args=(path, 'b', 0.05))
+        thread.start()
+        changed, latest = watcher.wait(index)
+        thread.join()
+        assert changed == {str(path)}
+        assert latest == watcher.snapshot()
+
+    def test_reports_earlier_changes(self, tmp_path):
+        path = tmp_path / 'file.txt'
+        path.write_text('a')
+        watcher = Watcher([str(tmp_path)], interval=0.01, debounce=0.01)
+        index = watcher.snapshot()
+        _touch(path, 'b')
+        changed, _ = watcher.wait(index)
+        assert changed == {str(path)}
+
+
+class TestRunnerWatch(object):
+
+    def setup_method(self):
+        SampleWatchedCommand.runs = []
+
+    def test_watch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(watch.Watcher, 'interval', 0.01)
+        monkeypatch.setattr(watch.Watcher, 'debounce', 0.05)
+        path = tmp_path / 'file.txt'
+        path.write_text('first')
+        runner = Runner(commands=[SampleWatchedCommand])
+        thread = threading.Thread(target=_touch, args=(path, 'second', 0.1))
+        thread.start()
+        statuses = runner.watch(
+            ['test.py', 'watched', 'read', str(path)], [str(tmp_path)], runs=2)
+        thread.join()
+        assert statuses == [0, 0]
+        assert SampleWatchedCommand.runs == ['first', 'second']
+
+    def test_interrupted(self, tmp_path, monkeypatch):
+        def interrupt(self, since=None):
+            raise KeyboardInterrupt
+        monkeypatch.setattr(watch.Watcher, 'wait', interrupt)
+        path = tmp_path / 'file.txt'
+        path.write_text('first')
+        runner = Runner(commands=[SampleWatchedCommand])
+        runner.execute(['test.py', '--watch', str(tmp_path),
+                        'watched', 'read', str(path)])
+        assert SampleWatchedCommand.runs == ['first']
+
+    def test_no_paths(self, capsys):
+        runner = Runner(commands=[SampleWatchedCommand])
+        with raises(SystemExit):
+            runner.execute(['test.py', '--watch'])
+        _, err = capsys.readouterr()
+        assert 'No paths specified to watch' in err
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import subprocess
+import sys
+import threading
+from pytest import raises
+from watson.console import Runner, colors, writer
+from watson.console.styles import colored
+from watson.console.writer import (Writer, Multiplexer, FLUSH_EXIT, FLUSH_LINE,
+                                   FLUSH_SIZE)
+from tests.watson.console.support import SampleWriteCommand
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+
+class Stream(io.StringIO):
+    writes = 0
+    flushes = 0
+    tty = False
+
+    def write(self, s):
+        self.writes += 1
+        return super(Stream, self).write(s)
+
+    def flush(self):
+        self.flushes += 1
+
+    def isatty(self):
+        return self.tty
+
+
+class TestWriter(object):
+
+    def test_line_policy(self):
+        stream = Stream()
+        out = Writer(stream, policy=FLUSH_LINE)
+        out.write('one')
+        out.write()
+        assert stream.getvalue() == 'one\n\n'
+        assert stream.writes == 2
+        assert stream.flushes == 2
+
+    def test_size_policy(self):
+        stream = Stream()
+        out = Writer(stream, policy=FLUSH_SIZE, size=10)
+        out.write('one')
+        assert stream.getvalue() == 'one\n'
+        assert stream.flushes == 0
+        out.write('two three')
+        assert stream.getvalue() == 'one\ntwo three\n'
+        assert stream.flushes == 1
+
+    def test_exit_policy(self):
+        stream = Stream()
+        out = Writer(stream, policy=FLUSH_EXIT, size=1)
+        out.writelines(str(i) for i in range(100))
+        assert stream.flushes == 0
+        writer.flush()
+        assert stream.getvalue() == ''.join('{}\n'.format(i) for i in range(100))
+        assert stream.flushes == 1
+
+    def test_writelines_bounded(self):
+        stream = Stream()
+        out = Writer(stream, policy=FLUSH_SIZE, size=100)
+        out.writelines('line {}'.format(i) for i in range(1000))
+        assert 70 <= stream.writes <= 100
+        out.flush()
+        assert stream.getvalue().count('\n') == 1000
+
+    def test_default_policy(self):
+        stream = Stream()
+        out = Writer(stream)
+        out.write('buffered')
+        assert stream.flushes == 0
+        tty = Stream()
+        tty.tty = True
+        out = Writer(tty)
+        out.write('line')
+        assert tty.flushes == 1
+
+    def test_concurrent_writes(self):
+        stream = Stream()
+        out = Writer(stream, policy=FLUSH_SIZE, size=64)
+
+        def work():
+            for _ in range(5000):
+                out.write('x')
+            out.writelines('y' for _ in range(100))
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        # switch threads as often as possible to expose any races
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        out.flush()
+        lines = stream.getvalue().splitlines()
+        assert lines.count('x') == 40000
+        assert lines.count('y') == 800
+        assert len(lines) == 40800
+
+    def test_ordered_with_print(self, monkeypatch):
+        stream = Stream()
+        monkeypatch.setattr(sys, 'stdout', stream)
+        out = Writer('stdout', policy=FLUSH_EXIT)
+        print('a')
+        out.write('b')
+        print('c')
+        assert stream.getvalue() == 'a\nb\nc\n'
+
+    def test_named_stream(self, capsys):
+        out = Writer('stdout')
+        out.write('test')
+        out.flush()
+        assert capsys.readouterr().out == 'test\n'
+
+
+class TestCommandWrite(object):
+
+    def test_flushed_on_error(self, capsys):
+        runner = Runner(commands=[SampleWriteCommand])
+        with raises(SystemExit):
+            runner.execute(['test.py', 'write', 'execute'])
+        out, err = capsys.readouterr()
+        assert out == 'first\nsecond\nthird\n'
+        assert 'warning\n' in err
+        assert 'Error: failed' in err
+
+    def test_mixed_with_print(self):
+        # stdout is a pipe, so it is block buffered rather than line buffered
+        code = ('from watson.console import Runner\n'
+                'from tests.watson.console.support import SampleWriteCommand\n'
+                'Runner(commands=[SampleWriteCommand]).execute('
+                '["test.py", "write", "mixed"])')
+        out = subprocess.check_output(
+            [sys.executable, '-c', code], cwd=ROOT, universal_newlines=True)
+        assert out == 'a\nb\nc\n'
+
+
+class TestMultiplexer(object):
+
+    def _multiplexer(self):
+        out = Writer(Stream(), policy=FLUSH_EXIT)
+        err = Writer(Stream(), policy=FLUSH_EXIT)
+        return Multiplexer(out, err, styles=[None]), out, err
+
+    def test_partial_lines(self):
+        multiplexer, out, err = self._multiplexer()
+        with multiplexer:
+            task = multiplexer.task('[a] ')
+            task.stdout.write('par')
+            task.stdout.write('tial\nnext')
+            task.stderr.write('error\n')
+            task.flush()
+        assert out.stream.getvalue() == '[a] partial\n[a] next\n'
+        assert err.stream.getvalue() == '[a] error\n'
+
+    def test_threads_do_not_interleave(self):
+        multiplexer, out, _ = self._multiplexer()
+        command_ = SampleWriteCommand()
+
+        def work(index):
+            with multiplexer.task('[{0}] '.format(index)):
+                for line in range(50):
+                    command_.write('{0}-{1}'.format(index, line))
+
+        with multiplexer:
+            threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        lines = out.stream.getvalue().splitlines()
+        assert len(lines) == 400
+        for line in lines:
+            prefix, value = line.split(' ')
+            assert prefix == '[{0}]'.format(value.split('-')[0])
+
+    def test_routing(self, capsys):
+        multiplexer, out, err = self._multiplexer()
+        command_ = SampleWriteCommand()
+        with multiplexer:
+            with multiplexer.task('[a] ') as task:
+                assert writer.current() is task
+                command_.writelines(['one', 'two'])
+                command_.write('failed', error=True)
+            assert writer.current() is None
+            command_.write('unrouted')
+        writer.stdout.flush()
+        assert out.stream.getvalue() == '[a] one\n[a] two\n'
+        assert err.stream.getvalue() == '[a] failed\n'
+        assert capsys.readouterr().out == 'unrouted\n'
+
+    def test_styled_prefix(self):
+        multiplexer = Multiplexer(styles=[colors.OK_GREEN_STYLE])
+        with colored(True):
+            task = multiplexer.task('[a] ')
+        assert task.prefix == colors.ok_green('[a] ')
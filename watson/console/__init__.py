@@ -1,10 +1,37 @@
 # -*- coding: utf-8 -*-
-__version__ = '2.0.4'
+import sys
 
-try:
-    # Fix for setup.py version import
-    from watson.console.runner import Runner, ConsoleError
+__version__ = '2.1.0'
+__all__ = ['Runner', 'ConsoleError']
 
-    __all__ = ['Runner', 'ConsoleError']
-except:  # noqa, pragma: no cover
-    pass  # pragma: no cover
+# The modules that the public names are imported from the first time they are
+# accessed, so that importing watson.console (or one of its lighter modules
+# such as command or decorators) doesn't import the runner.
+_lazy = {
+    'Runner': 'watson.console.runner',
+    'ConsoleError': 'watson.console.exceptions'
+}
+
+
+def __getattr__(name):
+    module = _lazy.get(name)
+    if not module:
+        raise AttributeError(
+            'module {0!r} has no attribute {1!r}'.format(__name__, name))
+    from importlib import import_module
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module level __getattr__ requires Python 3.7
+    try:
+        from watson.console.runner import Runner, ConsoleError  # noqa
+    except ImportError:
+        # Fix for setup.py version import
+        pass
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import pickle
+import time
+from watson.console import inputs, writer
+from watson.console.spec import CACHE_MAX_SIZE as MAX_SIZE, CACHE_TTL as TTL
+
+
+EXTENSION = '.cache'
+
+
+class Recorder(object):
+    """Records the lines written by a command while writing them through.
+
+    The recorder acts as the multiplexer of a task, so anything written via
+    command.Base.write (or emit) while the task is active is recorded.
+
+    Example:
+
+    .. code-block:: python
+
+        recorder = Recorder()
+        with recorder.task():
+            command.write('Fetching')
+        recorder.lines  # [(False, ['Fetching'])]
+    """
+
+    def __init__(self):
+        self.lines = []
+
+    def task(self):
+        return writer.Task(self, '', name='')
+
+    def put(self, error, lines):
+        lines = list(lines)
+        self.lines.append((error, lines))
+        (writer.stderr if error else writer.stdout).writelines(lines)
+
+    def write(self, message='', error=False):
+        self.put(error, [message])
+
+
+def replay(lines):
+    """Writes the lines recorded by a Recorder.
+    """
+    for error, batch in lines:
+        (writer.stderr if error else writer.stdout).writelines(batch)
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _keyed(value):
+    if isinstance(value, inputs.Input):
+        fingerprint = value.fingerprint()
+        if fingerprint is None:
+            raise _Uncacheable(value)
+        return (value.__class__.__name__,) + fingerprint
+    if isinstance(value, (list, tuple)):
+        return [_keyed(item) for item in value]
+    return value
+
+
+class Cache(object):
+    """A disk cache of the results of commands.
+
+    Each entry is pickled to its own file within the directory. Entries
+    expire once they are older than the ttl, and the least recently used
+    entries are evicted once the total size of the directory exceeds the
+    max size.
+
+    Example:
+
+    .. code-block:: python
+
+        cache = Cache('/tmp/results', ttl=60)
+        key = cache.key('namespace', 'method', {'id': 1})
+        entry = cache.get(key)
+        if entry is None:
+            cache.set(key, lookup(1), [])
+
+    Args:
+        directory (string): The directory to store the entries in
+        ttl (int): The number of seconds that an entry is valid for
+        max_size (int): The maximum number of bytes to store
+    """
+    directory = None
+    ttl = TTL
+    max_size = MAX_SIZE
+
+    def __init__(self, directory, ttl=None, max_size=None):
+        self.directory = directory
+        if ttl is not None:
+            self.ttl = ttl
+        if max_size is not None:
+            self.max_size = max_size
+
+    def key(self, namespace, method, kwargs, format=None, color=False):
+        """Generates the key of an entry from the parsed arguments.
+
+        Inputs (see watson.console.inputs) are keyed on the path,
+        modification time and size of the file, so the entry is invalidated
+        when the file changes.
+
+        Args:
+            namespace (string): The namespace of the command
+            method (string): The name of the method
+            kwargs (dict): The arguments the method is called with
+            format (string): The output format the command is written in
+            color (boolean): Whether styling is enabled, as the recorded
+                output includes any escape codes
+
+        Returns:
+            The key, or None if the arguments cannot be cached (such as when
+            reading from stdin).
+        """
+        try:
+            values = [(name, _keyed(value))
+                      for name, value in sorted(kwargs.items())]
+        except (_Uncacheable, OSError):
+            return None
+        parts = repr((namespace, method, values, format, color))
+        return hashlib.sha256(parts.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + EXTENSION)
+
+    def get(self, key):
+        """Retrieves an entry if it exists and has not expired.
+
+        Returns:
+            A tuple of (result, lines) or None.
+        """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                created, result, lines = pickle.load(file)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError,
+                AttributeError, ImportError):
+            return None
+        if time.time() - created > self.ttl:
+            self._remove(path)
+            return None
+        # the modification time is used to determine the least recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result, lines
+
+    def set(self, key, result, lines):
+        """Stores an entry, evicting any others if required.
+
+        Results that cannot be pickled are not cached.
+
+        Args:
+            key (string): The key of the entry
+            result: The value returned by the command
+            lines (list): The lines recorded by a Recorder
+        """
+        try:
+            data = pickle.dumps((time.time(), result, lines),
+                                pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        path = self.path(key)
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        """Removes expired entries and then the least recently used entries
+        until the cache is within its max size.
+        """
+        entries = []
+        now = time.time()
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # an entry is never modified before it was created, so one that
+            # has not been used within the ttl has expired
+            if now - stat.st_mtime > self.ttl:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            self._remove(path)
+            size -= entry_size
+
+    def clear(self):
+        """Removes every entry.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(EXTENSION):
+                self._remove(os.path.join(self.directory, name))
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
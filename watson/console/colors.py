@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from watson.console.styles import format_style, TERMINATE
+from watson.console.styles import Style
 
 
 HEADER = '\033[95m'
@@ -8,6 +8,12 @@ OK_GREEN = '\033[92m'
 WARNING = '\033[93m'
 FAIL = '\033[91m'
 
+HEADER_STYLE = Style(HEADER)
+OK_BLUE_STYLE = Style(OK_BLUE)
+OK_GREEN_STYLE = Style(OK_GREEN)
+WARNING_STYLE = Style(WARNING)
+FAIL_STYLE = Style(FAIL)
+
 
 def header(string, terminate=True):
     """Wraps a string in the terminal colors for headers.
@@ -22,7 +28,7 @@ def header(string, terminate=True):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the color
     """
-    return format_style(string, HEADER, TERMINATE if terminate else '')
+    return HEADER_STYLE(string, terminate)
 
 
 def ok_green(string, terminate=True):
@@ -38,7 +44,7 @@ def ok_green(string, terminate=True):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the color
     """
-    return format_style(string, OK_GREEN, TERMINATE if terminate else '')
+    return OK_GREEN_STYLE(string, terminate)
 
 
 def ok_blue(string, terminate=True):
@@ -54,7 +60,7 @@ def ok_blue(string, terminate=True):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the color
     """
-    return format_style(string, OK_BLUE, TERMINATE if terminate else '')
+    return OK_BLUE_STYLE(string, terminate)
 
 
 def warning(string, terminate=True):
@@ -70,7 +76,7 @@ def warning(string, terminate=True):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the color
     """
-    return format_style(string, WARNING, TERMINATE if terminate else '')
+    return WARNING_STYLE(string, terminate)
 
 
 def fail(string, terminate=True):
@@ -86,4 +92,4 @@ def fail(string, terminate=True):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the color
     """
-    return format_style(string, FAIL, TERMINATE if terminate else '')
+    return FAIL_STYLE(string, terminate)
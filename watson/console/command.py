@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 import abc
+from collections import OrderedDict
 import inspect
-import sys
 from watson.common import strings
+from watson.console import colors, output, writer
+from watson.console.exceptions import ConsoleError
 
 
 class Base(metaclass=abc.ABCMeta):
@@ -54,8 +56,25 @@ class Base(metaclass=abc.ABCMeta):
                 '''Command specific help.
                 '''
                 print('Run!')
+
+    Attributes:
+        __commands__ (OrderedDict): The CommandSpec of each method decorated
+            with arg or cmd, keyed by the name of the method.
     """
     name = None
+    __commands__ = OrderedDict()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        specs = {}
+        for klass in reversed(cls.__mro__):
+            for attr, value in vars(klass).items():
+                spec = getattr(value, '__command_spec__', None)
+                if spec:
+                    specs[attr] = spec
+                else:
+                    specs.pop(attr, None)
+        cls.__commands__ = OrderedDict(sorted(specs.items()))
 
     @classmethod
     def help(cls):
@@ -70,10 +89,152 @@ class Base(metaclass=abc.ABCMeta):
         return strings.snakecase(cls.name)
 
     def write(self, message=None, error=False):
-        out = sys.stderr if error else sys.stdout
         if not message:
             message = ''
-        out.write(message + '\n')
+        if output.current() == output.JSONL:
+            self.emit(output.message(message, error), error)
+            return
+        task = writer.current()
+        if task:
+            task.write(message, error)
+            return
+        out = writer.stderr if error else writer.stdout
+        out.write(message)
+
+    def writelines(self, messages, error=False):
+        if output.current() == output.JSONL:
+            self.emit_many(
+                (output.message(message, error) for message in messages),
+                error)
+            return
+        task = writer.current()
+        if task:
+            task.writelines(messages, error)
+            return
+        out = writer.stderr if error else writer.stdout
+        out.writelines(messages)
+
+    def emit(self, record, error=False):
+        """Writes a structured record.
+
+        When the runner is executed with `--output jsonl` the record is
+        written as a single line of JSON, otherwise it is written as text
+        (see watson.console.output.text).
+
+        Example:
+
+        .. code-block:: python
+
+            self.emit({'id': 1, 'status': 'ok'})
+
+        Args:
+            record: The record to write (such as a dict)
+            error (boolean): Whether to write the record to stderr
+        """
+        self.emit_many((record,), error)
+
+    def emit_many(self, records, error=False):
+        """Writes multiple structured records at once.
+
+        The records are encoded and written in batches, so a generator can
+        be used to keep memory bounded.
+
+        Args:
+            records (iterable): The records to write
+            error (boolean): Whether to write the records to stderr
+        """
+        task = writer.current()
+        structured = output.current() == output.JSONL
+        if structured:
+            if task and task.name:
+                records = (dict(record, task=task.name)
+                           if isinstance(record, dict) else record
+                           for record in records)
+            lines = output.encode_many(records)
+        else:
+            lines = map(output.text, records)
+        if task:
+            task.writelines(lines, error, prefixed=not structured)
+            return
+        out = writer.stderr if error else writer.stdout
+        out.writelines(lines)
+
+    def run_processes(self, processes, jobs=None, timeout=None, check=True,
+                      **kwargs):
+        """Runs subprocesses concurrently, streaming their output.
+
+        The processes are run on an event loop with no more than `jobs`
+        running at once, and each line they write is written via the command
+        prefixed with the name of the process. Any process that exceeds the
+        timeout is killed.
+
+        Example:
+
+        .. code-block:: python
+
+            self.run_processes(
+                {path: ['flake8', path] for path in paths}, jobs=8, timeout=60)
+
+        Args:
+            processes (iterable): The arguments of each process, or a dict
+                of arguments keyed by the name of each process
+            jobs (int): The maximum number of processes to run at once
+            timeout (float): The number of seconds before a process is killed
+            check (boolean): Whether to raise a ConsoleError if any of the
+                processes failed
+            kwargs: The cwd and env of the processes
+
+        Returns:
+            A list of the watson.console.processes.Result of each process.
+
+        Raises:
+            ConsoleError if check is True and any of the processes failed.
+        """
+        # asyncio is only imported when processes are run
+        from watson.console import processes as pool
+        results = pool.run(processes, self._write_process, jobs, timeout,
+                           **kwargs)
+        if check:
+            self._check_processes(results)
+        return results
+
+    async def run_processes_async(self, processes, jobs=None, timeout=None,
+                                  check=True, **kwargs):
+        """Runs subprocesses from within a coroutine command.
+
+        See run_processes.
+        """
+        from watson.console import processes as pool
+        results = await pool.Pool(
+            self._write_process, jobs, timeout, **kwargs).run(processes)
+        if check:
+            self._check_processes(results)
+        return results
+
+    def _write_process(self, process, line, error):
+        if output.current() == output.JSONL:
+            record = output.message(line, error)
+            record['process'] = process.name
+            self.emit(record, error)
+            return
+        self.write(process.prefix + line, error)
+
+    def _check_processes(self, results):
+        failures = [result for result in results if not result.ok]
+        if not failures:
+            return
+        if output.current() == output.JSONL:
+            self.emit_many(({
+                'process': result.name,
+                'error': result.summary(),
+                'returncode': result.returncode,
+                'timed_out': result.timed_out
+            } for result in failures), error=True)
+        else:
+            self.writelines((colors.fail(result.summary())
+                             for result in failures), error=True)
+        raise ConsoleError('{0} of {1} processes failed'.format(
+            len(failures), len(results)))
 
 
 def find_commands_in_module(module):
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import re
+from watson.console.manifest import module_path
+
+
+VERSION = 1
+BASH = 'bash'
+ZSH = 'zsh'
+FISH = 'fish'
+HELP = ('-h', '--help')
+NO_VALUE_ACTIONS = frozenset((
+    'store_true', 'store_false', 'store_const', 'append_const', 'count',
+    'help', 'version'))
+
+SCRIPTS = {
+    BASH: '''_{function}() {{
+    local IFS=$'\\n'
+    COMPREPLY=($("${{COMP_WORDS[0]}}" --complete -- "${{COMP_WORDS[@]:1:COMP_CWORD}}" 2>/dev/null))
+}}
+complete -o default -F _{function} {name}
+''',
+    ZSH: '''#compdef {name}
+_{function}() {{
+    local -a candidates
+    candidates=("${{(@f)$("${{words[1]}}" --complete -- "${{(@)words[2,CURRENT]}}" 2>/dev/null)}}")
+    compadd -- ${{candidates:#}}
+}}
+compdef _{function} {name}
+''',
+    FISH: '''function __{function}
+    set -l words (commandline -opc)
+    $words[1] --complete -- $words[2..-1] (commandline -ct) 2>/dev/null
+end
+complete -c {name} -f -a '(__{function})'
+'''
+}
+
+
+def script(shell, name):
+    """Generates the script that registers completion for a console script.
+
+    Example:
+
+    .. code-block:: bash
+
+        eval "$(console.py --completion bash)"
+
+    Args:
+        shell (string): Either bash, zsh or fish
+        name (string): The name of the console script
+
+    Returns:
+        The script to be sourced by the shell.
+    """
+    if shell not in SCRIPTS:
+        raise ValueError('Unsupported shell {0}, must be one of {1}'.format(
+            shell, ', '.join(sorted(SCRIPTS))))
+    function = 'watson_console_{0}'.format(re.sub(r'\W', '_', name))
+    return SCRIPTS[shell].format(function=function, name=name)
+
+
+def build(registry):
+    """Builds the completion index from the descriptions of the commands.
+
+    The descriptions are the same ones that are used to display the help for
+    the commands, so when the registry has a manifest only the modules that
+    have changed since the manifest was saved are imported.
+
+    Args:
+        registry (watson.console.registry.Registry): The registry to index
+
+    Returns:
+        A JSON serializable dict.
+    """
+    namespaces = {}
+    for name, description in registry.descriptions().items():
+        methods = {}
+        for method, spec in description['methods'].items():
+            options = {}
+            for arg in spec['args']:
+                if not arg['name'].startswith('-'):
+                    continue
+                kwargs = arg['kwargs']
+                options[arg['name']] = {
+                    'value': kwargs.get('action') not in NO_VALUE_ACTIONS,
+                    'choices': kwargs.get('choices')
+                }
+            methods[method] = {'help': spec['help'], 'options': options}
+        namespaces[name] = {'help': description['help'], 'methods': methods}
+    modules = {}
+    definitions = registry.definitions
+    for definition in definitions:
+        path = module_path(definition)
+        if path:
+            modules[path] = os.stat(path).st_mtime
+    return {
+        'version': VERSION,
+        'definitions': definitions,
+        'modules': modules,
+        'namespaces': namespaces
+    }
+
+
+class Index(object):
+    """A cache of the namespaces, methods and options of a runner's commands.
+
+    The index is stored as JSON and is checked against the modification time
+    of each module the commands were declared in, which allows completions to
+    be answered without importing any commands or building any parsers. The
+    index is rebuilt whenever a module changes or the commands are modified.
+
+    Example:
+
+    .. code-block:: python
+
+        index = Index('/tmp/console.completion.json')
+        data = index.get(runner.registry)
+        complete(data, ['namespace', '--'])
+    """
+    path = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Reads the index from disk.
+
+        Returns:
+            The index or None if it is missing, corrupt or outdated.
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != VERSION:
+            return None
+        return data
+
+    def fresh(self, data, definitions):
+        """Determines whether or not the index is still valid.
+
+        Args:
+            data (dict): The loaded index
+            definitions (list): The definitions of the runner's commands
+        """
+        if data.get('definitions') != definitions:
+            return False
+        for path, mtime in data.get('modules', {}).items():
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def get(self, registry):
+        """Retrieves the index, rebuilding it if it is stale.
+
+        Args:
+            registry (watson.console.registry.Registry): The registry to index
+        """
+        data = self.load()
+        if data and self.fresh(data, registry.definitions):
+            return data
+        data = build(registry)
+        self.save(data)
+        return data
+
+    def save(self, data):
+        """Writes the index to disk.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+def complete(index, words, options=None):
+    """Determines the candidates for the word being completed.
+
+    Args:
+        index (dict): The completion index
+        words (list): The words following the script name, the last of which
+            is the (possibly empty) word being completed
+        options (dict): The runner options that may precede the namespace,
+            see watson.console.runner.Runner.options
+
+    Returns:
+        A sorted list of candidates.
+    """
+    options = options or {}
+    words = list(words) or ['']
+    current = words.pop()
+    position = 0
+    while position < len(words):
+        option, has_value, _ = words[position].partition('=')
+        if option not in options:
+            break
+        position += 1
+        if options[option] and not has_value:
+            if position == len(words):
+                return []
+            position += 1
+    previous = words[position:]
+    if not previous:
+        candidates = list(index['namespaces'])
+        if current.startswith('-'):
+            candidates.extend(options)
+            candidates.extend(HELP)
+        return _matches(candidates, current)
+    namespace = index['namespaces'].get(previous[0])
+    if not namespace:
+        return []
+    if len(previous) == 1:
+        candidates = list(namespace['methods'])
+        if current.startswith('-'):
+            candidates.extend(HELP)
+        return _matches(candidates, current)
+    method = namespace['methods'].get(previous[1])
+    if not method:
+        return []
+    method_options = method['options']
+    last = previous[-1]
+    if len(previous) > 2 and method_options.get(last, {}).get('value'):
+        return _matches(method_options[last]['choices'] or (), current)
+    if current.startswith('-'):
+        used = set(previous[2:])
+        candidates = [option for option in method_options if option not in used]
+        candidates.extend(HELP)
+        return _matches(candidates, current)
+    return []
+
+
+def _matches(candidates, current):
+    return sorted(str(candidate) for candidate in candidates
+                  if str(candidate).startswith(current))
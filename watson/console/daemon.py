@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+from array import array
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from watson.console import writer
+
+
+HEADER = struct.Struct('!I')
+STATUS = struct.Struct('!i')
+STDIO = (0, 1, 2)
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('Connection closed')
+        data += chunk
+    return data
+
+
+def _recv_fds(sock, size, count):
+    fds = array('i')
+    data, ancdata, _, _ = sock.recvmsg(
+        size, socket.CMSG_LEN(count * fds.itemsize))
+    for level, type, cmsg_data in ancdata:
+        if level == socket.SOL_SOCKET and type == socket.SCM_RIGHTS:
+            usable = len(cmsg_data) - (len(cmsg_data) % fds.itemsize)
+            fds.frombytes(cmsg_data[:usable])
+    if not data:
+        raise ConnectionError('Connection closed')
+    if len(data) < size:
+        data += _recv_exact(sock, size - len(data))
+    return data, list(fds)
+
+
+class Client(object):
+    """Forwards a command to a running Server.
+
+    The arguments, working directory and environment are sent to the server
+    along with the stdin, stdout and stderr file descriptors, so the command
+    reads and writes directly to the terminal (or pipes) of the client.
+
+    Example:
+
+    .. code-block:: python
+
+        client = Client('/tmp/console.sock')
+        status = client.execute(['namespace', 'command', '--option', 'value'])
+
+    This can also be used from the command line:
+
+    .. code-block:: bash
+
+        python -m watson.console.daemon /tmp/console.sock namespace command
+    """
+    path = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def execute(self, args, cwd=None, env=None, stdio=STDIO):
+        """Executes a command on the server.
+
+        Args:
+            args (list): The arguments, excluding the script name
+            cwd (string): The working directory, defaults to the current one
+            env (dict): The environment, defaults to the current one
+            stdio (tuple): The file descriptors for stdin, stdout and stderr
+
+        Returns:
+            The exit status of the command.
+        """
+        header = json.dumps({
+            'args': list(args),
+            'cwd': cwd or os.getcwd(),
+            'env': dict(os.environ if env is None else env)
+        }).encode('utf-8')
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+            sock.sendmsg(
+                [HEADER.pack(len(header))],
+                [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array('i', stdio))])
+            sock.sendall(header)
+            try:
+                status, = STATUS.unpack(_recv_exact(sock, STATUS.size))
+            except ConnectionError:
+                status = 1
+        finally:
+            sock.close()
+        return status
+
+
+class Server(object):
+    """Keeps a runner (and all of its commands) loaded in memory.
+
+    Every command is imported and every parser is built once when the server
+    starts. Each client connection is then handled within a forked process
+    that inherits the warm runner, which allows multiple clients to be served
+    concurrently and isolates any changes that the command makes to the
+    process.
+
+    The server will shut down if no clients have connected within the idle
+    timeout, and will restart itself if any of the modules that contain the
+    commands are modified.
+
+    Example:
+
+    .. code-block:: python
+
+        runner = Runner(commands=[...])
+        Server(runner, '/tmp/console.sock', idle_timeout=600).serve_forever()
+
+    Or via the runner itself:
+
+    .. code-block:: bash
+
+        console.py --serve /tmp/console.sock
+
+    Attributes:
+        ready (threading.Event): Set once the server is accepting clients
+    """
+    runner = None
+    path = None
+    idle_timeout = None
+    poll_interval = 1.0
+
+    def __init__(self, runner, path, idle_timeout=None, poll_interval=None):
+        self.runner = runner
+        self.path = path
+        self.idle_timeout = idle_timeout
+        if poll_interval:
+            self.poll_interval = poll_interval
+        self.modules = {}
+        self.children = set()
+        self.ready = threading.Event()
+        self._running = False
+
+    def prepare(self):
+        """Imports all the commands and builds their parsers.
+        """
+        for name, command in self.runner.commands.items():
+            for method in command.__commands__:
+                self.runner._get_parser(name, method)
+            module = sys.modules.get(command.__module__)
+            path = getattr(module, '__file__', None)
+            if path and os.path.isfile(path):
+                self.modules[path] = os.stat(path).st_mtime
+
+    def changed(self):
+        """Determines whether or not any of the command modules have changed.
+        """
+        for path, mtime in self.modules.items():
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def restart(self):
+        """Replaces the current process with a new instance of the server.
+        """
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    def stop(self):
+        """Stops the server after the current poll interval.
+        """
+        self._running = False
+
+    def serve_forever(self):
+        """Listens for clients until the server is stopped or idle.
+        """
+        self.prepare()
+        # the socket is only moved into place once it is listening, so that
+        # clients are never refused by a socket that exists but isn't ready
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(tmp_path)
+        sock.listen(socket.SOMAXCONN)
+        sock.settimeout(self.poll_interval)
+        os.rename(tmp_path, self.path)
+        self.ready.set()
+        self._running = True
+        last_activity = time.monotonic()
+        restart = False
+        try:
+            while self._running:
+                self._reap()
+                if self.changed():
+                    restart = True
+                    break
+                idle = time.monotonic() - last_activity
+                expired = self.idle_timeout and idle > self.idle_timeout
+                if expired and not self.children:
+                    break
+                try:
+                    conn, _ = sock.accept()
+                except socket.timeout:
+                    continue
+                last_activity = time.monotonic()
+                self.handle(conn)
+        finally:
+            self.ready.clear()
+            sock.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self._reap(wait=True)
+        if restart:
+            self.restart()
+
+    def handle(self, conn):
+        """Forks a new process to execute the command sent by the client.
+        """
+        fds = []
+        try:
+            conn.settimeout(None)
+            data, fds = _recv_fds(conn, HEADER.size, len(STDIO))
+            size, = HEADER.unpack(data)
+            request = json.loads(_recv_exact(conn, size).decode('utf-8'))
+            if len(fds) != len(STDIO):
+                raise ConnectionError('Missing file descriptors')
+            writer.flush()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid:
+                self.children.add(pid)
+                return
+            status = 1
+            try:
+                status = self._execute(request, fds)
+            finally:
+                try:
+                    conn.sendall(STATUS.pack(status))
+                finally:
+                    os._exit(status)
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+
+    def _execute(self, request, fds):
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        for fd, target in zip(fds, STDIO):
+            os.dup2(fd, target)
+        sys.stdin = open(0, 'r', closefd=False)
+        sys.stdout = open(1, 'w', closefd=False)
+        sys.stderr = open(2, 'w', closefd=False)
+        args = [sys.argv[0]] + request['args']
+        sys.argv = args[:]
+        try:
+            return self.runner._execute_line(args)
+        finally:
+            writer.flush()
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+    def _reap(self, wait=False):
+        for pid in list(self.children):
+            try:
+                finished, _ = os.waitpid(pid, 0 if wait else os.WNOHANG)
+            except ChildProcessError:
+                finished = pid
+            if finished:
+                self.children.discard(pid)
+
+
+def main(args=None):
+    """Executes a command on a running server.
+
+    Usage: python -m watson.console.daemon SOCKET [ARGS...]
+    """
+    args = sys.argv[1:] if args is None else args
+    if not args:
+        sys.stderr.write('Usage: python -m watson.console.daemon SOCKET [ARGS...]\n')
+        return 2
+    try:
+        return Client(args[0]).execute(args[1:])
+    except OSError as exc:
+        sys.stderr.write('Error: Could not connect to {0} ({1})\n'.format(
+            args[0], exc))
+        return 1
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -1,20 +1,16 @@
 # -*- coding: utf-8 -*-
 import functools
 import inspect
-import re
-from watson.common.contextmanagers import suppress
+from watson.console.parallel import PROCESS, THREAD
+from watson.console.spec import (ArgSpec, CommandSpec, CACHE_MAX_SIZE,
+                                 CACHE_TTL)
 
-__all__ = ['arg', 'cmd']
-
-DOC_REGEX = re.compile(r'(?P<arg>\w+)(|.)+[\:]\ (?P<help>.*)', re.MULTILINE)
-
-
-def _ensure_func_attrs(func):
-    """Add the relevant attributes to the function.
-    """
-    if not hasattr(func, '__args__'):
-        func.__args__ = []
-        func.__args_mapping__ = {}
+__all__ = ['arg', 'cmd', 'cached', 'parallel']
+# the output written by process workers can't be recorded and replayed
+_UNRECORDED = '{0} cannot be cached when executed in processes'
+# the results of these functions are consumed after the method returns
+_UNCACHEABLE = (inspect.iscoroutinefunction, inspect.isgeneratorfunction,
+                inspect.isasyncgenfunction)
 
 
 class arg(object):
@@ -24,6 +20,10 @@ class arg(object):
     can be specified. Leaving the kwargs blank will force the method to be
     treated as a command.
 
+    The decorated method will have a CommandSpec attached to it as
+    `__command_spec__`, which is registered against the command when the class
+    is created.
+
     Example:
 
     .. code-block:: python
@@ -54,36 +54,6 @@ class arg(object):
         self.kwargs = kwargs
         self.validate_name(name)
 
-    def add_func_to_arg_list(self, func, name, prefixed_name):
-        index = None
-        try:
-            index = [arg[0] for arg in func.__args__].index(prefixed_name)
-        except Exception:
-            with suppress(Exception):
-                idx = [arg[0] for arg in func.__args__].index(name)
-                del func.__args__[idx]
-            func.__args__.append((prefixed_name, self.kwargs))
-        if index:
-            func.__args__[index] = (self.arg_name, self.kwargs)
-
-    def process_docstring(self, func):
-        if not hasattr(func, '__func_doc__'):
-            doc = func.__doc__ or 'Missing doc.'
-            lines = doc.splitlines()
-            kw = self.kwargs
-            func.__func_doc__ = kw['help'] if 'help' in kw else lines[0]
-            description = []
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Args:'):
-                    break
-                description.append(line)
-            if description:
-                func.__desc__ = '\n'.join(description)
-            else:
-                func.__desc__ = func.__func_doc__
-            func.help = {k: v for k, t, v in DOC_REGEX.findall(doc)}
-
     def validate_name(self, name):
         if not self.name:
             self.name = name
@@ -92,28 +62,22 @@ class arg(object):
 
     def __call__(self, func):
         self.validate_name(func.__name__)
-        self.process_docstring(func)
-        _ensure_func_attrs(func)
-
-        if 'help' not in self.kwargs:
-            self.kwargs['help'] = func.help.get(self.name, '')
-        if not hasattr(func, 'is_cli_command'):
+        spec = getattr(func, '__command_spec__', None)
+        if not spec:
             # Add any named arguments, we'll override them later if the
             # arg has been specified in a decorator
-            spec = inspect.getfullargspec(func)
-            for arg in spec[0][1:]:
-                func.__args_mapping__[arg] = arg
-                func.__args__.append((arg, {'help': func.help.get(arg, '')}))
-        func.is_cli_command = True
+            spec = CommandSpec.from_function(func, self.kwargs.get('help'))
 
         if not self.base_command:
-            func.__args_mapping__[self.arg_name] = self.name
-            self.add_func_to_arg_list(func, self.name, self.arg_name)
-
-        @functools.wraps(func)
-        def decorated(*args, **kwargs):
-            return func(*args, **kwargs)
-        return decorated
+            kwargs = self.kwargs
+            items = spec.parallel and spec.parallel[0] == self.name
+            if items and 'nargs' not in kwargs:
+                # the items of a parallel command still accept many values
+                kwargs = dict(kwargs, nargs='+')
+            # the help is retrieved from the docstring if it is not specified
+            spec = spec.with_arg(ArgSpec(
+                self.arg_name, self.name, kwargs, spec.docstring))
+        return _decorate(func, spec)
 
     @property
     def arg_name(self):
@@ -125,3 +89,135 @@ class arg(object):
 class cmd(arg):
     """To be used for semantic purposes if the command has no arguments.
     """
+
+
+class parallel(object):
+    """Calls a command once for each item of an argument, in parallel.
+
+    The argument will accept multiple values (unless nargs has already been
+    specified), and a --jobs option is added to control the number of
+    workers. Any value returned for an item is written to stdout, either in
+    the order of the items or as each item completes. Items that raise an
+    exception are reported to stderr once all the items have been processed,
+    and the command exits with a non-zero status.
+
+    Example:
+
+    .. code-block:: python
+
+        class MyCommand(Base):
+            @parallel('id')
+            def refresh(self, id):
+                '''Refreshes the cache of each id.
+                '''
+                return 'Refreshed {0}'.format(id)
+
+    .. code-block:: bash
+
+        console.py my_command refresh 1 2 3 4 --jobs 4
+
+    Args:
+        name (string): The argument containing the items
+        executor (string): Either thread or process (the command must be
+            picklable when using processes)
+        ordered (boolean): Whether to write the results in the order of the
+            items, or as they complete
+    """
+    name = None
+    executor = THREAD
+    ordered = True
+
+    def __init__(self, name, executor=THREAD, ordered=True):
+        self.name = name
+        self.executor = executor
+        self.ordered = ordered
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            raise TypeError('Coroutines cannot be executed in parallel')
+        spec = getattr(func, '__command_spec__', None)
+        if not spec:
+            spec = CommandSpec.from_function(func)
+        if spec.cache and self.executor == PROCESS:
+            raise TypeError(_UNRECORDED.format(func.__name__))
+        for existing in spec.args:
+            if existing.dest == self.name:
+                if 'nargs' not in existing.kwarg_names:
+                    spec = spec.with_arg(existing.with_kwargs(nargs='+'))
+                break
+        else:
+            raise TypeError('{0} is not an argument of {1}'.format(
+                self.name, func.__name__))
+        spec = spec.with_arg(ArgSpec('--jobs', 'jobs', {
+            'type': int,
+            'default': 1,
+            'metavar': 'N',
+            'help': 'The number of items to process in parallel (0 for one per CPU)'
+        }))
+        spec = spec._replace(parallel=(self.name, self.executor, self.ordered))
+        return _decorate(func, spec)
+
+
+class cached(object):
+    """Caches the result of a command on disk.
+
+    The result is keyed on the namespace, method and parsed arguments, and
+    anything the command writes via write or emit is stored alongside it, so
+    repeated invocations with the same arguments return the result and replay
+    the output without executing the method. A --no-cache option is added to
+    bypass (and refresh) the cache.
+
+    The entries are stored alongside the manifest, or within
+    ~/.cache/watson-console (see Runner.cache_directory).
+
+    Example:
+
+    .. code-block:: python
+
+        class MyCommand(Base):
+            @cached(ttl=300)
+            @arg('id')
+            def lookup(self, id):
+                '''Looks up the owner of the id.
+                '''
+                return fetch_owner(id)
+
+    Args:
+        ttl (int): The number of seconds that a result is valid for
+        max_size (int): The maximum number of bytes to store for the method
+    """
+    ttl = CACHE_TTL
+    max_size = CACHE_MAX_SIZE
+
+    def __init__(self, ttl=CACHE_TTL, max_size=CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def __call__(self, func):
+        unwrapped = inspect.unwrap(func)
+        if any(check(unwrapped) for check in _UNCACHEABLE):
+            raise TypeError('{0} cannot be cached'.format(func.__name__))
+        spec = getattr(func, '__command_spec__', None)
+        if not spec:
+            spec = CommandSpec.from_function(func)
+        if spec.parallel and spec.parallel[1] == PROCESS:
+            raise TypeError(_UNRECORDED.format(func.__name__))
+        spec = spec.with_arg(ArgSpec('--no-cache', 'no_cache', {
+            'action': 'store_true',
+            'help': 'Execute the command rather than using a cached result'
+        }))
+        spec = spec._replace(cache=(self.ttl, self.max_size))
+        return _decorate(func, spec)
+
+
+def _decorate(func, spec):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def decorated(*args, **kwargs):
+            return await func(*args, **kwargs)
+    else:
+        @functools.wraps(func)
+        def decorated(*args, **kwargs):
+            return func(*args, **kwargs)
+    decorated.__command_spec__ = spec
+    return decorated
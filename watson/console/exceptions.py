@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+
+class ConsoleError(KeyError):
+    """An error that should be raised from within the command.
+    """
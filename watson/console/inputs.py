@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+
+STDIN = '-'
+CHUNK_SIZE = 1 << 20
+
+
+def close_all(values):
+    """Closes any inputs within the values (or lists of values).
+
+    This is called by the runner with the arguments of a command once it has
+    finished executing, so any errors raised when closing an input are
+    ignored.
+
+    Args:
+        values (iterable): The values of the arguments
+    """
+    for value in values:
+        if isinstance(value, Input):
+            try:
+                value.close()
+            except Exception:
+                pass
+        elif isinstance(value, (list, tuple)):
+            close_all(value)
+
+
+class Input(object):
+    """A file (or stdin when the path is -) that is opened when first used.
+
+    Inputs can be used as the type of an argument, the path is validated when
+    the arguments are parsed but the file is only opened when the command
+    accesses it, and is closed by the runner once the command has finished.
+
+    Example:
+
+    .. code-block:: python
+
+        @arg('source', type=Input)
+        def count(self, source):
+            return len(source.read())
+
+    Args:
+        path (string): The path of the file, or - for stdin
+    """
+    mode = 'r'
+    encoding = 'utf-8'
+    _file = None
+    closed = False
+
+    def __init__(self, path):
+        if path != STDIN and not os.path.isfile(path):
+            raise ValueError('{0} does not exist'.format(path))
+        self.path = path
+
+    @property
+    def is_stdin(self):
+        return self.path == STDIN
+
+    @property
+    def file(self):
+        """The underlying file, opening it if required.
+        """
+        if self._file is None:
+            if self.closed:
+                raise ValueError('I/O operation on closed input')
+            self._file = self._open()
+        return self._file
+
+    def _open(self):
+        binary = 'b' in self.mode
+        if self.is_stdin:
+            stdin = sys.stdin.buffer if binary else sys.stdin
+            return open(stdin.fileno(), self.mode, closefd=False,
+                        encoding=None if binary else self.encoding)
+        return open(self.path, self.mode,
+                    encoding=None if binary else self.encoding)
+
+    def fingerprint(self):
+        """Identifies the contents of the file without reading it.
+
+        Returns:
+            A tuple of the path, modification time and size, or None for
+            stdin (which cannot be identified).
+        """
+        if self.is_stdin:
+            return None
+        stat = os.stat(self.path)
+        return (os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size)
+
+    def read(self, size=-1):
+        return self.file.read(size)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    def close(self):
+        """Closes the file (if it was opened).
+        """
+        self.closed = True
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(self.__class__.__name__, self.path)
+
+
+class Lines(Input):
+    """Iterates over the lines of a file (or stdin) without the newlines.
+
+    Example:
+
+    .. code-block:: python
+
+        @arg('source', type=Lines)
+        def count(self, source):
+            return sum(1 for line in source)
+    """
+
+    def __iter__(self):
+        for line in self.file:
+            yield line[:-1] if line.endswith('\n') else line
+
+
+class Chunks(Input):
+    """Iterates over a binary file (or stdin) in chunks of a fixed size.
+
+    Use Chunks.of(size) to change the size of each chunk.
+
+    Example:
+
+    .. code-block:: python
+
+        @arg('source', type=Chunks.of(65536))
+        def checksum(self, source):
+            digest = hashlib.sha256()
+            for chunk in source:
+                digest.update(chunk)
+            return digest.hexdigest()
+    """
+    mode = 'rb'
+    size = CHUNK_SIZE
+
+    @classmethod
+    def of(cls, size):
+        """Creates an argument type that reads chunks of the specified size.
+        """
+        return type(cls.__name__, (cls,), {'size': size})
+
+    def __iter__(self):
+        read = self.file.read
+        size = self.size
+        while True:
+            chunk = read(size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class MappedFile(Input):
+    """A read-only memory map of a file.
+
+    The contents can be sliced, searched and iterated over without reading
+    the whole file into memory. Stdin can only be mapped if it has been
+    redirected from a file, otherwise it is read into memory.
+
+    Example:
+
+    .. code-block:: python
+
+        @arg('source', type=MappedFile)
+        def find(self, source, term):
+            return source.map.find(term.encode())
+    """
+    mode = 'rb'
+    _map = None
+
+    @property
+    def map(self):
+        """The mmap of the file (or bytes if it cannot be mapped).
+        """
+        if self._map is None:
+            import mmap
+            file = self.file
+            try:
+                if os.fstat(file.fileno()).st_size == 0:
+                    self._map = b''
+                else:
+                    self._map = mmap.mmap(
+                        file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self._map = file.read()
+        return self._map
+
+    def view(self):
+        """A zero-copy memoryview of the contents.
+
+        The map remains open while the view (or any slice of it) is in use.
+        """
+        return memoryview(self.map)
+
+    def __len__(self):
+        return len(self.map)
+
+    def __getitem__(self, index):
+        return self.map[index]
+
+    def __iter__(self):
+        mapped = self.map
+        start = 0
+        end = len(mapped)
+        while start < end:
+            newline = mapped.find(b'\n', start)
+            stop = end if newline == -1 else newline + 1
+            yield mapped[start:stop]
+            start = stop
+
+    def close(self):
+        mapped, self._map = self._map, None
+        if mapped is not None and not isinstance(mapped, bytes):
+            try:
+                mapped.close()
+            except BufferError:
+                # a view is still in use (such as one returned from the
+                # command), the map is closed once the view is released
+                pass
+        super(MappedFile, self).close()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from importlib.util import find_spec
+import json
+import os
+
+
+VERSION = 2
+
+
+def module_path(definition):
+    """Retrieves the file a fully qualified definition is declared in.
+
+    The module itself is not imported (although any parent packages will be).
+
+    Example:
+
+    .. code-block:: python
+
+        module_path('myapp.commands.MyCommand')  # /path/to/myapp/commands.py
+
+    Args:
+        definition (string): The fully qualified name of the command
+
+    Returns:
+        The path to the module or None if it cannot be found.
+    """
+    module_name = definition.rsplit('.', 1)[0]
+    try:
+        spec = find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if not spec or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    return spec.origin
+
+
+def describe(command_class):
+    """Generates a JSON serializable description of a command.
+
+    The description contains everything required to display help for the
+    command without having to import it.
+
+    Args:
+        command_class (class): The command to describe
+
+    Returns:
+        A dict containing the name, help and methods of the command.
+    """
+    return {
+        'name': command_class.cased_name(),
+        'help': command_class.help(),
+        'methods': {name: spec.to_dict()
+                    for name, spec in command_class.__commands__.items()}
+    }
+
+
+class Manifest(object):
+    """A persistent cache of command descriptions.
+
+    Each entry is keyed by the fully qualified name of the command and is
+    invalidated whenever the modification time of the module it was declared
+    in changes. This allows the runner to display help for every command while
+    only importing the module of the command being executed.
+
+    Example:
+
+    .. code-block:: python
+
+        runner = Runner(commands=['myapp.commands.MyCommand'],
+                        manifest='/tmp/myapp-commands.json')
+        runner()
+    """
+    path = None
+    _entries = None
+    _dirty = False
+
+    def __init__(self, path):
+        self.path = path
+
+    @property
+    def entries(self):
+        """All the entries stored within the manifest.
+
+        Returns:
+            A dict of descriptions keyed by their definition.
+        """
+        if self._entries is None:
+            self._entries = self.load()
+        return self._entries
+
+    def load(self):
+        """Reads the entries from disk.
+
+        Missing, corrupt or outdated manifests are treated as empty.
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != VERSION:
+            return {}
+        return data.get('commands', {})
+
+    def get(self, definition):
+        """Retrieves the description of a command.
+
+        Args:
+            definition (string): The fully qualified name of the command
+
+        Returns:
+            The description or None if it is missing or stale.
+        """
+        entry = self.entries.get(definition)
+        if not entry:
+            return None
+        path = module_path(definition)
+        if not path or entry.get('module') != path:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        if entry.get('mtime') != mtime:
+            return None
+        return entry
+
+    def update(self, definition, command_class):
+        """Stores the description of an imported command.
+
+        Args:
+            definition (string): The fully qualified name of the command
+            command_class (class): The imported command
+
+        Returns:
+            The stored description.
+        """
+        entry = describe(command_class)
+        path = module_path(definition)
+        if path:
+            entry['module'] = path
+            entry['mtime'] = os.stat(path).st_mtime
+        self.entries[definition] = entry
+        self._dirty = True
+        return entry
+
+    def save(self):
+        """Writes the entries to disk if any of them have changed.
+
+        The manifest is only a cache, so it is not written if the path is
+        not writable.
+        """
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': VERSION, 'commands': self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            return
+        self._dirty = False
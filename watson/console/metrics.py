@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timezone
+import json
+import socket
+import sys
+import time
+from watson.console.runner import ConsoleError, POST_EXECUTE, PRE_EXECUTE
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def peak_rss():
+    """The peak resident set size of the current process in bytes.
+
+    Returns:
+        The number of bytes, or None if it cannot be determined.
+    """
+    if resource is None:  # pragma: no cover
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, and in kilobytes everywhere else
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class JSONLinesSink(object):
+    """Appends each record to a file as a line of JSON.
+
+    The file is opened in append mode for each record so that multiple
+    processes (such as concurrent cron jobs) can share the same file.
+
+    Args:
+        path (string): The path of the file
+    """
+    path = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, record):
+        line = json.dumps(record, sort_keys=True) + '\n'
+        try:
+            with open(self.path, 'a') as file:
+                file.write(line)
+        except OSError:
+            pass
+
+
+class StatsdSink(object):
+    """Sends each record to statsd over UDP.
+
+    Timings are sent in milliseconds as prefix.namespace.method.wall and
+    prefix.namespace.method.cpu, the peak RSS as a gauge and the exit status
+    (and any console error) as counters.
+
+    Args:
+        host (string): The host of the statsd server
+        port (int): The port of the statsd server
+        prefix (string): The prefix of each metric
+    """
+    host = '127.0.0.1'
+    port = 8125
+    prefix = 'watson.console'
+
+    def __init__(self, host=None, port=None, prefix=None):
+        if host:
+            self.host = host
+        if port:
+            self.port = port
+        if prefix:
+            self.prefix = prefix
+
+    def metrics(self, record):
+        """Converts a record into statsd metrics.
+
+        Returns:
+            A list of lines in the statsd format.
+        """
+        name = '{0}.{1}.{2}'.format(
+            self.prefix, record['namespace'], record['method'])
+        metrics = [
+            '{0}.wall:{1:.3f}|ms'.format(name, record['wall'] * 1000),
+            '{0}.cpu:{1:.3f}|ms'.format(name, record['cpu'] * 1000),
+            '{0}.status.{1}:1|c'.format(name, record['status'])
+        ]
+        if record['max_rss'] is not None:
+            metrics.append('{0}.max_rss:{1}|g'.format(name, record['max_rss']))
+        if record['console_error']:
+            metrics.append('{0}.console_error:1|c'.format(name))
+        return metrics
+
+    def send(self, record):
+        data = '\n'.join(self.metrics(record)).encode('utf-8')
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.sendto(data, (self.host, self.port))
+        except OSError:
+            pass
+        finally:
+            sock.close()
+
+
+class Metrics(object):
+    """Collects metrics about each command executed by a runner.
+
+    The wall time, CPU time, peak RSS, exit status and whether or not a
+    ConsoleError was raised are recorded for each command and sent to each of
+    the sinks once the command has finished.
+
+    Example:
+
+    .. code-block:: python
+
+        runner = Runner(commands=[...])
+        Metrics(JSONLinesSink('/var/log/console.jsonl'), StatsdSink()).install(runner)
+        runner()
+
+    Args:
+        sinks (list): The sinks to send each record to
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+        self._started = {}
+
+    def install(self, runner):
+        """Adds the hooks to the runner.
+
+        Args:
+            runner (watson.console.runner.Runner): The runner to collect from
+        """
+        runner.add_hook(PRE_EXECUTE, self.start)
+        runner.add_hook(POST_EXECUTE, self.finish)
+        return self
+
+    def start(self, invocation):
+        self._started[id(invocation)] = (
+            time.perf_counter(), time.process_time())
+
+    def finish(self, invocation):
+        started = self._started.pop(id(invocation), None)
+        if started is None:
+            return
+        record = self.record(invocation, *started)
+        for sink in self.sinks:
+            sink.send(record)
+
+    def record(self, invocation, wall, cpu):
+        """Creates the record for a finished invocation.
+
+        Args:
+            invocation (watson.console.runner.Invocation): The invocation
+            wall (float): The perf_counter when the invocation started
+            cpu (float): The process_time when the invocation started
+        """
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'namespace': invocation.namespace,
+            'method': invocation.method,
+            'wall': time.perf_counter() - wall,
+            'cpu': time.process_time() - cpu,
+            'max_rss': peak_rss(),
+            'status': invocation.status,
+            'console_error': isinstance(invocation.exception, ConsoleError)
+        }
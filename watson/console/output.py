@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Mapping
+from contextlib import contextmanager
+from watson.console.table import strip_ansi
+
+
+TEXT = 'text'
+JSONL = 'jsonl'
+FORMATS = (TEXT, JSONL)
+
+_format = TEXT
+_encoder = None
+
+
+def current():
+    """The format that output is currently written in.
+    """
+    return _format
+
+
+def set_format(value):
+    """Globally sets the format that output is written in.
+
+    Args:
+        value (string): Either text or jsonl
+    """
+    global _format
+    if value not in FORMATS:
+        raise ValueError('Invalid output {0}, must be one of {1}'.format(
+            value, ', '.join(FORMATS)))
+    _format = value
+
+
+@contextmanager
+def formatted(value):
+    """Sets the output format within a block.
+
+    Example:
+
+    .. code-block:: python
+
+        with formatted(JSONL):
+            runner.execute(args)
+    """
+    previous = _format
+    set_format(value)
+    try:
+        yield
+    finally:
+        set_format(previous)
+
+
+def _json_encoder():
+    import json
+    encoder = json.JSONEncoder(
+        ensure_ascii=False, separators=(',', ':'), default=str)
+    return encoder.encode
+
+
+def _default_encoder():
+    fallback = _json_encoder()
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        def encode(record):
+            try:
+                return orjson.dumps(record).decode('utf-8')
+            except TypeError:
+                return fallback(record)
+        return encode
+    try:
+        import ujson
+    except ImportError:
+        return fallback
+
+    def encode(record):
+        try:
+            return ujson.dumps(record, ensure_ascii=False,
+                               escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return fallback(record)
+    return encode
+
+
+def encoder():
+    """The function used to encode each record as JSON.
+
+    orjson or ujson are used if they are installed (falling back to json for
+    any values they cannot encode), otherwise json is used.
+    """
+    global _encoder
+    if _encoder is None:
+        _encoder = _default_encoder()
+    return _encoder
+
+
+def set_encoder(func):
+    """Replaces the function used to encode each record as JSON.
+
+    Args:
+        func (callable): Encodes a record as a single line of JSON, or None
+            to restore the default encoder
+    """
+    global _encoder
+    _encoder = func
+
+
+def encode(record):
+    """Encodes a record as a single line of JSON.
+    """
+    return encoder()(record)
+
+
+def encode_many(records):
+    """Encodes multiple records at once.
+
+    Returns:
+        A generator of lines.
+    """
+    return map(encoder(), records)
+
+
+def text(record):
+    """Formats a record as text.
+
+    Mappings are written as their tab separated values, and anything else as
+    is.
+    """
+    if isinstance(record, Mapping):
+        return '\t'.join(str(value) for value in record.values())
+    return record
+
+
+def formatter():
+    """The function that formats each record in the current format.
+    """
+    return encode if _format == JSONL else text
+
+
+def message(message, error=False):
+    """The record for a message written via command.Base.write.
+    """
+    record = {'message': strip_ansi(str(message))}
+    if error:
+        record['level'] = 'error'
+    return record
+
+
+def error(exc):
+    """The record for an error that has stopped a command.
+    """
+    return {
+        'error': strip_ansi(str(exc).strip("'")),
+        'type': exc.__class__.__name__
+    }
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from collections import deque
+from functools import partial
+import os
+
+
+THREAD = 'thread'
+PROCESS = 'process'
+EXECUTORS = {
+    THREAD: 'ThreadPoolExecutor',
+    PROCESS: 'ProcessPoolExecutor'
+}
+WINDOW = 4
+
+
+def workers(jobs):
+    """The number of workers to use for a --jobs value.
+
+    Args:
+        jobs (int): The number of jobs, 0 (or less) uses every CPU
+    """
+    if not jobs or jobs < 1:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def bind(func, name, kwargs):
+    """Binds the remaining kwargs of a per item function.
+
+    Returns:
+        A picklable callable that calls the function with the item as the
+        keyword argument name.
+    """
+    return partial(_call, func, name, kwargs)
+
+
+def _call(func, name, kwargs, item):
+    kwargs = dict(kwargs)
+    kwargs[name] = item
+    return func(**kwargs)
+
+
+def imap(func, items, jobs=1, executor=THREAD, ordered=True):
+    """Calls a function for each item, yielding the outcome of each call.
+
+    Exceptions raised by the function are yielded rather than raised so that
+    the remaining items are still processed. Only a bounded number of items
+    are submitted to the pool at once, so items can be consumed lazily from
+    a generator.
+
+    Example:
+
+    .. code-block:: python
+
+        for item, result, exc in imap(fetch, ids, jobs=8):
+            if exc:
+                print('Failed', item)
+
+    Args:
+        func (callable): The function to call with each item, must be
+            picklable when using a process pool
+        items (iterable): The items to process
+        jobs (int): The number of workers, 1 processes the items serially
+        executor (string): Either thread or process
+        ordered (boolean): Whether to yield the outcomes in the order of the
+            items, or as each call completes
+
+    Returns:
+        A generator of (item, result, exception) tuples.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError('Invalid executor {0}'.format(executor))
+    jobs = workers(jobs)
+    if jobs == 1:
+        for item in items:
+            try:
+                yield item, func(item), None
+            except Exception as exc:
+                yield item, None, exc
+        return
+    # concurrent.futures (and multiprocessing) is only imported when required
+    from concurrent import futures
+    with getattr(futures, EXECUTORS[executor])(max_workers=jobs) as pool:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, pool.submit(func, item)))
+                if len(pending) >= jobs * WINDOW:
+                    if ordered:
+                        yield _outcome(*pending.popleft())
+                    else:
+                        yield from _completed(pending)
+            while pending:
+                if ordered:
+                    yield _outcome(*pending.popleft())
+                else:
+                    yield from _completed(pending)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _outcome(item, future):
+    try:
+        return item, future.result(), None
+    except Exception as exc:
+        return item, None, exc
+
+
+def _completed(pending):
+    from concurrent.futures import FIRST_COMPLETED, wait
+    done, _ = wait([future for _, future in pending],
+                   return_when=FIRST_COMPLETED)
+    for entry in list(pending):
+        if entry[1] in done:
+            pending.remove(entry)
+            yield _outcome(*entry)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+SIMPLE_KWARGS = frozenset(('help', 'metavar'))
+END_OF_OPTIONS = '--'
+
+
+class UnsupportedArguments(Exception):
+    """Raised when the arguments cannot be parsed without argparse.
+    """
+
+
+def is_simple(spec):
+    """Determines whether or not a command can be parsed without argparse.
+
+    Simple commands are those that only contain positional arguments and
+    optional arguments that take a single value (@arg('name', optional=True)).
+
+    Args:
+        spec (CommandSpec): The command to check
+    """
+    return all(SIMPLE_KWARGS.issuperset(arg.kwarg_names) for arg in spec.args)
+
+
+def parse(spec, args):
+    """Parses the arguments for a simple command.
+
+    Produces the same kwargs that would be retrieved from argparse via
+    CommandSpec.bind. Anything that argparse would treat differently (help,
+    unknown or malformed options, an incorrect number of positional
+    arguments) raises UnsupportedArguments so that argparse can handle it.
+
+    Example:
+
+    .. code-block:: python
+
+        parse(spec, ['value', '--option', 'other'])
+        # {'positional': 'value', 'option': 'other'}
+
+    Args:
+        spec (CommandSpec): The command to parse the arguments for
+        args (list): The arguments following the method name
+
+    Returns:
+        A dict of kwargs to call the command with.
+    """
+    if not is_simple(spec):
+        raise UnsupportedArguments(spec.name)
+    positionals = []
+    options = {}
+    for arg in spec.args:
+        if arg.optional:
+            options[arg.name] = arg
+        else:
+            positionals.append(arg)
+    kwargs = {arg.dest: None for arg in options.values()}
+    values = []
+    args = iter(args)
+    for token in args:
+        if token == END_OF_OPTIONS:
+            values.extend(args)
+            break
+        if not token.startswith('-') or token == '-':
+            values.append(token)
+            continue
+        name, has_value, value = token.partition('=')
+        if name not in options:
+            raise UnsupportedArguments(token)
+        if not has_value:
+            value = next(args, None)
+            if value is None or value.startswith('-'):
+                raise UnsupportedArguments(token)
+        kwargs[options[name].dest] = value
+    if len(values) != len(positionals):
+        raise UnsupportedArguments(values)
+    for arg, value in zip(positionals, values):
+        kwargs[arg.dest] = value
+    return kwargs
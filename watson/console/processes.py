@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from collections.abc import Mapping
+from itertools import cycle
+import os
+import shlex
+from subprocess import DEVNULL, PIPE
+import sys
+import threading
+import time
+from watson.console import colors
+
+
+JOBS = 4
+# the maximum length of a single line of output, longer lines are split
+LINE_LIMIT = 1024 * 1024
+STYLES = (colors.OK_BLUE_STYLE, colors.OK_GREEN_STYLE, colors.WARNING_STYLE,
+          colors.HEADER_STYLE)
+
+
+class Result(object):
+    """The outcome of a single process.
+
+    Attributes:
+        name (string): The name of the process, used to prefix its output
+        args (list): The arguments the process was executed with
+        prefix (string): The (styled) prefix of each line of output
+        returncode (int): The exit code, or None if it could not be started
+        timed_out (boolean): Whether the process was killed after the timeout
+        error (Exception): The error raised when starting the process
+        duration (float): The number of seconds the process took
+    """
+    prefix = ''
+    returncode = None
+    timed_out = False
+    error = None
+    duration = 0.0
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.timed_out
+
+    def summary(self):
+        """A short description of why the process failed.
+        """
+        if self.error:
+            return '{0}: {1}'.format(self.name, self.error)
+        if self.timed_out:
+            return '{0}: timed out after {1:.1f}s'.format(
+                self.name, self.duration)
+        return '{0}: exited with {1}'.format(self.name, self.returncode)
+
+    def __repr__(self):
+        return '<{0} name:{1} returncode:{2}>'.format(
+            self.__class__.__name__, self.name, self.returncode)
+
+
+def _watch_children():
+    # before Python 3.8 the child watcher only reaps processes spawned on the
+    # loop it is attached to, which excludes any created by new_event_loop
+    if sys.version_info < (3, 8) and (
+            threading.current_thread() is threading.main_thread()):
+        asyncio.get_child_watcher().attach_loop(asyncio.get_event_loop())
+
+
+def _invocations(processes):
+    if isinstance(processes, Mapping):
+        processes = processes.items()
+    else:
+        processes = ((None, args) for args in processes)
+    for index, (name, args) in enumerate(processes):
+        if isinstance(args, str):
+            args = shlex.split(args)
+        args = [str(arg) for arg in args]
+        if not name:
+            name = '{0}:{1}'.format(index + 1, os.path.basename(args[0]))
+        yield index, Result(name, args)
+
+
+class Pool(object):
+    """Runs subprocesses on an event loop with bounded concurrency.
+
+    A fixed number of workers take the processes in turn, so no more than
+    `jobs` processes (and no threads) are running at once regardless of how
+    many are specified. Each line of output is passed to `write` as soon as
+    it is read.
+
+    Example:
+
+    .. code-block:: python
+
+        def write(result, line, error):
+            print(result.prefix + line)
+
+        pool = Pool(write, jobs=8, timeout=60)
+        results = await pool.run([['flake8', path] for path in paths])
+
+    Args:
+        write (callable): Called with the Result, line and whether or not the
+            line was written to stderr
+        jobs (int): The maximum number of processes to run at once
+        timeout (float): The number of seconds before a process is killed
+        cwd (string): The working directory of the processes
+        env (dict): The environment of the processes
+    """
+    jobs = JOBS
+    timeout = None
+    cwd = None
+    env = None
+
+    def __init__(self, write, jobs=None, timeout=None, cwd=None, env=None):
+        self.write = write
+        if jobs:
+            self.jobs = jobs
+        if timeout:
+            self.timeout = timeout
+        self.cwd = cwd
+        self.env = env
+        self._styles = cycle(STYLES)
+
+    async def run(self, processes):
+        """Runs the processes.
+
+        Args:
+            processes (iterable): The arguments of each process (as a list or
+                a string to be split), or a dict of arguments keyed by the
+                name of each process
+
+        Returns:
+            A list of the Results, in the order of the processes.
+        """
+        _watch_children()
+        invocations = _invocations(processes)
+        results = {}
+
+        async def worker():
+            # the invocations are shared, so each is only taken by one worker
+            for index, result in invocations:
+                results[index] = await self._run(result)
+
+        await asyncio.gather(*(worker() for _ in range(max(self.jobs, 1))))
+        return [results[index] for index in sorted(results)]
+
+    async def _run(self, result):
+        result.prefix = next(self._styles)('[{0}] '.format(result.name))
+        started = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *result.args, stdin=DEVNULL, stdout=PIPE, stderr=PIPE,
+                cwd=self.cwd, env=self.env, limit=LINE_LIMIT)
+        except OSError as exc:
+            result.error = exc
+            self.write(result, str(exc), True)
+            return result
+        try:
+            await asyncio.wait_for(asyncio.gather(
+                self._stream(result, process.stdout, False),
+                self._stream(result, process.stderr, True),
+                process.wait()), self.timeout)
+        except asyncio.TimeoutError:
+            result.timed_out = True
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+        result.returncode = process.returncode
+        result.duration = time.perf_counter() - started
+        return result
+
+    async def _stream(self, result, stream, error):
+        split = False
+        while True:
+            try:
+                line = await stream.readuntil(b'\n')
+            except asyncio.IncompleteReadError as exc:
+                # the end of the output (which may not end with a newline)
+                if exc.partial:
+                    self._write(result, exc.partial, error)
+                return
+            except asyncio.LimitOverrunError as exc:
+                # the line exceeds the limit, so it is written in parts rather
+                # than being held in memory
+                part = await stream.read(min(exc.consumed, LINE_LIMIT))
+                self._write(result, part, error)
+                split = True
+                continue
+            if not (split and line in (b'\n', b'\r\n')):
+                self._write(result, line, error)
+            split = False
+
+    def _write(self, result, line, error):
+        self.write(result, line.decode('utf-8', 'replace').rstrip('\r\n'),
+                   error)
+
+
+def run(processes, write, jobs=None, timeout=None, cwd=None, env=None):
+    """Runs the processes on a new event loop.
+
+    See Pool for the arguments.
+
+    Returns:
+        A list of the Results, in the order of the processes.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        pool = Pool(write, jobs, timeout, cwd, env)
+        return loop.run_until_complete(pool.run(processes))
+    finally:
+        loop.close()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+import json
+import time
+from watson.console import writer
+from watson.console.table import Column, Table, RIGHT
+
+
+TABLE = 'table'
+JSON = 'json'
+
+
+class _Phase(object):
+    __slots__ = ('profiler', 'key', 'start')
+
+    def __init__(self, profiler, key):
+        self.profiler = profiler
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class _NullPhase(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullProfiler(object):
+    """A profiler that records nothing, used when profiling is disabled.
+    """
+    enabled = False
+
+    def phase(self, name, detail=None):
+        return _NULL_PHASE
+
+    def record(self, key, elapsed):
+        pass
+
+
+class Profiler(NullProfiler):
+    """Records the time spent and number of calls within each phase of a run.
+
+    Example:
+
+    .. code-block:: python
+
+        profiler = Profiler()
+        with profiler.phase('import', 'myapp.commands'):
+            import myapp.commands
+        profiler.write()
+
+    Attributes:
+        phases (OrderedDict): [calls, seconds] keyed by (phase, detail)
+    """
+    enabled = True
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.start = time.perf_counter()
+
+    def phase(self, name, detail=None):
+        """Times a block of code.
+
+        Args:
+            name (string): The name of the phase
+            detail (string): Additional detail, such as the module imported
+        """
+        return _Phase(self, (name, detail))
+
+    def record(self, key, elapsed):
+        stats = self.phases.get(key)
+        if stats is None:
+            self.phases[key] = [1, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def results(self):
+        """The recorded phases, including the total elapsed time.
+
+        Returns:
+            A list of dicts containing the phase, detail, calls and seconds.
+        """
+        results = [{
+            'phase': name,
+            'detail': detail,
+            'calls': calls,
+            'seconds': seconds
+        } for (name, detail), (calls, seconds) in self.phases.items()]
+        results.append({
+            'phase': 'total',
+            'detail': None,
+            'calls': 1,
+            'seconds': time.perf_counter() - self.start
+        })
+        return results
+
+    def report(self, format=TABLE):
+        """Generates a report of the recorded phases.
+
+        Args:
+            format (string): Either table or json
+
+        Returns:
+            A list of lines.
+        """
+        results = self.results()
+        if format == JSON:
+            return [json.dumps(results)]
+        total = results[-1]['seconds'] or 1
+        table = Table([
+            Column('Phase'),
+            Column('Detail'),
+            Column('Calls', align=RIGHT),
+            Column('Time (ms)', align=RIGHT),
+            Column('%', align=RIGHT)
+        ], sample=None)
+        return list(table.render([
+            (result['phase'],
+             result['detail'] or '',
+             result['calls'],
+             '{0:.3f}'.format(result['seconds'] * 1000),
+             '{0:.1f}'.format(result['seconds'] / total * 100))
+            for result in results]))
+
+    def write(self, format=TABLE, out=None):
+        """Writes the report (to stderr by default).
+        """
+        out = out or writer.stderr
+        out.writelines(self.report(format))
+        out.flush()
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+from bisect import insort
+from collections import OrderedDict
+from watson.common.imports import load_definition_from_string
+from watson.console.manifest import describe
+from watson.console.profiling import NULL_PROFILER
+
+
+class Registry(object):
+    """An index of the commands that have been added to a runner.
+
+    Commands are resolved lazily, commands added as a fully qualified name
+    are only imported when they are first required (or when their manifest
+    entry is missing or stale), and each command is only ever resolved once.
+
+    Example:
+
+    .. code-block:: python
+
+        registry = Registry()
+        registry.add('module.commands.ACommand')
+        registry.get('a_command')  # module.commands.ACommand
+        registry.imports  # 1
+
+    Attributes:
+        resolutions (int): The number of fully qualified names that have been
+            resolved to a command name
+        imports (int): The number of commands that have been imported
+    """
+    manifest = None
+    profiler = NULL_PROFILER
+    resolutions = 0
+    imports = 0
+
+    def __init__(self, manifest=None):
+        self.manifest = manifest
+        self._pending = []
+        self._names = []
+        self._definitions = {}
+        self._descriptions = {}
+        self._classes = {}
+        self._commands = None
+
+    def add(self, command):
+        """Adds a new command to the registry.
+
+        Commands that have already been imported are indexed immediately,
+        otherwise they will be indexed the next time the registry is queried.
+
+        Args:
+            command (string|class): the command to add
+        """
+        if isinstance(command, str):
+            self._pending.append(command)
+        else:
+            self._index(command.cased_name(), command)
+            self._classes[command.cased_name()] = command
+
+    @property
+    def names(self):
+        """A sorted list of the names of all the commands.
+        """
+        self._resolve_pending()
+        return self._names
+
+    @property
+    def definitions(self):
+        """A sorted list of the fully qualified names of all the commands.
+
+        The commands are not resolved or imported.
+        """
+        definitions = set(self._pending)
+        for definition in self._definitions.values():
+            if not isinstance(definition, str):
+                definition = '{0}.{1}'.format(
+                    definition.__module__, definition.__qualname__)
+            definitions.add(definition)
+        return sorted(definitions)
+
+    @property
+    def commands(self):
+        """All the commands within the registry, importing them if required.
+
+        Returns:
+            OrderedDict containing all the commands.
+        """
+        self._resolve_pending()
+        if self._commands is None:
+            self._commands = OrderedDict(
+                (name, self.get(name)) for name in self._names)
+        return self._commands
+
+    def get(self, name):
+        """Retrieves a command, importing it if required.
+
+        Args:
+            name (string): The cased name of the command
+
+        Returns:
+            The command class or None if it does not exist.
+        """
+        self._resolve_pending()
+        if name in self._classes:
+            return self._classes[name]
+        if name not in self._definitions:
+            return None
+        command = self._load(self._definitions[name])
+        self._classes[name] = command
+        return command
+
+    def describe(self, name):
+        """Retrieves the description of a command.
+
+        Args:
+            name (string): The cased name of the command
+
+        Returns:
+            The description (see watson.console.manifest.describe) or None if
+            the command does not exist.
+        """
+        self._resolve_pending()
+        if name not in self._descriptions:
+            command = self.get(name)
+            if not command:
+                return None
+            self._descriptions[name] = describe(command)
+        return self._descriptions[name]
+
+    def descriptions(self):
+        """The descriptions of all the commands, sorted by name.
+
+        Returns:
+            OrderedDict containing the descriptions of all the commands.
+        """
+        return OrderedDict(
+            (name, self.describe(name)) for name in self.names)
+
+    def _load(self, definition):
+        if not isinstance(definition, str):
+            return definition
+        self.imports += 1
+        with self.profiler.phase('import', definition.rsplit('.', 1)[0]):
+            return load_definition_from_string(definition)
+
+    def _index(self, name, definition, description=None):
+        if name not in self._definitions:
+            insort(self._names, name)
+        else:
+            self._classes.pop(name, None)
+        self._definitions[name] = definition
+        if description:
+            self._descriptions[name] = description
+        else:
+            self._descriptions.pop(name, None)
+        self._commands = None
+
+    def _resolve_pending(self):
+        if not self._pending:
+            return
+        with self.profiler.phase('resolve'):
+            self._resolve(self._pending)
+
+    def _resolve(self, pending):
+        self._pending = []
+        for definition in pending:
+            self.resolutions += 1
+            description = None
+            if self.manifest:
+                description = self.manifest.get(definition)
+            if description:
+                self._index(description['name'], definition, description)
+                continue
+            command = self._load(definition)
+            if self.manifest:
+                description = self.manifest.update(definition, command)
+            self._index(command.cased_name(), definition, description)
+            self._classes[command.cased_name()] = command
+        if self.manifest:
+            self.manifest.save()
+
+    def __contains__(self, name):
+        self._resolve_pending()
+        return name in self._definitions
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
@@ -1,15 +1,32 @@
 # -*- coding: utf-8 -*-
-import argparse
-from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+import hashlib
+import inspect
 import os
 import re
+import shlex
 import sys
-from watson.common.imports import load_definition_from_string
+import traceback
 from watson.common.contextmanagers import suppress
-from watson.console import colors, styles
+from watson.console import (cache, colors, completion, inputs, output,
+                            parallel, parsing, styles, watch, writer)
+from watson.console.exceptions import ConsoleError
+from watson.console.manifest import Manifest
+from watson.console.profiling import NULL_PROFILER, Profiler, TABLE
+from watson.console.registry import Registry
+from watson.console.table import Column, Table
 
 
 USAGE_REGEX = re.compile(r'(\w+[\:])(.+?(?=\[))(.*)')
+HELP_ARGS = frozenset(('-h', '--help'))
+STDIN = '-'
+BLOCKING_OPTIONS = ('--batch', '--serve', '--watch')
+PRE_EXECUTE = 'pre_execute'
+POST_EXECUTE = 'post_execute'
+NAMESPACE_STYLE = colors.FAIL_STYLE + styles.BOLD
+COMMANDS_TABLE = Table([Column(style=styles.BOLD), Column()],
+                       separator='\t', indent='    ')
 
 
 class Runner(object):
@@ -18,6 +35,49 @@ class Runner(object):
 
     Commands can be added either as a fully qualified name, or imported.
 
+    If a manifest is specified then the descriptions of any commands added as
+    a fully qualified name will be cached on disk, and only the command that
+    is being executed will be imported.
+
+    When a namespace and method are specified (and help has not been
+    requested) only the parser for that method will be built, this can be
+    disabled by setting `targeted` to False.
+
+    Setting `fast_path` to True will parse the arguments of simple commands
+    (those that only contain positional arguments and options that take a
+    single value) without argparse, falling back to argparse when required.
+
+    Multiple commands can be executed within the same process by passing a
+    file containing one command per line via `script.py --batch FILE` (stdin
+    is read if no file or - is specified).
+
+    To avoid the cost of importing the commands on every invocation, the runner
+    can be kept in memory via `script.py --serve SOCKET [--idle-timeout SECONDS]`
+    and commands forwarded to it via the client in watson.console.daemon.
+
+    A command can be re-executed whenever files change via
+    `script.py --watch PATHS ...` (a comma separated list of files and
+    directories), which polls the paths and keeps the commands in memory.
+
+    The time spent resolving, importing, parsing and executing the command can
+    be output to stderr via `script.py --profile-startup[=json] ...`.
+
+    Shell completion can be enabled via `eval "$(script.py --completion bash)"`
+    (or zsh/fish), completions are answered from an index of the commands
+    stored at `completion_index` (alongside the manifest by default) which is
+    rebuilt whenever a command module changes.
+
+    The results of commands decorated with `cached` are stored within
+    `cache_directory` (alongside the manifest by default).
+
+    Commands (and errors) can be output as JSON lines rather than text via
+    `script.py --output jsonl ...` or by setting `output_format`, in which
+    case colors are disabled.
+
+    Colors and styles are only output when stdout is a terminal and the
+    NO_COLOR environment variable is not set, unless `color` is set to True
+    or False.
+
     Example:
 
     .. code-block:: python
@@ -26,10 +86,33 @@ class Runner(object):
         runner()
     """
     _name = None
-    _commands = None
+    _loop = None
+    _parsers = None
+    registry = None
+    targeted = True
+    fast_path = False
+    color = None
+    profiler = NULL_PROFILER
+    completion_index = None
+    cache_directory = None
+    output_format = None
+    options = {
+        '--batch': True,
+        '--serve': True,
+        '--idle-timeout': True,
+        '--profile-startup': False,
+        '--completion': True,
+        '--complete': False,
+        '--output': True,
+        '--watch': True
+    }
 
-    def __init__(self, commands=None):
-        self._commands = []
+    def __init__(self, commands=None, manifest=None):
+        if isinstance(manifest, str):
+            manifest = Manifest(manifest)
+        self.registry = Registry(manifest)
+        self._parsers = {}
+        self.hooks = {PRE_EXECUTE: [], POST_EXECUTE: []}
         if commands:
             self.add_commands(commands)
 
@@ -39,6 +122,12 @@ class Runner(object):
         """
         return self._name
 
+    @property
+    def manifest(self):
+        """The manifest used to cache the command descriptions (if any).
+        """
+        return self.registry.manifest
+
     @property
     def commands(self):
         """A list of all commands added to the runner.
@@ -46,12 +135,7 @@ class Runner(object):
         Returns:
             OrderedDict containing all the commands.
         """
-        commands = {}
-        for command in self._commands:
-            if isinstance(command, str):
-                command = load_definition_from_string(command)
-            commands[command.cased_name()] = command
-        return OrderedDict(sorted(commands.items()))
+        return self.registry.commands
 
     def add_command(self, command):
         """Convenience method to add new commands after the runner has been
@@ -60,7 +144,8 @@ class Runner(object):
         Args:
             command (string|class): the command to add
         """
-        self._commands.append(command)
+        self.registry.add(command)
+        self._parsers.clear()
 
     def add_commands(self, commands):
         """Convenience method to add multiple commands.
@@ -71,34 +156,47 @@ class Runner(object):
         for command in commands:
             self.add_command(command)
 
+    def describe_commands(self):
+        """Describes all the commands added to the runner.
+
+        Commands added as a fully qualified name will only be imported if
+        their entry within the manifest is missing or stale.
+
+        Returns:
+            OrderedDict containing the descriptions of all the commands.
+        """
+        return self.registry.descriptions()
+
     def get_command(self, command_name):
         """Returns an initialized command from the attached commands.
 
         Args:
             command_name: The command name to retrieve
         """
-        if command_name not in self.commands:
+        command = self.registry.get(command_name)
+        if not command:
             return None
-        return self.commands[command_name]()
+        return command()
 
     def update_usage(self, parser, namespace, is_subparser=False):
         """Updates the usage for the relevant parser.
 
         Forces the usage message to include the namespace and color.
         """
-        usage = parser.format_usage()
-        r = USAGE_REGEX.search(usage)
-        if not r:
-            return
-        parts = [s for s in r.groups()]
-        if namespace:
-            if is_subparser:
-                method_part = parts[1].split(' ')
-                method_part.insert(-2, namespace)
-                parts[1] = ' '.join(method_part)
-            else:
-                parts.insert(2, '{} '.format(namespace))
-        parser.usage = colors.header(''.join(parts[1:]).strip())
+        with self.profiler.phase('update_usage'):
+            usage = parser.format_usage()
+            r = USAGE_REGEX.search(usage)
+            if not r:
+                return
+            parts = [s for s in r.groups()]
+            if namespace:
+                if is_subparser:
+                    method_part = parts[1].split(' ')
+                    method_part.insert(-2, namespace)
+                    parts[1] = ' '.join(method_part)
+                else:
+                    parts.insert(2, '{} '.format(namespace))
+            parser.usage = _HeaderUsage(''.join(parts[1:]).strip())
 
     def attach_commands(self, parser, namespace):
         """Register the commands against the parser.
@@ -108,71 +206,618 @@ class Runner(object):
             namespace: The namespace the commands should sit within
         """
         subparsers = parser.add_subparsers()
+        command_class = self.get_command(namespace) if namespace else None
+        if command_class:
+            # when viewing a command
+            for spec in command_class.__commands__.values():
+                self._add_method_parser(subparsers, command_class, namespace, spec)
+            parser.description = command_class.help()
+            self.update_usage(parser, namespace)
+            return
         namespaces = {}
-        for command_class in self.commands:
-            command_class = self.get_command(command_class)
-            command_namespace = command_class.cased_name()
-            if command_namespace not in namespaces:
-                namespaces[command_namespace] = []
-            command_help = command_class.help()
-            # if namespace in self.commands:
-            methods = [cmethod for cmethod in dir(command_class)
-                       if hasattr(getattr(command_class, cmethod), 'is_cli_command')]
-            for a_command in methods:
-                command = getattr(command_class, a_command)
-                namespaces[command_namespace].append((a_command, command.__func_doc__))
-                if command_namespace == namespace:
-                    subparser = subparsers.add_parser(
-                        a_command,
-                        help=command.__func_doc__,
-                        description=command.__desc__)
-                    for arg, kwargs in command.__args__:
-                        subparser.add_argument(arg, **kwargs)
-                    subparser.set_defaults(
-                        command=(
-                            command_class,
-                            a_command,
-                            command.__args_mapping__))
-                    self.update_usage(
-                        subparser, namespace, is_subparser=True)
-            if command_namespace == namespace:
-                # when viewing a command
-                parser.description = command_help
-                self.update_usage(parser, namespace)
-                return
+        for command_namespace, description in self.describe_commands().items():
+            namespaces[command_namespace] = [
+                (a_command, method['help'])
+                for a_command, method in description['methods'].items()]
             if not namespace:
                 # when viewing the namespaces
                 subparsers.add_parser(
                     command_namespace,
-                    description=command_help,
-                    help=command_help)
-        self.update_usage(parser, namespace)
-        if not namespace or namespace not in namespaces:
-            # Override the default output from argparse to display all the
-            # namespaces and their commands.
-            parser.print_usage()
-            self.write()
-            longest_namespace = max(namespaces, key=len)
-            length = len(longest_namespace)
-            for namespace in sorted(namespaces):
-                commands = namespaces[namespace]
-                self.write(colors.fail(styles.bold(namespace.ljust(length))))
-                longest_command = max([command[0] for command in commands], key=len)
-                longest_command_length = len(longest_command)
-                for command, help in sorted(commands):
-                    command = styles.bold(command.ljust(longest_command_length))
-                    self.write('    {}\t{}'.format(command, help))
-                self.write()
+                    description=description['help'],
+                    help=description['help'])
+        if output.current() == output.JSONL:
+            writer.stdout.writelines(output.encode_many(
+                {'namespace': command_namespace, 'command': a_command,
+                 'help': help}
+                for command_namespace in sorted(namespaces)
+                for a_command, help in sorted(namespaces[command_namespace])))
             sys.exit(0)
+        self.update_usage(parser, namespace)
+        # Override the default output from argparse to display all the
+        # namespaces and their commands.
+        parser.print_usage()
+        lines = ['']
+        longest_namespace = max(namespaces, key=len)
+        length = len(longest_namespace)
+        for namespace in sorted(namespaces):
+            commands = namespaces[namespace]
+            lines.append(NAMESPACE_STYLE(namespace.ljust(length)))
+            lines.extend(COMMANDS_TABLE.render(sorted(commands)))
+            lines.append('')
+        self.writelines(lines)
+        sys.exit(0)
+
+    def attach_command(self, parser, namespace, method):
+        """Register a single method of a command against the parser.
+
+        Unlike attach_commands, only the command that is being executed is
+        initialized and only the parser for the requested method is built.
+
+        Args:
+            parser: The parser to add the command to
+            namespace: The namespace the command sits within
+            method: The name of the method to be executed
+
+        Returns:
+            Boolean whether or not the method could be attached.
+        """
+        command_class = self.get_command(namespace)
+        if not command_class:
+            return False
+        spec = command_class.__commands__.get(method)
+        if not spec:
+            return False
+        subparsers = parser.add_subparsers()
+        self._add_method_parser(subparsers, command_class, namespace, spec)
+        parser.description = command_class.help()
+        self.update_usage(parser, namespace)
+        return True
+
+    def _add_method_parser(self, subparsers, command_class, namespace, spec):
+        subparser = subparsers.add_parser(
+            spec.name,
+            help=spec.help,
+            description=spec.description)
+        for arg in spec.args:
+            subparser.add_argument(arg.name, **arg.kwargs)
+        # the parser may be reused, so the command is initialized each time
+        # it is executed (see _prepare)
+        subparser.set_defaults(command=(namespace, spec))
+        self.update_usage(subparser, namespace, is_subparser=True)
+        return subparser
 
     def write(self, message=''):
-        sys.stdout.write(message + '\n')
+        writer.stdout.write(message)
+
+    def writelines(self, messages):
+        writer.stdout.writelines(messages)
 
     def execute(self, args):
         """Execute the runner and any commands the user has specified.
+
+        Commands defined as coroutines are run on the runner's event loop, and
+        any lines yielded by commands defined as generators are streamed to
+        stdout.
+        """
+        if not args:
+            args = sys.argv[:]
+        options = self._pop_options(args)
+        with self._formatted(options.get('--output')):
+            if '--profile-startup' in options:
+                with self._profiled(options['--profile-startup']):
+                    return self.execute(args)
+            handler = self._option_handler(args, options)
+            if handler:
+                return handler()
+            with self._colored():
+                return self._execute(args)
+
+    def _option_handler(self, args, options):
+        """Retrieves the function that handles the runner options (if any).
+        """
+        if '--batch' in options:
+            return partial(self._execute_batch, args[0], options['--batch'])
+        if '--serve' in options:
+            return partial(self._serve, options)
+        if '--completion' in options:
+            return partial(self._completion, args[0], options['--completion'])
+        if '--complete' in options:
+            return partial(self._complete, args[0], args[1:])
+        if '--watch' in options:
+            return partial(self._watch, args, options['--watch'])
+        return None
+
+    def _execute(self, args):
+        try:
+            command = self._prepare(args)
+            if not command:
+                return
+            instance, spec, kwargs = command
+            try:
+                with self._invoke(instance, spec, kwargs) as invocation:
+                    result = self._call(instance, spec, kwargs)
+                    if inspect.isawaitable(result):
+                        result = self.loop.run_until_complete(result)
+                    elif inspect.isasyncgen(result):
+                        result = self.loop.run_until_complete(
+                            self.stream_async(result))
+                    elif inspect.isgenerator(result):
+                        result = self.stream(result)
+                    invocation.result = result
+                return result
+            except ConsoleError as exc:
+                self._handle_exc(exc)
+        finally:
+            writer.flush()
+
+    async def execute_async(self, args):
+        """Execute the runner from within an already running event loop.
+
+        Example:
+
+        .. code-block:: python
+
+            await runner.execute_async(['script.py', 'namespace', 'command'])
+
+        The same runner options as execute are supported, other than those
+        that execute multiple commands (--batch, --serve and --watch) which
+        cannot run within an event loop.
         """
         if not args:
             args = sys.argv[:]
+        options = self._pop_options(args)
+        with self._formatted(options.get('--output')):
+            if '--profile-startup' in options:
+                with self._profiled(options['--profile-startup']):
+                    return await self.execute_async(args)
+            for option in BLOCKING_OPTIONS:
+                if option in options:
+                    self._handle_exc(ConsoleError(
+                        '{0} cannot be used within an event loop'.format(
+                            option)))
+            handler = self._option_handler(args, options)
+            if handler:
+                return handler()
+            with self._colored():
+                return await self._execute_async(args)
+
+    async def _execute_async(self, args):
+        try:
+            command = self._prepare(args)
+            if not command:
+                return
+            instance, spec, kwargs = command
+            try:
+                with self._invoke(instance, spec, kwargs) as invocation:
+                    result = self._call(instance, spec, kwargs)
+                    if inspect.isawaitable(result):
+                        result = await result
+                    elif inspect.isasyncgen(result):
+                        result = await self.stream_async(result)
+                    elif inspect.isgenerator(result):
+                        result = self.stream(result)
+                    invocation.result = result
+                return result
+            except ConsoleError as exc:
+                self._handle_exc(exc)
+        finally:
+            writer.flush()
+
+    def add_hook(self, event, callback):
+        """Registers a callback to be called around the execution of commands.
+
+        The callback will be passed the Invocation of the command. Pre execute
+        hooks are called after the arguments have been parsed, and post
+        execute hooks are called once the command has finished (regardless of
+        whether or not it was successful).
+
+        Example:
+
+        .. code-block:: python
+
+            def log(invocation):
+                print(invocation.namespace, invocation.method, invocation.status)
+            runner.add_hook(POST_EXECUTE, log)
+
+        Args:
+            event (string): Either pre_execute or post_execute
+            callback (callable): The callback to call
+        """
+        if event not in self.hooks:
+            raise ValueError('Invalid hook {0}'.format(event))
+        self.hooks[event].append(callback)
+
+    @contextmanager
+    def _invoke(self, instance, spec, kwargs):
+        invocation = Invocation(instance.cased_name(), spec.name, kwargs)
+        for hook in self.hooks[PRE_EXECUTE]:
+            hook(invocation)
+        try:
+            with self.profiler.phase('command', spec.name):
+                yield invocation
+        except SystemExit as exc:
+            invocation.exception = exc
+            invocation.status = exc.code if isinstance(exc.code, int) else 1
+            raise
+        except BaseException as exc:
+            invocation.exception = exc
+            invocation.status = 1
+            raise
+        finally:
+            inputs.close_all(kwargs.values())
+            for hook in self.hooks[POST_EXECUTE]:
+                hook(invocation)
+
+    def _call(self, instance, spec, kwargs):
+        if spec.cache:
+            kwargs = dict(kwargs)
+            if not kwargs.pop('no_cache', False):
+                return self._cached(instance, spec, kwargs)
+        if spec.parallel:
+            return self.fan_out(instance, spec, kwargs)
+        return getattr(instance, spec.name)(**kwargs)
+
+    def _cached(self, instance, spec, kwargs):
+        namespace = instance.cased_name()
+        ttl, max_size = spec.cache
+        directory = os.path.join(
+            self.cache_directory or self._cache_path(sys.argv[0], 'results'),
+            '{0}.{1}'.format(namespace, spec.name))
+        results = cache.Cache(directory, ttl, max_size)
+        keyed = kwargs
+        if spec.parallel:
+            # the number of jobs doesn't change the result
+            keyed = dict(kwargs)
+            keyed.pop('jobs', None)
+        key = results.key(namespace, spec.name, keyed, output.current(),
+                          styles.enabled())
+        if key is None:
+            return self._call(instance, spec._replace(cache=None), kwargs)
+        entry = results.get(key)
+        if entry:
+            result, lines = entry
+            cache.replay(lines)
+            return result
+        recorder = cache.Recorder()
+        with recorder.task():
+            result = self._call(instance, spec._replace(cache=None), kwargs)
+        results.set(key, result, recorder.lines)
+        return result
+
+    def fan_out(self, instance, spec, kwargs):
+        """Calls a parallel command for each of its items.
+
+        The results are written to stdout (or the current task, see
+        watson.console.writer.current) as they are collected, and any failed
+        items are written to stderr once every item has been processed. When
+        the items are processed by threads, anything the command writes is
+        routed through a Multiplexer and prefixed with the item.
+
+        Args:
+            instance (watson.console.command.Base): The command
+            spec (CommandSpec): The spec of the method (see decorators.parallel)
+            kwargs (dict): The parsed arguments, including the items and jobs
+
+        Returns:
+            A list of the results of the successful items.
+
+        Raises:
+            ConsoleError if any of the items failed.
+        """
+        name, executor, ordered = spec.parallel
+        kwargs = dict(kwargs)
+        jobs = kwargs.pop('jobs', 1)
+        items = kwargs.pop(name)
+        func = parallel.bind(getattr(instance, spec.name), name, kwargs)
+        multiplexer = None
+        if executor == parallel.THREAD and parallel.workers(jobs) > 1:
+            # prefix any output written by the items with the item itself
+            multiplexer = writer.Multiplexer().start()
+            func = _routed(func, multiplexer)
+        elif executor == parallel.PROCESS:
+            # workers exit without flushing, and inherit anything buffered
+            writer.flush()
+            func = partial(_flushed, func)
+        out = multiplexer or writer.current() or writer.stdout
+        format = output.formatter()
+        results, failures, total = [], [], 0
+        try:
+            for item, result, exc in parallel.imap(
+                    func, items, jobs, executor, ordered):
+                total += 1
+                if exc:
+                    failures.append((item, exc))
+                    continue
+                results.append(result)
+                if result is not None:
+                    out.write(format(result))
+        finally:
+            if multiplexer:
+                multiplexer.close()
+        writer.stdout.flush()
+        if failures:
+            if output.current() == output.JSONL:
+                writer.stderr.writelines(output.encode_many(
+                    dict(output.error(exc), item=item)
+                    for item, exc in failures))
+            else:
+                writer.stderr.writelines(
+                    colors.fail('{0}: {1}'.format(item, str(exc).strip("'")))
+                    for item, exc in failures)
+            raise ConsoleError('{0} of {1} items failed'.format(
+                len(failures), total))
+        return results
+
+    def stream(self, records):
+        """Writes each record to stdout as it is produced.
+
+        Output is flushed according to the stdout writer, so memory remains
+        bounded regardless of the number of records. If stdout is closed
+        (for example when piped to `head`) the records are closed and any
+        further output is discarded.
+
+        Args:
+            records (iterable): The records to write
+        """
+        out = writer.stdout
+        format = output.formatter()
+        try:
+            try:
+                for record in records:
+                    out.write(format(record))
+            finally:
+                if hasattr(records, 'close'):
+                    records.close()
+            out.flush()
+        except BrokenPipeError:
+            self._discard_stdout()
+
+    async def stream_async(self, records):
+        """Writes each record to stdout as it is produced.
+
+        See Runner.stream.
+
+        Args:
+            records (async iterable): The records to write
+        """
+        out = writer.stdout
+        format = output.formatter()
+        try:
+            try:
+                async for record in records:
+                    out.write(format(record))
+            finally:
+                if hasattr(records, 'aclose'):
+                    await records.aclose()
+            out.flush()
+        except BrokenPipeError:
+            self._discard_stdout()
+
+    def _discard_stdout(self):
+        # Redirect stdout to devnull to prevent any further errors when the
+        # interpreter flushes it on exit.
+        writer.stdout.discard()
+        with suppress(Exception):
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            os.close(devnull)
+
+    def batch(self, lines, name=None):
+        """Executes multiple commands within the same process.
+
+        Each line is parsed and executed as though it had been passed on the
+        command line, reusing any commands and parsers that have already been
+        loaded. Any exits (from help or errors) only end the current line, and
+        the exit status of each line is written to stderr.
+
+        Example:
+
+        .. code-block:: python
+
+            runner.batch(['namespace command --option value',
+                          'namespace another'])  # [0, 0]
+
+        Args:
+            lines (iterable): The commands to execute
+            name (string): The name of the script
+
+        Returns:
+            A list containing the exit status of each command.
+        """
+        name = name or self._name or 'console'
+        statuses = []
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                args = shlex.split(line)
+            except ValueError as exc:
+                writer.stderr.write('Error: {0}'.format(exc))
+                status = 2
+            else:
+                status = self._execute_line([name] + args)
+            statuses.append(status)
+            writer.stderr.write('{0}\t{1}\t{2}'.format(number, status, line))
+        return statuses
+
+    def watch(self, args, paths, runs=None):
+        """Executes a command and re-executes it whenever the paths change.
+
+        The runner and its commands remain in memory between each execution.
+        Changes made while the command is executing are coalesced into a
+        single execution once it has finished.
+
+        Example:
+
+        .. code-block:: python
+
+            runner.watch(['script.py', 'namespace', 'command'], ['src'])
+
+        Args:
+            args (list): The arguments to execute, including the script
+            paths (list): The files and directories to watch
+            runs (int): The maximum number of executions, or None to watch
+                until interrupted
+
+        Returns:
+            A list of the exit status of each execution.
+        """
+        watcher = watch.Watcher(paths)
+        statuses = []
+        index = watcher.snapshot()
+        while True:
+            statuses.append(self._execute_line(list(args)))
+            if runs is not None and len(statuses) >= runs:
+                return statuses
+            # compare against the index from before the execution so that any
+            # changes made during it trigger the next execution
+            _, index = watcher.wait(index)
+
+    def _watch(self, args, paths):
+        if paths is True:
+            self._handle_exc(ConsoleError('No paths specified to watch'))
+        try:
+            return self.watch(args, [path for path in paths.split(',') if path])
+        except KeyboardInterrupt:
+            writer.flush()
+
+    def _execute_line(self, args):
+        try:
+            self.execute(args)
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                return exc.code or 0
+            writer.stderr.write(exc.code)
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+        return 0
+
+    def _execute_batch(self, script, path):
+        if path is True or path == STDIN:
+            statuses = self.batch(sys.stdin, script)
+        else:
+            with open(path) as f:
+                statuses = self.batch(f, script)
+        if any(statuses):
+            sys.exit(1)
+        return statuses
+
+    @contextmanager
+    def _profiled(self, format):
+        previous = self.profiler
+        self.profiler = self.registry.profiler = Profiler()
+        try:
+            yield
+        finally:
+            profiler, self.profiler = self.profiler, previous
+            self.registry.profiler = previous
+            # the report is written to stderr, which may not be a terminal
+            with self._colored(sys.stderr):
+                profiler.write(TABLE if format is True else format)
+
+    def _completion(self, script, shell):
+        try:
+            self.write(completion.script(shell, os.path.basename(script)))
+        except ValueError as exc:
+            self._handle_exc(ConsoleError(str(exc)))
+        writer.stdout.flush()
+
+    def _complete(self, script, words):
+        if words and words[0] == '--':
+            words = words[1:]
+        path = self.completion_index or self._completion_path(script)
+        index = completion.Index(path).get(self.registry)
+        candidates = completion.complete(index, words, self.options)
+        self.writelines(candidates)
+        writer.stdout.flush()
+        return candidates
+
+    def _completion_path(self, script):
+        return self._cache_path(script, 'completion.json')
+
+    def _cache_path(self, script, suffix):
+        if self.manifest:
+            return '{0}.{1}'.format(
+                os.path.splitext(self.manifest.path)[0], suffix)
+        script = os.path.abspath(script)
+        directory = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+            os.path.expanduser('~'), '.cache')
+        return os.path.join(directory, 'watson-console', '{0}-{1}.{2}'.format(
+            os.path.basename(script),
+            hashlib.sha1(script.encode('utf-8')).hexdigest()[:12], suffix))
+
+    def _formatted(self, format=None):
+        format = format or self.output_format or output.current()
+        if format not in output.FORMATS:
+            self._handle_exc(ConsoleError(
+                'Invalid output {0}, must be one of {1}'.format(
+                    format, ', '.join(output.FORMATS))))
+        return output.formatted(format)
+
+    def _colored(self, stream=None):
+        color = self.color
+        if output.current() == output.JSONL:
+            color = False
+        elif color is None:
+            color = styles.detect(stream)
+        return styles.colored(color)
+
+    def _serve(self, options):
+        from watson.console.daemon import Server
+        idle_timeout = options.get('--idle-timeout')
+        server = Server(self, options['--serve'],
+                        idle_timeout=float(idle_timeout) if idle_timeout else None)
+        server.serve_forever()
+
+    def _pop_options(self, args):
+        """Removes any runner options that precede the namespace.
+
+        Returns:
+            A dict of option values keyed by the option name.
+        """
+        options = {}
+        while len(args) > 1 and args[1].startswith('--'):
+            option, has_value, value = args[1].partition('=')
+            if option not in self.options:
+                break
+            del args[1]
+            if not has_value:
+                value = True
+                if self.options[option] and len(args) > 1:
+                    value = args.pop(1)
+            options[option] = value
+        return options
+
+    @property
+    def loop(self):
+        """The event loop that coroutine commands are run on.
+
+        The same loop is reused for every command executed by the runner until
+        the runner is closed.
+        """
+        if not self._loop or self._loop.is_closed():
+            import asyncio
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def close(self):
+        """Closes the event loop used to run coroutine commands.
+        """
+        if self._loop and not self._loop.is_closed():
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+        self._loop = None
+
+    def _prepare(self, args):
+        """Parses the arguments and determines the command to execute.
+
+        Returns:
+            A tuple containing the command, spec and kwargs or None if there is
+            nothing to execute.
+        """
         self._name = os.path.basename(args.pop(0))
         execute = True
         help = '-h'
@@ -191,27 +836,75 @@ class Runner(object):
         if namespace == help:
             namespace = None
 
-        # Add the relevant commands
-        parser = argparse.ArgumentParser()
+        help_requested = HELP_ARGS.intersection(args)
+        targeted = self.targeted and execute and not help_requested
+        if targeted and self.fast_path:
+            command = self._parse_fast(namespace, method, args[1:])
+            if command:
+                return command
+
+        # Add the relevant commands, the full tree is only required for help
         try:
-            self.attach_commands(parser, namespace)
+            parser = None
+            if targeted:
+                parser = self._get_parser(namespace, method)
+            if not parser:
+                parser = _argument_parser()
+                with self.profiler.phase('attach_commands'):
+                    self.attach_commands(parser, namespace)
         except ConsoleError as exc:
             self._handle_exc(exc)
 
         # Parse the input
-        parsed_args = parser.parse_args(args)
-        if execute:
-            instance, method, args = parsed_args.command
-            try:
-                kwargs = {arg_name: getattr(parsed_args, arg_name)
-                          for attr, arg_name in args.items()}
-                return getattr(instance, method)(**kwargs)
-            except ConsoleError as exc:
-                self._handle_exc(exc)
+        with self.profiler.phase('parse'):
+            parsed_args = parser.parse_args(args)
+        if not execute:
+            return None
+        namespace, spec = parsed_args.command
+        return self.get_command(namespace), spec, spec.bind(parsed_args)
+
+    def _get_parser(self, namespace, method):
+        """Retrieves the parser for a single method, building it if required.
+
+        Returns:
+            The parser or None if the method does not exist.
+        """
+        key = (namespace, method)
+        if key not in self._parsers:
+            parser = _argument_parser()
+            with self.profiler.phase('attach_command'):
+                attached = self.attach_command(parser, namespace, method)
+            if not attached:
+                return None
+            self._parsers[key] = parser
+        return self._parsers[key]
+
+    def _parse_fast(self, namespace, method, args):
+        """Parses the arguments for a simple command without argparse.
+
+        Returns:
+            A tuple containing the command, spec and kwargs or None if the
+            arguments must be parsed by argparse.
+        """
+        command_class = self.get_command(namespace)
+        if not command_class:
+            return None
+        spec = command_class.__commands__.get(method)
+        if not spec:
+            return None
+        try:
+            with self.profiler.phase('parse_fast'):
+                return command_class, spec, parsing.parse(spec, args)
+        except parsing.UnsupportedArguments:
+            return None
 
     def _handle_exc(self, exc):
-        exc_msg = str(exc).strip("'")
-        sys.stderr.write(colors.fail('Error: {0}\n'.format(exc_msg)))
+        writer.stdout.flush()
+        if output.current() == output.JSONL:
+            writer.stderr.write(output.encode(output.error(exc)))
+        else:
+            exc_msg = str(exc).strip("'")
+            writer.stderr.write(colors.fail('Error: {0}'.format(exc_msg)))
         sys.exit(1)
 
     def __call__(self, args=None):
@@ -219,6 +912,55 @@ class Runner(object):
         return self.execute(args)
 
 
-class ConsoleError(KeyError):
-    """An error that should be raised from within the command.
+def _argument_parser():
+    # argparse is only imported when a parser is required, which allows the
+    # fast path (and completion) to avoid it entirely
+    import argparse
+    return argparse.ArgumentParser()
+
+
+class _HeaderUsage(str):
+    """A usage that is styled when the parser formats it.
+
+    Parsers are cached and reused (including by the server), so the usage is
+    styled according to whether colors are enabled at the time it is output
+    rather than when the parser was built.
     """
+
+    def __mod__(self, values):
+        return colors.header(str.__mod__(self, values))
+
+
+def _flushed(func, item):
+    try:
+        return func(item)
+    finally:
+        writer.flush()
+
+
+def _routed(func, multiplexer):
+    def routed(item):
+        with multiplexer.task('[{0}] '.format(item)):
+            return func(item)
+    return routed
+
+
+class Invocation(object):
+    """The execution of a single command, passed to the runner's hooks.
+
+    Attributes:
+        namespace (string): The namespace of the command
+        method (string): The method that was executed
+        kwargs (dict): The kwargs the method was called with
+        result: The value returned from the method
+        exception (Exception): The exception raised by the method (if any)
+        status (int): The exit status of the command
+    """
+    result = None
+    exception = None
+    status = 0
+
+    def __init__(self, namespace, method, kwargs):
+        self.namespace = namespace
+        self.method = method
+        self.kwargs = kwargs
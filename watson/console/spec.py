@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+from functools import lru_cache
+import inspect
+import re
+
+
+DOC_PATTERN = r'(?P<arg>\w+)(.*?)[\:]\ (?P<help>.*)'
+SERIALIZABLE_TYPES = (str, int, float, bool, type(None))
+CACHE_TTL = 3600
+CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def doc_regex():
+    """The compiled DOC_PATTERN, compiled the first time it is required.
+    """
+    return re.compile(DOC_PATTERN, re.MULTILINE)
+
+
+def parse_docstring(doc, help=None):
+    """Parses the docstring of a command method.
+
+    Args:
+        doc (string): The docstring to parse
+        help (string): Overrides the one line help from the docstring
+
+    Returns:
+        A tuple containing the one line help, the description and a dict of
+        the help for each argument defined in the Args: section.
+    """
+    doc = doc or 'Missing doc.'
+    lines = doc.splitlines()
+    help = help if help is not None else lines[0]
+    description = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith('Args:'):
+            break
+        description.append(line)
+    description = '\n'.join(description) if description else help
+    arg_help = {k: v for k, t, v in doc_regex().findall(doc)}
+    return help, description, arg_help
+
+
+def _serializable(kwargs):
+    """Strips any argparse kwargs that cannot be stored as JSON.
+    """
+    serializable = {}
+    for key, value in kwargs.items():
+        if isinstance(value, (list, tuple)):
+            if all(isinstance(item, SERIALIZABLE_TYPES) for item in value):
+                serializable[key] = list(value)
+        elif isinstance(value, SERIALIZABLE_TYPES):
+            serializable[key] = value
+    return serializable
+
+
+class Docstring(object):
+    """The docstring of a command method, parsed when it is first required.
+
+    A single Docstring is shared by the CommandSpec of a method and each of
+    its ArgSpecs, so the docstring is parsed at most once per method, and not
+    at all unless help is displayed or the command is described.
+
+    Args:
+        doc (string): The docstring
+        help (string): Overrides the one line help from the docstring
+    """
+    __slots__ = ('doc', 'help_override', '_parsed')
+
+    def __init__(self, doc, help=None):
+        self.doc = doc
+        self.help_override = help
+        self._parsed = None
+
+    @property
+    def parsed(self):
+        """The help, description and arg help (see parse_docstring).
+        """
+        if self._parsed is None:
+            self._parsed = parse_docstring(self.doc, self.help_override)
+        return self._parsed
+
+    @property
+    def help(self):
+        return self.parsed[0]
+
+    @property
+    def description(self):
+        return self.parsed[1]
+
+    @property
+    def arg_help(self):
+        return self.parsed[2]
+
+    def __eq__(self, other):
+        if not isinstance(other, Docstring):
+            return NotImplemented
+        return (self.doc, self.help_override) == (other.doc, other.help_override)
+
+    def __hash__(self):
+        return hash((self.doc, self.help_override))
+
+
+class _Immutable(object):
+    __slots__ = ()
+    _fields = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            '{} is immutable'.format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            '{} is immutable'.format(self.__class__.__name__))
+
+    def _set(self, **attrs):
+        for name, value in attrs.items():
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr)
+                   for attr in self._fields)
+
+    def __hash__(self):
+        return hash(tuple(repr(getattr(self, attr))
+                          for attr in self._fields))
+
+
+class ArgSpec(_Immutable):
+    """An argument that will be passed to a command.
+
+    Attributes:
+        name (string): The name of the argument (prefixed with -- if optional)
+        dest (string): The name of the keyword argument passed to the command
+        kwargs (dict): The kwargs passed to argparse's add_argument, if no
+            help is specified it is retrieved from the docstring
+        docstring (Docstring): The docstring of the method
+    """
+    __slots__ = ('name', 'dest', '_kwargs', 'docstring')
+    _fields = ('name', 'dest', 'kwargs')
+
+    def __init__(self, name, dest=None, kwargs=None, docstring=None):
+        self._set(name=name, dest=dest or name.lstrip('-'),
+                  _kwargs=tuple((kwargs or {}).items()),
+                  docstring=docstring)
+
+    @property
+    def kwargs(self):
+        kwargs = dict(self._kwargs)
+        if 'help' not in kwargs and self.docstring:
+            kwargs['help'] = self.docstring.arg_help.get(self.dest, '')
+        return kwargs
+
+    @property
+    def kwarg_names(self):
+        """The names of the kwargs, without parsing the docstring.
+        """
+        names = {key for key, _ in self._kwargs}
+        if self.docstring:
+            names.add('help')
+        return names
+
+    def with_kwargs(self, **kwargs):
+        """Creates a new argument with additional kwargs.
+        """
+        return self.__class__(self.name, self.dest,
+                              dict(self._kwargs, **kwargs), self.docstring)
+
+    @property
+    def optional(self):
+        return self.name.startswith('-')
+
+    def to_dict(self):
+        """Converts the argument into a JSON serializable dict.
+
+        Any kwargs that cannot be serialized (such as a callable type) are
+        discarded.
+        """
+        return {
+            'name': self.name,
+            'dest': self.dest,
+            'kwargs': _serializable(self.kwargs)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['dest'], data['kwargs'])
+
+    def __repr__(self):
+        return '<{0} name:{1} dest:{2}>'.format(
+            self.__class__.__name__, self.name, self.dest)
+
+
+class CommandSpec(_Immutable):
+    """The compiled definition of a command method.
+
+    Specs are created by the arg and cmd decorators and are registered against
+    the command class when it is created (see command.Base.__commands__).
+
+    The help, description and arg help are retrieved from the docstring of
+    the method when they are first accessed, unless they are specified.
+
+    Attributes:
+        name (string): The name of the method
+        help (string): The one line help for the method
+        description (string): The full description displayed when using -h
+        args (tuple): The ArgSpecs for the method
+        coroutine (boolean): Whether or not the method is a coroutine
+        parallel (tuple): The (argument, executor, ordered) the method is
+            called for each item of in parallel (see decorators.parallel)
+        cache (tuple): The (ttl, max_size) of the results of the method
+            (see decorators.cached)
+        docstring (Docstring): The docstring of the method
+    """
+    __slots__ = ('name', '_help', '_description', 'args', '_arg_help',
+                 'coroutine', 'parallel', 'cache', 'docstring')
+    _fields = ('name', 'help', 'description', 'args', 'arg_help',
+               'coroutine', 'parallel', 'cache')
+
+    def __init__(self, name, help=None, description=None, args=(),
+                 arg_help=None, coroutine=False, parallel=None, cache=None,
+                 docstring=None):
+        self._set(name=name, _help=help, _description=description,
+                  args=tuple(args),
+                  _arg_help=(tuple(arg_help.items())
+                             if arg_help is not None else None),
+                  coroutine=coroutine,
+                  parallel=tuple(parallel) if parallel else None,
+                  cache=tuple(cache) if cache else None,
+                  docstring=docstring or Docstring(None))
+
+    @classmethod
+    def from_function(cls, func, help=None):
+        """Creates a new spec from the signature and docstring of a function.
+
+        Each named argument of the function will be treated as a positional
+        argument.
+
+        Args:
+            func (callable): The command method
+            help (string): Overrides the one line help from the docstring
+        """
+        docstring = Docstring(func.__doc__, help)
+        spec = inspect.getfullargspec(func)
+        args = [ArgSpec(arg, arg, docstring=docstring)
+                for arg in spec[0][1:]]
+        return cls(func.__name__, args=args,
+                   coroutine=inspect.iscoroutinefunction(func),
+                   docstring=docstring)
+
+    @property
+    def help(self):
+        if self._help is None:
+            return self.docstring.help
+        return self._help
+
+    @property
+    def description(self):
+        if self._description is None:
+            return self.docstring.description
+        return self._description
+
+    @property
+    def arg_help(self):
+        """The help for each argument as defined in the docstring.
+        """
+        if self._arg_help is None:
+            return dict(self.docstring.arg_help)
+        return dict(self._arg_help)
+
+    @property
+    def mapping(self):
+        """The name of the keyword argument for each argument.
+        """
+        return {arg.name: arg.dest for arg in self.args}
+
+    def with_arg(self, arg):
+        """Creates a new spec containing the argument.
+
+        If an argument with the same name already exists it will be replaced,
+        otherwise any positional argument with the same destination will be
+        removed and the argument appended.
+
+        Args:
+            arg (ArgSpec): The argument to add
+        """
+        args = list(self.args)
+        names = [existing.name for existing in args]
+        if arg.name in names:
+            args[names.index(arg.name)] = arg
+        else:
+            if arg.dest in names:
+                del args[names.index(arg.dest)]
+            args.append(arg)
+        return self._replace(args=args)
+
+    def bind(self, parsed_args):
+        """Retrieves the kwargs to call the method with.
+
+        Args:
+            parsed_args: The namespace returned from argparse
+
+        Returns:
+            A dict of kwargs keyed by their destination.
+        """
+        return {arg.dest: getattr(parsed_args, arg.dest)
+                for arg in self.args}
+
+    def to_dict(self):
+        """Converts the spec into a JSON serializable dict.
+        """
+        return {
+            'name': self.name,
+            'help': self.help,
+            'description': self.description,
+            'args': [arg.to_dict() for arg in self.args],
+            'arg_help': self.arg_help,
+            'coroutine': self.coroutine,
+            'parallel': list(self.parallel) if self.parallel else None,
+            'cache': list(self.cache) if self.cache else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['help'], data['description'],
+                   [ArgSpec.from_dict(arg) for arg in data['args']],
+                   data['arg_help'], data.get('coroutine', False),
+                   data.get('parallel'), data.get('cache'))
+
+    def _replace(self, **attrs):
+        values = {
+            'name': self.name,
+            'help': self._help,
+            'description': self._description,
+            'args': self.args,
+            'arg_help': (dict(self._arg_help)
+                         if self._arg_help is not None else None),
+            'coroutine': self.coroutine,
+            'parallel': self.parallel,
+            'cache': self.cache,
+            'docstring': self.docstring
+        }
+        values.update(attrs)
+        return self.__class__(**values)
+
+    def __repr__(self):
+        return '<{0} name:{1} args:{2}>'.format(
+            self.__class__.__name__, self.name,
+            [arg.name for arg in self.args])
@@ -1,6 +1,175 @@
 # -*- coding: utf-8 -*-
+from contextlib import contextmanager
+import os
+import sys
+
 TERMINATE = '\033[0m'
 
+_enabled = 'NO_COLOR' not in os.environ
+
+
+def enabled():
+    """Whether or not styling is currently enabled.
+    """
+    return _enabled
+
+
+def set_enabled(value):
+    """Globally enables or disables styling.
+
+    When disabled, all styles (and colors) return the string unmodified.
+
+    Args:
+        value (boolean): Whether or not styling should be enabled
+    """
+    global _enabled
+    _enabled = bool(value)
+
+
+def detect(stream=None):
+    """Determines whether or not styling should be used for a stream.
+
+    Styling is disabled if the NO_COLOR environment variable is set or the
+    stream is not a terminal.
+
+    Args:
+        stream: The stream to check, defaults to sys.stdout
+    """
+    if 'NO_COLOR' in os.environ:
+        return False
+    stream = stream or sys.stdout
+    try:
+        return stream.isatty()
+    except Exception:
+        return False
+
+
+@contextmanager
+def colored(value):
+    """Enables or disables styling within a block.
+
+    Example:
+
+    .. code-block:: python
+
+        with colored(False):
+            bold('some text')  # some text
+    """
+    previous = _enabled
+    set_enabled(value)
+    try:
+        yield
+    finally:
+        set_enabled(previous)
+
+
+class Style(object):
+    """A precompiled terminal style.
+
+    Styles can be combined with + to avoid nesting multiple terminated styles.
+
+    Example:
+
+    .. code-block:: python
+
+        error = Style('\\033[91m') + BOLD
+        error('some text')  # bold red text in terminal
+        error.many(['some', 'text'])
+
+    Args:
+        codes (string): The escape codes that start the style
+    """
+    __slots__ = ('codes', 'prefix', 'suffix')
+
+    def __init__(self, *codes, suffix=TERMINATE):
+        self.codes = codes
+        self.prefix = ''.join(codes)
+        self.suffix = suffix
+
+    def __call__(self, string, terminate=True):
+        if string.__class__ is not str:
+            string = str(string)
+        if not _enabled:
+            return string
+        if terminate:
+            return self.prefix + string + self.suffix
+        return self.prefix + string
+
+    def many(self, strings, terminate=True):
+        """Styles multiple strings at once.
+
+        Args:
+            strings (iterable): The strings to style
+            terminate (boolean): Whether or not to terminate the styling
+
+        Returns:
+            A list of styled strings.
+        """
+        strings = [s if s.__class__ is str else str(s) for s in strings]
+        if not _enabled:
+            return strings
+        prefix = self.prefix
+        suffix = self.suffix if terminate else ''
+        return [prefix + s + suffix for s in strings]
+
+    def __add__(self, other):
+        return Style(*(self.codes + other.codes), suffix=self.suffix)
+
+    def __eq__(self, other):
+        if not isinstance(other, Style):
+            return False
+        return self.prefix == other.prefix and self.suffix == other.suffix
+
+    def __hash__(self):
+        return hash((self.prefix, self.suffix))
+
+    def __repr__(self):
+        return '<{0} {1!r}>'.format(self.__class__.__name__, self.prefix)
+
+
+class Template(object):
+    """A format string where some of the fields are styled.
+
+    The styles are compiled into the format string when the template is
+    created, so rendering only requires a single call to str.format.
+
+    Example:
+
+    .. code-block:: python
+
+        template = Template('{name}\\t{help}', name=BOLD)
+        template.render(name='command', help='Some help')
+
+    Args:
+        template (string): The format string
+        styles (Style): The style for each named field
+    """
+    __slots__ = ('template', 'styled')
+
+    def __init__(self, template, **styles):
+        self.template = template
+        styled = template
+        for name, style in styles.items():
+            field = '{{{0}}}'.format(name)
+            styled = styled.replace(
+                field, '{0}{1}{2}'.format(
+                    _escape(style.prefix), field, _escape(style.suffix)))
+        self.styled = styled
+
+    def render(self, *args, **kwargs):
+        """Renders the template with the specified values.
+        """
+        template = self.styled if _enabled else self.template
+        return template.format(*args, **kwargs)
+
+
+def _escape(code):
+    return code.replace('{', '{{').replace('}', '}}')
+
+
+UNDERLINE = Style('\033[4m')
+BOLD = Style('\033[1m')
+
 
 def underline(string, terminate=True):
     """Underlines text within the terminal.
@@ -14,7 +183,7 @@ def underline(string, terminate=True):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the styling
     """
-    return format_style(string, '\033[4m', TERMINATE if terminate else '')
+    return UNDERLINE(string, terminate)
 
 
 def bold(string, terminate=True):
@@ -29,7 +198,7 @@ def bold(string, terminate=True):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the styling
     """
-    return format_style(string, '\033[1m', TERMINATE if terminate else '')
+    return BOLD(string, terminate)
 
 
 def format_style(string, start, end=TERMINATE):
@@ -44,4 +213,6 @@ def format_style(string, start, end=TERMINATE):
         string (string): The string to wrap
         terminate (boolean): Whether or not to terminate the styling
     """
+    if not _enabled:
+        return '{0}'.format(string)
     return '{0}{1}{2}'.format(start, string, end)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+from itertools import islice
+import re
+import unicodedata
+from watson.console import styles, writer
+
+
+ANSI_REGEX = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+WIDE = frozenset(('W', 'F'))
+LEFT = 'left'
+RIGHT = 'right'
+SAMPLE_SIZE = 1000
+
+
+def strip_ansi(string):
+    """Removes any ANSI escape sequences from a string.
+    """
+    if '\x1b' not in string:
+        return string
+    return ANSI_REGEX.sub('', string)
+
+
+def display_width(string):
+    """Calculates the number of columns a string occupies within the terminal.
+
+    ANSI escape sequences are ignored and wide characters count as two
+    columns.
+
+    Example:
+
+    .. code-block:: python
+
+        display_width(bold('test'))  # 4
+
+    Args:
+        string (string): The string to measure
+    """
+    string = strip_ansi(string)
+    if len(string.encode('utf-8')) == len(string):
+        return len(string)
+    width = 0
+    for char in string:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in WIDE else 1
+    return width
+
+
+def pad(string, width, align=LEFT):
+    """Pads a string to a display width, ignoring any ANSI escape sequences.
+
+    Args:
+        string (string): The string to pad
+        width (int): The display width to pad to
+        align (string): Whether to align the string left or right
+    """
+    padding = ' ' * (width - display_width(string))
+    if align == RIGHT:
+        return padding + string
+    return string + padding
+
+
+class Column(object):
+    """A column within a table.
+
+    Args:
+        name (string): The heading of the column
+        style (callable): A Style (or color/style function) for the cells
+        align (string): Whether to align the cells left or right
+        width (int): A fixed width for the column
+        max_width (int): The maximum width of the column, longer cells are
+            truncated
+    """
+    __slots__ = ('name', 'style', 'align', 'width', 'max_width')
+
+    def __init__(self, name='', style=None, align=LEFT, width=None,
+                 max_width=None):
+        self.name = name
+        self.style = style
+        self.align = align
+        self.width = width
+        self.max_width = max_width
+
+
+class Table(object):
+    """Renders rows of data as aligned columns.
+
+    The column widths are calculated from a sample of the first rows, after
+    which the remaining rows are rendered as they are consumed. This allows a
+    table to be streamed from a generator without holding every row in memory.
+    Cells wider than their column (after the sample) overflow rather than
+    breaking the alignment of the rows that have already been written, unless
+    the column has a max_width.
+
+    Example:
+
+    .. code-block:: python
+
+        table = Table([Column('Name', style=styles.BOLD), Column('Status')])
+        table.write((user.name, user.status) for user in users)
+
+    Args:
+        columns (list): The Columns (or column names) of the table
+        sample (int): The number of rows to calculate the widths from, or None
+            to calculate them from all the rows
+        separator (string): The string between each column
+        indent (string): The string prefixed to each row
+        header_style (callable): The style of the headings, if any column has
+            a name
+    """
+    separator = '  '
+    indent = ''
+    sample = SAMPLE_SIZE
+    header_style = styles.BOLD
+
+    def __init__(self, columns, sample=SAMPLE_SIZE, separator=None,
+                 indent=None, header_style=None):
+        self.columns = [column if isinstance(column, Column) else Column(column)
+                        for column in columns]
+        self.sample = sample
+        if separator is not None:
+            self.separator = separator
+        if indent is not None:
+            self.indent = indent
+        if header_style is not None:
+            self.header_style = header_style
+
+    def widths(self, rows):
+        """Calculates the width of each column.
+
+        Args:
+            rows (list): The rows to calculate the widths from
+        """
+        widths = []
+        for index, column in enumerate(self.columns):
+            if column.width:
+                widths.append(column.width)
+                continue
+            width = display_width(column.name)
+            for row in rows:
+                if index < len(row):
+                    width = max(width, display_width(_text(row[index])))
+            if column.max_width:
+                width = min(width, column.max_width)
+            widths.append(width)
+        return widths
+
+    def render(self, rows):
+        """Renders the rows.
+
+        Args:
+            rows (iterable): The rows to render, each a sequence of cells
+
+        Returns:
+            A generator of lines.
+        """
+        rows = iter(rows)
+        if self.sample is None:
+            sampled = list(rows)
+        else:
+            sampled = list(islice(rows, self.sample))
+        widths = self.widths(sampled)
+        if any(column.name for column in self.columns):
+            yield self.render_row(
+                [column.name for column in self.columns], widths,
+                header=True)
+        for row in sampled:
+            yield self.render_row(row, widths)
+        del sampled
+        for row in rows:
+            yield self.render_row(row, widths)
+
+    def render_row(self, row, widths, header=False):
+        """Renders a single row.
+
+        Args:
+            row (sequence): The cells of the row
+            widths (list): The width of each column
+            header (boolean): Whether or not the row is the header
+        """
+        cells = []
+        last = len(self.columns) - 1
+        for index, column in enumerate(self.columns):
+            text = _text(row[index]) if index < len(row) else ''
+            width = widths[index]
+            text_width = display_width(text)
+            if column.max_width and text_width > width:
+                text = _truncate(text, width)
+                text_width = display_width(text)
+            style = self.header_style if header else column.style
+            if style:
+                text = style(text)
+            padding = ' ' * max(width - text_width, 0)
+            if column.align == RIGHT:
+                text = padding + text
+            elif index != last:
+                text = text + padding
+            cells.append(text)
+        return self.indent + self.separator.join(cells)
+
+    def write(self, rows, out=None):
+        """Renders the rows and writes them to a writer.
+
+        Args:
+            rows (iterable): The rows to render
+            out (Writer): The writer to write to, defaults to stdout
+        """
+        (out or writer.stdout).writelines(self.render(rows))
+
+
+def _text(cell):
+    return cell if cell.__class__ is str else str(cell)
+
+
+def _truncate(text, width):
+    text = strip_ansi(text)
+    if width < 1:
+        return ''
+    result = []
+    used = 0
+    for char in text:
+        char_width = display_width(char)
+        if used + char_width > width - 1:
+            break
+        result.append(char)
+        used += char_width
+    return ''.join(result) + '…'
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+
+
+INTERVAL = 0.25
+DEBOUNCE = 0.1
+IGNORED = frozenset(('__pycache__', 'node_modules'))
+
+
+def snapshot(paths, ignored=IGNORED):
+    """Creates an index of the modification time and size of every file.
+
+    Directories are walked recursively, skipping hidden directories (such as
+    .git) and any ignored directories.
+
+    Args:
+        paths (iterable): The files and directories to index
+        ignored (iterable): The names of directories to skip
+
+    Returns:
+        A dict of (mtime, size) keyed by the path of each file.
+    """
+    index = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if os.path.isdir(path):
+            _walk(path, ignored, index)
+        else:
+            index[path] = (stat.st_mtime_ns, stat.st_size)
+    return index
+
+
+def _walk(directory, ignored, index):
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    name = entry.name
+                    if not name.startswith('.') and name not in ignored:
+                        _walk(entry.path, ignored, index)
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            index[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+
+def changes(previous, current):
+    """The paths that have been added, modified or removed between indexes.
+    """
+    changed = {path for path, value in current.items()
+               if previous.get(path) != value}
+    changed.update(path for path in previous if path not in current)
+    return changed
+
+
+class Watcher(object):
+    """Polls a set of paths for changes.
+
+    Polling only requires a stat of each file, so no external service (or
+    dependency) is needed. Once a change is detected the watcher waits until
+    the paths have not changed for the debounce window, so that a burst of
+    changes (such as saving multiple files) is reported once.
+
+    Example:
+
+    .. code-block:: python
+
+        watcher = Watcher(['src', 'setup.cfg'])
+        index = watcher.snapshot()
+        while True:
+            changed, index = watcher.wait(index)
+            rebuild(changed)
+
+    Args:
+        paths (list): The files and directories to watch
+        interval (float): The number of seconds between each poll
+        debounce (float): The number of seconds the paths must be unchanged
+            for before the changes are reported
+    """
+    interval = INTERVAL
+    debounce = DEBOUNCE
+    ignored = IGNORED
+
+    def __init__(self, paths, interval=None, debounce=None):
+        self.paths = list(paths)
+        if interval is not None:
+            self.interval = interval
+        if debounce is not None:
+            self.debounce = debounce
+
+    def snapshot(self):
+        return snapshot(self.paths, self.ignored)
+
+    def wait(self, since=None):
+        """Blocks until the paths have changed.
+
+        Args:
+            since (dict): The index to compare against, any changes made
+                since it was created are reported immediately
+
+        Returns:
+            A tuple of the changed paths and the latest index.
+        """
+        previous = self.snapshot() if since is None else since
+        while True:
+            current = self.snapshot()
+            changed = changes(previous, current)
+            if changed:
+                break
+            time.sleep(self.interval)
+        while True:
+            time.sleep(self.debounce)
+            latest = self.snapshot()
+            more = changes(current, latest)
+            if not more:
+                return changed, latest
+            changed.update(more)
+            current = latest
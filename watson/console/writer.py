@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+import atexit
+from itertools import cycle
+import queue
+import sys
+import threading
+import weakref
+from watson.console import colors
+
+
+FLUSH_LINE = 'line'
+FLUSH_SIZE = 'size'
+FLUSH_EXIT = 'exit'
+BUFFER_SIZE = 65536
+
+_writers = weakref.WeakSet()
+_local = threading.local()
+
+
+class Writer(object):
+    """Writes lines of output to a stream, flushing it according to a policy.
+
+    Lines are written straight through to the stream, so they share its
+    buffer (and therefore keep their order) with anything else written to it,
+    such as print. The flush policy determines when the stream is flushed:
+
+    - FLUSH_LINE: after every call to write or writelines
+    - FLUSH_SIZE: once the output written since the last flush exceeds the
+      buffer size
+    - FLUSH_EXIT: only when flush is called (or the interpreter exits)
+
+    If no policy is specified then FLUSH_LINE is used when writing to a
+    terminal, and FLUSH_SIZE otherwise. All writers are flushed when the
+    interpreter exits.
+
+    Writers are thread-safe, lines written concurrently are never duplicated
+    or dropped.
+
+    Example:
+
+    .. code-block:: python
+
+        out = Writer('stdout', policy=FLUSH_SIZE)
+        out.write('a line')
+        out.writelines(['another line', 'and another'])
+        out.flush()
+
+    Args:
+        stream (string|file): The stream to write to, either a file-like object
+            or the name of a stream within sys (resolved when writing).
+        policy (string): When to flush the stream
+        size (int): The number of characters written between flushes when
+            using FLUSH_SIZE
+    """
+    policy = None
+    size = BUFFER_SIZE
+
+    def __init__(self, stream='stdout', policy=None, size=None):
+        self._stream = stream
+        self.policy = policy
+        if size:
+            self.size = size
+        self._unflushed = 0
+        self._tty = None
+        self._lock = threading.Lock()
+        _writers.add(self)
+
+    @property
+    def stream(self):
+        """The stream that the output will be written to.
+        """
+        if isinstance(self._stream, str):
+            return getattr(sys, self._stream)
+        return self._stream
+
+    def write(self, message=''):
+        """Writes a single line.
+
+        Args:
+            message (string): The line to write (excluding the newline)
+        """
+        self._write('{0}\n'.format(message))
+        self._flush_if_required()
+
+    def writelines(self, messages):
+        """Writes multiple lines at once.
+
+        The lines are joined and written in chunks of at most the buffer size,
+        so that memory stays bounded when writing from a generator.
+
+        Args:
+            messages (iterable): The lines to write (excluding the newlines)
+        """
+        chunk = []
+        chunk_size = 0
+        for message in messages:
+            message = '{0}\n'.format(message)
+            chunk.append(message)
+            chunk_size += len(message)
+            if chunk_size >= self.size:
+                self._write(''.join(chunk))
+                chunk, chunk_size = [], 0
+                self._flush_if_required()
+        if chunk:
+            self._write(''.join(chunk))
+        self._flush_if_required()
+
+    def _write(self, output):
+        with self._lock:
+            self.stream.write(output)
+            self._unflushed += len(output)
+
+    def flush(self):
+        """Flushes any output written to the stream.
+        """
+        with self._lock:
+            self._unflushed = 0
+            self.stream.flush()
+
+    def discard(self):
+        """Forgets any unflushed output, so that it is not flushed on exit.
+        """
+        with self._lock:
+            self._unflushed = 0
+
+    def _flush_policy(self):
+        if self.policy:
+            return self.policy
+        stream = self.stream
+        if self._tty is None or self._tty[0] is not stream:
+            try:
+                isatty = stream.isatty()
+            except Exception:
+                isatty = False
+            self._tty = (stream, isatty)
+        return FLUSH_LINE if self._tty[1] else FLUSH_SIZE
+
+    def _flush_if_required(self):
+        policy = self._flush_policy()
+        if policy == FLUSH_LINE or (
+                policy == FLUSH_SIZE and self._unflushed >= self.size):
+            self.flush()
+
+
+class TaskStream(object):
+    """A file-like stream that prefixes each line written by a task.
+
+    Partial lines are held in the stream's buffer until they are completed,
+    so only whole lines are ever sent to the multiplexer.
+
+    Args:
+        multiplexer (Multiplexer): The multiplexer to send the lines to
+        prefix (string): The (styled) prefix of each line
+        error (boolean): Whether the lines are written to stderr
+    """
+
+    def __init__(self, multiplexer, prefix, error=False):
+        self.multiplexer = multiplexer
+        self.prefix = prefix
+        self.error = error
+        self._partial = ''
+
+    def write(self, text):
+        if '\n' not in text:
+            self._partial += text
+            return len(text)
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        prefix = self.prefix
+        self.multiplexer.put(self.error, [prefix + line for line in lines])
+        return len(text)
+
+    def flush(self):
+        """Sends any partial line to the multiplexer.
+        """
+        if self._partial:
+            partial, self._partial = self._partial, ''
+            self.multiplexer.put(self.error, [self.prefix + partial])
+
+
+class Task(object):
+    """The output of a single task within a Multiplexer.
+
+    While a task is active (via a with statement), any output written by
+    command.Base.write within the same thread is routed to the task.
+
+    Attributes:
+        stdout (TaskStream): The file-like stream for the task's stdout
+        stderr (TaskStream): The file-like stream for the task's stderr
+    """
+
+    def __init__(self, multiplexer, prefix, name=None):
+        self.multiplexer = multiplexer
+        self.prefix = prefix
+        self.name = prefix.strip() if name is None else name
+        self.stdout = TaskStream(multiplexer, prefix)
+        self.stderr = TaskStream(multiplexer, prefix, error=True)
+        self._previous = None
+
+    def write(self, message='', error=False):
+        """Writes a single line.
+        """
+        (self.stderr if error else self.stdout).write(
+            '{0}\n'.format(message))
+
+    def writelines(self, messages, error=False, prefixed=True):
+        """Writes multiple lines at once.
+
+        Args:
+            messages (iterable): The lines to write
+            error (boolean): Whether to write the lines to stderr
+            prefixed (boolean): Whether to prefix the lines, structured
+                records are written without the prefix
+        """
+        if not prefixed:
+            self.multiplexer.put(error, list(messages))
+            return
+        (self.stderr if error else self.stdout).write(
+            ''.join('{0}\n'.format(message) for message in messages))
+
+    def flush(self):
+        self.stdout.flush()
+        self.stderr.flush()
+
+    def __enter__(self):
+        self._previous = current()
+        _local.task = self
+        return self
+
+    def __exit__(self, *exc):
+        _local.task = self._previous
+        self._previous = None
+        self.flush()
+        return False
+
+
+class TaskWriter(object):
+    """Writes lines to a task, for use in place of a Writer.
+
+    Args:
+        task (Task): The task to write to
+        error (boolean): Whether the lines are written to stderr
+    """
+
+    def __init__(self, task, error=False):
+        self.task = task
+        self.error = error
+
+    def write(self, message=''):
+        self.task.write(message, self.error)
+
+    def writelines(self, messages):
+        self.task.writelines(messages, self.error)
+
+    def flush(self):
+        self.task.flush()
+
+    def discard(self):
+        pass
+
+
+class Multiplexer(object):
+    """Combines the output of concurrent tasks without interleaving lines.
+
+    Each task buffers its own partial lines and sends complete lines to a
+    queue, which is drained by a single thread that writes them to the
+    underlying writers. Workers therefore never block on the stream (or on
+    each other) while writing.
+
+    Example:
+
+    .. code-block:: python
+
+        with Multiplexer() as multiplexer:
+            def work(item):
+                with multiplexer.task('[{0}] '.format(item)):
+                    command.write('Processing')  # [1] Processing
+            pool.map(work, items)
+
+    If the multiplexer is created while a task is active, its lines are
+    written to that task rather than directly to stdout and stderr.
+
+    Args:
+        out (Writer): The writer for stdout, defaults to writer.stdout
+        err (Writer): The writer for stderr, defaults to writer.stderr
+        styles (iterable): The styles to cycle through for each task's prefix
+    """
+
+    def __init__(self, out=None, err=None, styles=None):
+        task = current()
+        self.out = out or (TaskWriter(task) if task else stdout)
+        self.err = err or (TaskWriter(task, error=True) if task else stderr)
+        self._styles = cycle(styles or (
+            colors.OK_BLUE_STYLE, colors.OK_GREEN_STYLE, colors.WARNING_STYLE,
+            colors.HEADER_STYLE))
+        self._styles_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def task(self, prefix, style=None):
+        """Creates a task whose lines are prefixed.
+
+        Args:
+            prefix (string): The prefix of each line
+            style (callable): The style of the prefix, defaults to the next of
+                the multiplexer's styles
+        """
+        if style is None:
+            with self._styles_lock:
+                style = next(self._styles)
+        return Task(self, style(prefix) if style else prefix, prefix.strip())
+
+    def put(self, error, lines):
+        """Queues complete lines to be written.
+
+        Args:
+            error (boolean): Whether the lines are written to stderr
+            lines (list): The lines (excluding the newlines)
+        """
+        self._queue.put((error, lines))
+
+    def write(self, message='', error=False):
+        """Writes a single unprefixed line.
+        """
+        self.put(error, [message])
+
+    def start(self):
+        """Starts the thread that writes the queued lines.
+        """
+        if not self._thread:
+            self._thread = threading.Thread(
+                target=self._drain, name='watson-console-multiplexer',
+                daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Writes any remaining lines and stops the writer thread.
+        """
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _drain(self):
+        get = self._queue.get
+        while True:
+            batch = [get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for entry in batch:
+                if entry is None:
+                    stop = True
+                    continue
+                error, lines = entry
+                (self.err if error else self.out).writelines(lines)
+            for out in (self.out, self.err):
+                try:
+                    out.flush()
+                except (OSError, ValueError):
+                    out.discard()
+            if stop:
+                return
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def current():
+    """The task that output is routed to within the current thread (if any).
+    """
+    return getattr(_local, 'task', None)
+
+
+def flush():
+    """Flushes all of the writers.
+    """
+    for writer in list(_writers):
+        try:
+            writer.flush()
+        except (OSError, ValueError):
+            pass
+
+
+stdout = Writer('stdout')
+stderr = Writer('stderr', policy=FLUSH_LINE)
+
+atexit.register(flush)